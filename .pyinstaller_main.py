@@ -9,4 +9,10 @@ This file is provided primarily for use with pyinstaller.
 
 """
 
-import minegauler.__main__
+import multiprocessing
+
+
+# Guarded against running in worker processes, which import this script.
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    import minegauler.__main__
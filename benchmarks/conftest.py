@@ -0,0 +1,73 @@
+# October 2026, Lewis Gaul
+
+"""
+Shared fixtures for the benchmark suite, which uses pytest-benchmark.
+
+The suite is not collected by a plain 'python -m pytest'. Results are only
+meaningful when compared against a baseline from the same machine, run while
+the machine is otherwise idle, so no baseline is committed. Instead, save a
+baseline locally (under .benchmarks/) before making a change with:
+    python -m pytest benchmarks/ --benchmark-save=baseline
+
+and then compare against the latest saved run with:
+    python -m pytest benchmarks/ --benchmark-compare \
+        --benchmark-compare-fail=median:25%
+
+This fails if the median time of any benchmark regresses by more than 25% from
+the baseline. The same is available via './run.sh bench [--save-baseline]'.
+
+Where there are alternative implementations of a hot path (e.g. the bulk and
+per-coordinate minefield calculations), the benchmarks are grouped so that the
+two are compared within the same run, independently of any baseline.
+
+"""
+
+import random
+from typing import List, Tuple
+
+import pytest
+
+from minegauler.core.board import Minefield
+from minegauler.shared.types import Difficulty
+
+
+# The seed used for all randomly generated boards and data.
+SEED = 0
+
+# Board settings (x_size, y_size, mines) to benchmark, by ID.
+BOARDS = {
+    "beginner": Difficulty.BEGINNER.get_board_values(),
+    "intermediate": Difficulty.INTERMEDIATE.get_board_values(),
+    "expert": Difficulty.EXPERT.get_board_values(),
+    "master": Difficulty.MASTER.get_board_values(),
+    "custom-100x100": (100, 100, 1000),
+    "custom-200x200": (200, 200, 4000),
+}
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Keep only the summary statistics, so saved results stay small."""
+    for bench in output_json["benchmarks"]:
+        bench["stats"].pop("data", None)
+
+
+@pytest.fixture(params=list(BOARDS), scope="module")
+def board_values(request) -> Tuple[int, int, int]:
+    """The board settings (x_size, y_size, mines) for each benchmarked board."""
+    return BOARDS[request.param]
+
+
+@pytest.fixture(scope="module")
+def minefields(board_values) -> List[Minefield]:
+    """A fixed set of minefields for each benchmarked board."""
+    return list(Minefield.generate_many(5, *board_values, seed=SEED))
+
+
+@pytest.fixture(scope="session")
+def seed() -> int:
+    return SEED
+
+
+@pytest.fixture
+def rng(seed) -> random.Random:
+    return random.Random(seed)
@@ -0,0 +1,78 @@
+# October 2026, Lewis Gaul
+
+"""
+Benchmarks for the core board and game hot paths.
+
+"""
+
+import itertools
+from typing import List
+
+import pytest
+
+from minegauler.core.board import Minefield
+from minegauler.core.game import Game
+
+
+def _largest_opening_coord(mf: Minefield):
+    return max(mf.openings, key=len)[0]
+
+
+@pytest.mark.parametrize("bulk", [True, False], ids=["bulk", "per-coord"])
+def test_minefield_create(benchmark, board_values, seed, bulk):
+    """
+    Benchmark creating a minefield, including the completed board and 3bv,
+    comparing the bulk calculations with the per-coordinate ones.
+    """
+    benchmark.group = "minefield_create-{}x{}-{}".format(*board_values)
+    seeds = itertools.count(seed)
+    benchmark(
+        lambda: next(
+            Minefield.generate_many(1, *board_values, seed=next(seeds), bulk=bulk)
+        )
+    )
+
+
+def test_select_opening(benchmark, minefields: List[Minefield]):
+    """Benchmark selecting a cell in the largest opening of a new game."""
+    mf_cycle = itertools.cycle(minefields)
+
+    def setup():
+        mf = next(mf_cycle)
+        return (Game(minefield=mf), _largest_opening_coord(mf)), {}
+
+    benchmark.pedantic(
+        lambda game, coord: game.select_cell(coord), setup=setup, rounds=100
+    )
+
+
+def test_chord(benchmark, minefields: List[Minefield]):
+    """Benchmark chording on a revealed number with its mines flagged."""
+    mf = minefields[0]
+    coord = next(
+        c for c in mf.all_coords if mf[c] == 0 and mf.completed_board[c].num > 0
+    )
+
+    def setup():
+        game = Game(minefield=mf)
+        game.select_cell(coord)
+        for c in mf.get_nbrs(coord):
+            if mf[c] > 0:
+                game.set_cell_flags(c, mf[c])
+        return (game, coord), {}
+
+    benchmark.pedantic(
+        lambda game, coord: game.chord_on_cell(coord), setup=setup, rounds=100
+    )
+
+
+def test_get_rem_3bv(benchmark, minefields: List[Minefield], rng):
+    """Benchmark getting the remaining 3bv of a game in progress."""
+    mf = minefields[0]
+    game = Game(minefield=mf)
+    safe_coords = [c for c in mf.all_coords if mf[c] == 0]
+    for c in rng.sample(safe_coords, len(safe_coords) // 2):
+        game.select_cell(c)
+    if game.state.finished():
+        pytest.skip("Game finished")
+    benchmark(game.get_rem_3bv)
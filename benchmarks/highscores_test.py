@@ -0,0 +1,96 @@
+# October 2026, Lewis Gaul
+
+"""
+Benchmarks for the highscores hot paths.
+
+"""
+
+import random
+from typing import List
+
+import pytest
+
+from minegauler.shared.highscores import (
+    HighscoreStruct,
+    LocalHighscoresDB,
+    filter_and_sort,
+)
+from minegauler.shared.types import Difficulty
+
+
+def _generate_highscores(
+    n: int, rng: random.Random, nr_names: int = 100
+) -> List[HighscoreStruct]:
+    """Generate a set of highscores across a number of players."""
+    names = [f"player{i}" for i in range(nr_names)]
+    highscores = []
+    for i in range(n):
+        elapsed = rng.uniform(1, 100)
+        bbbv = rng.randint(2, 200)
+        highscores.append(
+            HighscoreStruct(
+                difficulty=rng.choice("BIEM"),
+                per_cell=rng.randint(1, 3),
+                drag_select=rng.random() < 0.5,
+                name=rng.choice(names),
+                timestamp=1_600_000_000 + i,
+                elapsed=elapsed,
+                bbbv=bbbv,
+                bbbvps=bbbv / elapsed,
+                flagging=rng.random(),
+            )
+        )
+    return highscores
+
+
+@pytest.fixture(params=[1_000, 100_000], ids=["1k", "100k"], scope="module")
+def highscores(request, seed) -> List[HighscoreStruct]:
+    return _generate_highscores(request.param, random.Random(seed))
+
+
+@pytest.fixture(scope="module")
+def local_db(tmp_path_factory, highscores) -> LocalHighscoresDB:
+    db = LocalHighscoresDB(tmp_path_factory.mktemp("db") / "highscores.db")
+    db.insert_highscores(highscores)
+    return db
+
+
+@pytest.mark.parametrize("sort_key", ["time", "3bv/s"])
+def test_filter_and_sort(benchmark, highscores, sort_key):
+    """Benchmark getting the best highscore per player."""
+    settings_highscores = [
+        h for h in highscores if h.difficulty is Difficulty.EXPERT and h.per_cell == 1
+    ]
+    benchmark(filter_and_sort, settings_highscores, sort_key)
+
+
+def test_filter_and_sort_name(benchmark, highscores):
+    """Benchmark getting the highscores for a single player."""
+    benchmark(filter_and_sort, highscores, "time", {"name": "player1"})
+
+
+def test_local_db_get_highscores(benchmark, local_db):
+    """Benchmark getting highscores for a single set of settings."""
+    benchmark(
+        local_db.get_highscores,
+        difficulty=Difficulty.EXPERT,
+        per_cell=1,
+        drag_select=False,
+    )
+
+
+def test_local_db_get_highscores_name(benchmark, local_db):
+    """Benchmark getting highscores for a single player."""
+    benchmark(local_db.get_highscores, name="player1")
+
+
+@pytest.mark.parametrize("sort_key", ["time", "3bv/s"])
+def test_local_db_get_ranked_highscores(benchmark, local_db, sort_key):
+    """Benchmark getting the best highscore per player in SQL."""
+    benchmark(
+        local_db.get_ranked_highscores,
+        difficulty=Difficulty.EXPERT,
+        per_cell=1,
+        drag_select=False,
+        sort_key=sort_key,
+    )
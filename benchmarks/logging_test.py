@@ -0,0 +1,90 @@
+# October 2026, Lewis Gaul
+
+"""
+Benchmarks for the cost of logging on click latency.
+
+Compares click latency through the controller with:
+ - no logging configured,
+ - the previous logging setup (synchronous DEBUG logging to file, including
+   per-click debug logging, now on the trace channel),
+ - the default logging setup (DEBUG logging via a background queue handler,
+   trace channel disabled),
+ - 'performance' logging mode (INFO logging via a background queue handler).
+
+The benchmarks are grouped so that the modes are compared within one run.
+
+"""
+
+import logging
+import random
+
+import pytest
+
+from minegauler.core import BaseController
+from minegauler.shared import GameOptsStruct
+from minegauler.shared.logs import (
+    configure_logging,
+    set_trace_enabled,
+    stop_background_logging,
+)
+
+
+# Logging setups to compare, as kwargs for configure_logging(), by ID.
+LOGGING_MODES = {
+    "none": None,
+    "sync-debug-trace": dict(background=False, trace=True),
+    "queued-debug": dict(),
+    "queued-info": dict(level=logging.INFO),
+}
+
+# The first cell selected in each game, creating the minefield.
+FIRST_CLICK = (50, 50)
+# The cells selected in each game once the minefield is created.
+CLICKS = [(0, 0), (99, 99), (0, 99), (99, 0)]
+
+
+@pytest.fixture(params=list(LOGGING_MODES))
+def logging_mode(request, tmp_path):
+    """Configure logging for the benchmark, restoring the setup afterwards."""
+    root = logging.getLogger()
+    saved_handlers = list(root.handlers)
+    saved_level = root.level
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    root.setLevel(logging.WARNING)
+    kwargs = LOGGING_MODES[request.param]
+    if kwargs is not None:
+        configure_logging(tmp_path / "runtime.log", **kwargs)
+    yield request.param
+    stop_background_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+    set_trace_enabled(False)
+
+
+def test_clicks(benchmark, logging_mode, seed):
+    """Benchmark clicks on a large, sparse board."""
+    benchmark.group = "logging-clicks"
+    # Minefields are not pregenerated in the background, which would compete
+    #  with the clicks being timed.
+    ctrlr = BaseController(
+        GameOptsStruct(x_size=100, y_size=100, mines=500, first_success=True),
+        pregenerate_minefields=False,
+    )
+
+    def setup():
+        # Use the same minefield for every round.
+        random.seed(seed)
+        ctrlr.new_game()
+        ctrlr.select_cell(FIRST_CLICK)
+
+    def clicks():
+        for coord in CLICKS:
+            ctrlr.select_cell(coord)
+
+    benchmark.pedantic(clicks, setup=setup, rounds=50)
+    ctrlr.shutdown()
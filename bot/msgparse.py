@@ -524,7 +524,7 @@ def stats_players(args, username: str, allow_markdown=False, **kwargs):
     else:
         users = {u if u != "me" else username for u in args.username}
 
-    player_info = [utils.get_player_info(u) for u in users]
+    player_info = utils.get_players_info(users)
     lines = [formatter.format_player_info(player_info)]
     if allow_markdown:
         lines = ["```", *lines, "```"]
@@ -16,6 +16,7 @@ __all__ = (
     "get_message",
     "get_highscore_times",
     "get_player_info",
+    "get_players_info",
     "is_highscore_new_best",
     "send_group_message",
     "send_message",
@@ -30,7 +31,7 @@ import collections
 import json
 import logging
 import pathlib
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
 from requests_toolbelt import MultipartEncoder
@@ -54,6 +55,11 @@ _WEBEX_GROUP_ROOM_ID = (
 )
 
 _API_BASEURL = "http://minegauler.lewisgaul.co.uk/api/v1/highscores"
+_PLAYERS_API_URL = "http://minegauler.lewisgaul.co.uk/api/v1/players"
+
+# The combined time of a player with no beginner, intermediate or expert
+#  highscores.
+_NO_COMBINED_TIME = 3000
 
 
 # ------------------------------------------------------------------------------
@@ -159,25 +165,20 @@ def get_highscore_times(
     if users is None:
         users = USER_NAMES.values()
     lower_users = {u.lower(): u for u in users}
+    if not lower_users:
+        return []
 
-    if difficulty:
-        highscores = hs.filter_and_sort(
-            get_highscores(
-                difficulty=difficulty,
-                drag_select=drag_select,
-                per_cell=per_cell,
-            )
-        )
-        times = {
-            lower_users[h.name.lower()]: h.elapsed
-            for h in highscores
-            if h.name.lower() in lower_users
-        }
-    else:
-        times = {
-            u: _get_combined_highscore(u, drag_select=drag_select, per_cell=per_cell)
-            for u in users
-        }
+    # The server gives combined times if no difficulty is given.
+    params = _get_filter_params(
+        difficulty=difficulty, per_cell=per_cell, drag_select=drag_select
+    )
+    params["names"] = ",".join(lower_users)
+    response = requests.get(_API_BASEURL + "/times", params=params)
+    response.raise_for_status()
+    times = {lower_users[name]: t for name, t in response.json().items()}
+    if not difficulty:
+        for u in lower_users.values():
+            times.setdefault(u, _NO_COMBINED_TIME)
 
     return sorted(times.items(), key=lambda x: x[1])
 
@@ -213,19 +214,69 @@ PlayerInfo = collections.namedtuple(
 
 
 def get_player_info(username: str) -> PlayerInfo:
-    name = USER_NAMES[username]
-    highscores = get_highscores(name=name)
-    combined_time = _get_combined_highscore(name)
-    last_highscore = max(h.timestamp for h in highscores) if highscores else None
-    hs_types = len(
-        {(h.difficulty.lower(), h.drag_select, h.per_cell) for h in highscores}
+    return get_players_info([username])[0]
+
+
+def get_players_info(usernames: Iterable[str]) -> List[PlayerInfo]:
+    """
+    Get info for multiple players using a single request to the REST API.
+
+    :param usernames:
+        The usernames of the players.
+    :raises Exception:
+        If the HTTP request fails or returns bad data.
+    """
+    names = {u: USER_NAMES[u] for u in usernames}
+    if not names:
+        return []
+    response = requests.get(
+        _PLAYERS_API_URL, params={"names": ",".join(names.values())}
     )
-    return PlayerInfo(username, name, combined_time, hs_types, last_highscore)
+    response.raise_for_status()
+    all_stats = response.json()
+    players = []
+    for username, name in names.items():
+        stats = all_stats.get(name.lower())
+        if stats:
+            players.append(
+                PlayerInfo(
+                    username,
+                    name,
+                    stats["combined_time"],
+                    stats["types_played"],
+                    stats["last_highscore"],
+                )
+            )
+        else:
+            players.append(PlayerInfo(username, name, _NO_COMBINED_TIME, 0, None))
+    return players
 
 
 def is_highscore_new_best(h: hs.HighscoreStruct) -> Optional[str]:
-    all_highscores = get_highscores(settings=h, name=h.name)
-    return hs.is_highscore_new_best(h, all_highscores)
+    """
+    Check whether a highscore is a new personal best, fetching only the
+    player's best time and best 3bv/s using the REST API.
+
+    :raises Exception:
+        If the HTTP request fails or returns bad data.
+    :return:
+        Which category a new best was set in, if any.
+    """
+    best = []
+    for field, order_by in [("elapsed", "elapsed"), ("bbbvps", "-bbbvps")]:
+        highscores = _query_highscores(
+            difficulty=h.difficulty,
+            per_cell=h.per_cell,
+            drag_select=h.drag_select,
+            name=h.name,
+            fields=[field],
+            order_by=[order_by],
+            limit=1,
+        )
+        if not highscores:
+            return hs.compare_with_personal_best(h, None)
+        best.append(highscores[0][field])
+    return hs.compare_with_personal_best(h, tuple(best))
 
 
 def get_highscores(
@@ -250,18 +301,15 @@ def get_highscores(
         difficulty = settings.difficulty
         per_cell = settings.per_cell
         drag_select = settings.drag_select
-    args = []
-    if difficulty:
-        args.append(f"difficulty={difficulty.name[0]}")
-    if per_cell:
-        args.append(f"per_cell={per_cell}")
-    if drag_select:
-        args.append(f"drag_select={int(drag_select)}")
-    if name:
-        args.append(f"name={name}")
-    url = _API_BASEURL + "?" + "&".join(args)
-    response = requests.get(url)
-    return [hs.HighscoreStruct.from_dict(h) for h in response.json()]
+    return [
+        hs.HighscoreStruct.from_dict(h)
+        for h in _query_highscores(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            name=name,
+        )
+    ]
 
 
 # ------------------------------------------------------------------------------
@@ -273,19 +321,56 @@ def _strbool(b: bool) -> str:
     return "True" if b else "False"
 
 
-def _get_combined_highscore(
-    name: str, *, per_cell: Optional[int] = None, drag_select: Optional[bool] = None
-) -> float:
-    total = 0
-    for diff in ["b", "i", "e"]:
-        all_highscores = get_highscores(
-            name=name,
-            drag_select=drag_select,
-            per_cell=per_cell,
-        )
-        highscores = [h.elapsed for h in all_highscores if h.difficulty.lower() == diff]
-        total += min(highscores) if highscores else 1000
-    return total
+def _get_filter_params(
+    *,
+    difficulty: Optional[Difficulty] = None,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Get REST API query params to filter highscores by settings."""
+    params = {}
+    if difficulty:
+        params["difficulty"] = difficulty.name[0]
+    if per_cell:
+        params["per_cell"] = per_cell
+    if drag_select is not None:
+        params["drag_select"] = int(drag_select)
+    return params
+
+
+def _query_highscores(
+    *,
+    difficulty: Optional[Difficulty] = None,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+    name: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    order_by: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Query highscores using the REST API, letting the server sort, limit and
+    select fields.
+
+    :raises Exception:
+        If the HTTP request fails or returns bad data.
+    :return:
+        Matching highscores, as dictionaries of the requested fields.
+    """
+    params = _get_filter_params(
+        difficulty=difficulty, per_cell=per_cell, drag_select=drag_select
+    )
+    if name:
+        params["name"] = name
+    if fields:
+        params["fields"] = ",".join(fields)
+    if order_by:
+        params["order_by"] = ",".join(order_by)
+    if limit is not None:
+        params["limit"] = limit
+    response = requests.get(_API_BASEURL, params=params)
+    response.raise_for_status()
+    return response.json()
 
 
 def _get_person_id(name_or_email: str) -> str:
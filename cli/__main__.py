@@ -40,6 +40,26 @@ def run_tests(args):
         subprocess.run(["python", "-m", "pytest"] + args.remaining_args)
 
 
+def run_benchmarks(args):
+    # TODO: Use the venv python.
+    try:
+        args.remaining_args.remove("--")
+    except ValueError:
+        pass
+    # Baselines are machine-specific, so are saved locally under .benchmarks/.
+    threshold = args.threshold if args.threshold is not None else 25
+    if args.save_baseline:
+        bench_args = ["--benchmark-save=baseline"]
+    else:
+        bench_args = [
+            "--benchmark-compare",
+            f"--benchmark-compare-fail=median:{threshold}%",
+        ]
+    subprocess.run(
+        ["python", "-m", "pytest", "benchmarks/"] + bench_args + args.remaining_args
+    )
+
+
 def run_bot_cli(args):
     import bot
 
@@ -71,6 +91,7 @@ _COMMANDS: Dict[str, Callable[[Any], int]] = {
     "run": run_app,
     "make-venv": lambda args: print("Not implemented"),
     "run-tests": run_tests,
+    "run-benchmarks": run_benchmarks,
     "bump-version": lambda args: print("Not implemented"),
     "bot": run_bot_cli,
     "bot-add-player": add_bot_player,
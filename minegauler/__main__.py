@@ -9,18 +9,23 @@ Entry point for the application.
 import mysql.connector  # isort:skip
 
 import logging
+import os
 import sys
 
 from . import core, frontend, shared
 from ._version import __version__
+from .shared.logs import configure_logging
 
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    filename="runtime.log",
-    level=logging.DEBUG,
-    format="%(asctime)s[%(levelname)s](%(name)s) %(message)s",
+# Log records are written to file in a background thread. Per-click debug
+#  logging is only enabled if requested, as is debug logging in general when
+#  running in 'performance' mode.
+configure_logging(
+    "runtime.log",
+    level=logging.INFO if os.environ.get("MINEGAULER_PERF_LOGGING") else logging.DEBUG,
+    trace=bool(os.environ.get("MINEGAULER_TRACE_LOGGING")),
 )
 
 
@@ -40,8 +45,18 @@ logger.debug("GUI options: %s", gui_opts)
 
 logger.info("Starting up")
 
+# Post any highscores left queued from a previous run in the background.
+try:
+    shared.highscores.start_remote_submission()
+except Exception:
+    logger.exception("Failed to start posting highscores to remote")
+
 # Create core controller.
 ctrlr = core.BaseController(game_opts)
+# Optionally record action latencies, dumped to the given file on exit.
+latency_stats_file = os.environ.get("MINEGAULER_LATENCY_STATS")
+if latency_stats_file:
+    ctrlr.enable_latency_stats()
 # Init frontend and create controller.
 frontend.init_app()
 gui = frontend.MinegaulerGUI(ctrlr, frontend.state.State.from_opts(game_opts, gui_opts))
@@ -52,6 +67,7 @@ ctrlr.register_listener(gui)
 logger.debug("Entering event loop")
 rc = frontend.run_app(gui)
 logger.debug("Exiting event loop")
+ctrlr.shutdown()
 
 
 persist_settings = shared.AllOptsStruct.from_structs(
@@ -59,6 +75,12 @@ persist_settings = shared.AllOptsStruct.from_structs(
 )
 shared.write_settings_to_file(persist_settings)
 
+if latency_stats_file:
+    try:
+        ctrlr.dump_latency_stats(latency_stats_file)
+    except OSError:
+        logger.exception("Failed to dump latency stats")
+
 
 logger.info("Exiting with exit code %d", rc)
 
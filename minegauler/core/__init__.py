@@ -9,12 +9,18 @@ __all__ = (
     "BaseController",
     "Board",
     "Minefield",
+    "Simulator",
+    "Solver",
     "api",
     "board",
     "engine",
     "game",
+    "simulate",
+    "solver",
 )
 
-from . import api, board, engine, game
+from . import api, board, engine, game, simulate, solver
 from .board import Board, Minefield
 from .engine import BaseController
+from .simulate import Simulator
+from .solver import Solver
@@ -8,16 +8,21 @@ API between backend and frontends.
 __all__ = (
     "AbstractController",
     "AbstractListener",
+    "CellUpdates",
     "GameInfo",
 )
 
 import abc
+import array
+import collections.abc
 import logging
-from typing import Callable, Dict, Iterable, List, Optional
+import time as tm
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 import attr
 
 from ..core import board as brd
+from ..shared.logs import get_trace_logger
 from ..shared.types import (
     CellContents,
     Coord_T,
@@ -29,6 +34,105 @@ from ..shared.types import (
 from ..shared.utils import GameOptsStruct
 
 
+class CellUpdates(collections.abc.Mapping):
+    """
+    Compact representation of updates to cells on a board, as parallel arrays
+    of flat cell indices (see FlatGrid) and the new cell contents codes (see
+    CellContents.code), in the order the cells were first updated.
+
+    Also provides the mapping interface of the dictionary format, mapping cell
+    coordinates to cell contents, so can be used in place of a dictionary.
+
+    Instances are intended to be reused as buffers, see clear().
+    """
+
+    def __init__(self, board: brd.Board):
+        """
+        :param board:
+            The board the updates are for.
+        """
+        self._index_coords = board.index_coords
+        self._x_size: int = board.x_size
+        self._y_size: int = board.y_size
+        self.indices = array.array("I")
+        self.codes = array.array("B")
+        # The position in the arrays of each cell's update, or -1.
+        self._positions = array.array("i", [-1]) * len(board.index_coords)
+
+    def __repr__(self):
+        return f"<CellUpdates for {len(self.indices)} cells>"
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Coord_T]:
+        coords = self._index_coords
+        return (coords[i] for i in self.indices)
+
+    def __contains__(self, coord):
+        try:
+            return self._positions[self._index_of(coord)] >= 0
+        except (IndexError, KeyError, TypeError, ValueError):
+            return False
+
+    def __getitem__(self, coord: Coord_T) -> CellContents:
+        pos = self._positions[self._index_of(coord)]
+        if pos < 0:
+            raise KeyError(coord)
+        return CellContents.by_code[self.codes[pos]]
+
+    def __setitem__(self, coord: Coord_T, contents: CellContents):
+        self.set_index(self._index_of(coord), contents.code)
+
+    def items(self) -> Iterator[Tuple[Coord_T, CellContents]]:
+        coords = self._index_coords
+        by_code = CellContents.by_code
+        return ((coords[i], by_code[c]) for i, c in zip(self.indices, self.codes))
+
+    def set_index(self, index: int, code: int) -> None:
+        """
+        Set the update for a cell, overwriting any previous update to the cell.
+
+        :param index:
+            The flat index of the cell.
+        :param code:
+            The code of the new cell contents.
+        """
+        pos = self._positions[index]
+        if pos < 0:
+            self._positions[index] = len(self.indices)
+            self.indices.append(index)
+            self.codes.append(code)
+        else:
+            self.codes[pos] = code
+
+    def copy(self) -> "CellUpdates":
+        """
+        Create a copy of the updates, unaffected by reuse of this instance.
+        """
+        ret = self.__class__.__new__(self.__class__)
+        ret._index_coords = self._index_coords
+        ret._x_size = self._x_size
+        ret._y_size = self._y_size
+        ret.indices = self.indices[:]
+        ret.codes = self.codes[:]
+        ret._positions = self._positions[:]
+        return ret
+
+    def clear(self) -> None:
+        """Clear the updates, allowing the instance to be reused."""
+        for i in self.indices:
+            self._positions[i] = -1
+        del self.indices[:]
+        del self.codes[:]
+
+    def _index_of(self, coord: Coord_T) -> int:
+        x, y = coord
+        if not (0 <= x < self._x_size and 0 <= y < self._y_size):
+            raise KeyError(coord)
+        return y * self._x_size + x
+
+
 @attr.attrs(auto_attribs=True, kw_only=True)
 class GameInfo:
     """General information about a game."""
@@ -50,6 +154,7 @@ class GameInfo:
     difficulty: Difficulty
     per_cell: int
     first_success: bool
+    no_guess: bool = False
 
     minefield_known: bool
     started_info: Optional[StartedInfo] = None
@@ -62,6 +167,11 @@ class AbstractListener(metaclass=abc.ABCMeta):
     then be registered to listen for callbacks.
     """
 
+    # Whether cell updates may be passed to update_cells() in the compact
+    # CellUpdates format, which is only valid for the duration of the call.
+    # Otherwise a dictionary is always passed.
+    compact_cell_updates: bool = False
+
     @abc.abstractmethod
     def reset(self) -> None:
         """
@@ -89,12 +199,13 @@ class AbstractListener(metaclass=abc.ABCMeta):
         return NotImplemented
 
     @abc.abstractmethod
-    def update_cells(self, cell_updates: Dict[Coord_T, CellContents]) -> None:
+    def update_cells(self, cell_updates: Mapping[Coord_T, CellContents]) -> None:
         """
         Called when one or more cells were updated.
 
         :param cell_updates:
             Mapping of coordinates that were changed to the new cell state.
+            May be a CellUpdates instance if 'compact_cell_updates' is set.
         """
         return NotImplemented
 
@@ -155,10 +266,15 @@ class _Notifier(AbstractListener):
         :param listeners:
         """
         self._listeners: List[AbstractListener] = list(listeners) if listeners else []
+        # Whether to accumulate the time spent calling listeners.
+        self.time_dispatch: bool = False
+        # The total time spent calling listeners while timing was enabled.
+        self.dispatch_time: float = 0
         self._id: int = self._count
         self._logger = logging.getLogger(
             f"{__name__}.{self.__class__.__name__}[{self._id}]"
         )
+        self._trace_logger = get_trace_logger(self._logger.name)
 
         self.__class__._count += 1
 
@@ -203,16 +319,42 @@ class _Notifier(AbstractListener):
 
         def wrapped(*args, **kwargs):
             getattr(self, func + "_orig")(*args, **kwargs)
+            start = tm.perf_counter() if self.time_dispatch else None
+            for listener in self._listeners:
+                self._call_listener(listener, func, *args, **kwargs)
+            if start is not None:
+                self.dispatch_time += tm.perf_counter() - start
+
+        def wrapped_update_cells(cell_updates: Mapping[Coord_T, CellContents]):
+            getattr(self, func + "_orig")(cell_updates)
+            start = tm.perf_counter() if self.time_dispatch else None
+            # Listeners that don't accept the compact format share a single
+            #  dictionary conversion.
+            dict_updates = None
             for listener in self._listeners:
-                try:
-                    getattr(listener, func)(*args, **kwargs)
-                except Exception as e:
-                    self._logger.warning(
-                        f"Error ocurred calling {func}() on {listener}"
-                    )
-                    listener.handle_exception(func, e)
+                if (
+                    isinstance(cell_updates, CellUpdates)
+                    and getattr(listener, "compact_cell_updates", False) is not True
+                ):
+                    if dict_updates is None:
+                        dict_updates = dict(cell_updates.items())
+                    self._call_listener(listener, func, dict_updates)
+                else:
+                    self._call_listener(listener, func, cell_updates)
+            if start is not None:
+                self.dispatch_time += tm.perf_counter() - start
 
-        return wrapped
+        return wrapped_update_cells if func == "update_cells" else wrapped
+
+    def _call_listener(self, listener: AbstractListener, func: str, *args, **kwargs):
+        """
+        Call a method on a listener, passing any exception to the listener.
+        """
+        try:
+            getattr(listener, func)(*args, **kwargs)
+        except Exception as e:
+            self._logger.warning(f"Error ocurred calling {func}() on {listener}")
+            listener.handle_exception(func, e)
 
     def reset(self) -> None:
         """
@@ -229,23 +371,25 @@ class _Notifier(AbstractListener):
         :param y_size:
             The number of columns.
         """
-        self._logger.debug(f"Calling resize_minefield() with {x_size}, {y_size}")
+        self._logger.debug("Calling resize_minefield() with %s, %s", x_size, y_size)
 
     def set_mines(self, mines: int) -> None:
         """
         Called to indicate the number of mines at reset has changed.
         """
-        self._logger.debug(f"Calling set_mines() with {mines}")
+        self._logger.debug("Calling set_mines() with %s", mines)
 
-    def update_cells(self, cell_updates: Dict[Coord_T, CellContents]) -> None:
+    def update_cells(self, cell_updates: Mapping[Coord_T, CellContents]) -> None:
         """
         Called when one or more cells were updated.
 
         :param cell_updates:
             Mapping of coordinates that were changed to the new cell state.
+            CellUpdates instances are converted to dictionaries for listeners
+            that don't set 'compact_cell_updates'.
         """
-        self._logger.debug(
-            f"Calling update_cells() with {len(cell_updates)} updated cells"
+        self._trace_logger.debug(
+            "Calling update_cells() with %d updated cells", len(cell_updates)
         )
 
     def update_game_state(self, game_state: GameState) -> None:
@@ -255,7 +399,7 @@ class _Notifier(AbstractListener):
         :param game_state:
             The new game state.
         """
-        self._logger.debug(f"Calling update_game_state() with {game_state}")
+        self._trace_logger.debug("Calling update_game_state() with %s", game_state)
 
     def update_mines_remaining(self, mines_remaining: int) -> None:
         """
@@ -264,7 +408,9 @@ class _Notifier(AbstractListener):
         :param mines_remaining:
             The new number of mines remaining.
         """
-        self._logger.debug(f"Calling update_mines_remaining() with {mines_remaining}")
+        self._trace_logger.debug(
+            "Calling update_mines_remaining() with %s", mines_remaining
+        )
 
     def ui_mode_changed(self, mode: UIMode) -> None:
         """
@@ -273,7 +419,7 @@ class _Notifier(AbstractListener):
         :param mode:
             The mode to change to.
         """
-        self._logger.debug(f"Calling ui_mode_changed() with {mode}")
+        self._logger.debug("Calling ui_mode_changed() with %s", mode)
 
     def handle_exception(self, method: str, exc: Exception) -> None:
         """
@@ -296,6 +442,7 @@ class AbstractController(metaclass=abc.ABCMeta):
         self._logger = logging.getLogger(
             ".".join([self.__class__.__module__, self.__class__.__name__])
         )
+        self._trace_logger = get_trace_logger(self._logger.name)
 
     def register_listener(self, listener: AbstractListener) -> None:
         """
@@ -366,28 +513,28 @@ class AbstractController(metaclass=abc.ABCMeta):
         """
         Select a cell for a regular click.
         """
-        self._logger.debug("Cell %s selected", coord)
+        self._trace_logger.debug("Cell %s selected", coord)
 
     @abc.abstractmethod
     def flag_cell(self, coord: Coord_T, *, flag_only: bool = False) -> None:
         """
         Select a cell for flagging.
         """
-        self._logger.debug("Cell %s selected for flagging", coord)
+        self._trace_logger.debug("Cell %s selected for flagging", coord)
 
     @abc.abstractmethod
     def chord_on_cell(self, coord: Coord_T) -> None:
         """
         Select a cell for chording.
         """
-        self._logger.debug("Cell %s selected for chording", coord)
+        self._trace_logger.debug("Cell %s selected for chording", coord)
 
     @abc.abstractmethod
     def remove_cell_flags(self, coord: Coord_T) -> None:
         """
         Remove flags in a cell, if any.
         """
-        self._logger.debug("Flags in cell %s being removed", coord)
+        self._trace_logger.debug("Flags in cell %s being removed", coord)
 
     @abc.abstractmethod
     def resize_board(self, x_size: int, y_size: int, mines: int) -> None:
@@ -405,6 +552,13 @@ class AbstractController(metaclass=abc.ABCMeta):
         """
         self._logger.debug("Setting first success to %s", value)
 
+    @abc.abstractmethod
+    def set_no_guess(self, value: bool) -> None:
+        """
+        Set whether minefields should be solvable without guessing.
+        """
+        self._logger.debug("Setting no guess to %s", value)
+
     @abc.abstractmethod
     def set_per_cell(self, value: int) -> None:
         """
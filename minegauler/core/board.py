@@ -15,17 +15,22 @@ Exports
 
 __all__ = ("Board", "Minefield")
 
+import itertools
 import random as rnd
-from typing import Any, Collection, Dict, Iterable, List, Optional, Union
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Union
 
 from ..shared import utils
 from ..shared.types import CellContents, Coord_T
 
 
-class Board(utils.Grid):
+class Board(utils.FlatGrid):
     """
     Representation of a minesweeper board. To be filled with instances of
     CellContents.
+
+    The cells are stored in a byte array using the compact encoding given by
+    CellContents.code, and are decoded back to the interned CellContents
+    instances on access.
     """
 
     def __init__(self, x_size: int, y_size: int):
@@ -36,7 +41,7 @@ class Board(utils.Grid):
         y_size (int > 0)
             The number of rows.
         """
-        super().__init__(x_size, y_size, fill=CellContents.Unclicked)
+        super().__init__(x_size, y_size, fill=CellContents.Unclicked.code, typecode="B")
 
     def __repr__(self):
         return f"<{self.x_size}x{self.y_size} board>"
@@ -45,13 +50,20 @@ class Board(utils.Grid):
         return super().__str__(mapping={CellContents.Num(0): "."})
 
     def __getitem__(self, item: Coord_T) -> CellContents:
-        return super().__getitem__(item)
+        return CellContents.by_code[super().__getitem__(item)]
 
     def __setitem__(self, key: Coord_T, value: CellContents):
         if not isinstance(value, CellContents):
             raise TypeError("Board can only contain CellContents instances")
         else:
-            super().__setitem__(key, value)
+            super().__setitem__(key, value.code)
+
+    def rows(self) -> List[List[CellContents]]:
+        by_code = CellContents.by_code
+        return [[by_code[c] for c in row] for row in super().rows()]
+
+    def fill(self, item: CellContents):
+        super().fill(item.code)
 
     @classmethod
     def from_2d_array(cls, array: List[List[Union[str, int]]]) -> "Board":
@@ -86,14 +98,15 @@ class Board(utils.Grid):
 
     def reset(self):
         """Reset the board to the initial state."""
-        for c in self.all_coords:
-            self[c] = CellContents.Unclicked
+        self.fill(CellContents.Unclicked)
 
 
-class Minefield(utils.Grid):
+class Minefield(utils.FlatGrid):
     """
     Grid representation of a minesweeper minefield, with each cell containing
     an integer representing the number of mines in that cell.
+
+    The number of mines in each cell is stored in a flat array, see FlatGrid.
     """
 
     def __init__(
@@ -104,6 +117,8 @@ class Minefield(utils.Grid):
         mines: Union[int, Iterable[Coord_T]],
         per_cell: int = 1,
         safe_coords: Optional[Iterable[Coord_T]] = None,
+        bulk: bool = True,
+        rng: Optional[rnd.Random] = None,
     ):
         """
         :param x_size:
@@ -119,12 +134,19 @@ class Minefield(utils.Grid):
             Optionally specify coordinates that should not contain a mine when
             filling the minefield. Ignored if a list of mine coords is passed
             in.
+        :param bulk:
+            Whether to calculate the completed board, openings and 3bv using
+            bulk operations over the flat cell storage, rather than using
+            per-coordinate operations. The results are the same either way.
+        :param rng:
+            Optionally specify a random number generator to use when randomly
+            placing mines, otherwise the global random state is used.
         :raise ValueError:
             If the number of mines is too high to fit in the grid or if a list
             of mine coordinates is supplied and the number of mines in a cell
             exceeds the max per cell value.
         """
-        super().__init__(x_size, y_size)
+        super().__init__(x_size, y_size, typecode="H")
         # Maximum number of mines per cell.
         self.per_cell: int = per_cell
         # Number of mines.
@@ -135,12 +157,15 @@ class Minefield(utils.Grid):
         self.completed_board: Board
         # Groups of cells that form the board openings.
         self.openings: Collection[Collection[Coord_T]]
+        # The index into the openings of the opening each blank cell belongs
+        # to, indexed by flat cell index, or -1 for cells that aren't blank.
+        self.opening_index: List[int]
         # The 3bv of the minefield.
         self.bbbv: int
 
         if isinstance(mines, int):
             self.nr_mines = mines
-            mine_coords = self._choose_mine_coords(safe_coords)
+            mine_coords = self._choose_mine_coords(safe_coords, rng=rng)
         else:
             mine_coords = list(mines)
             self.nr_mines = len(mine_coords)
@@ -152,16 +177,36 @@ class Minefield(utils.Grid):
                 )
             self[c] += 1
         self.mine_coords = mine_coords
-        self.completed_board = self._calc_completed_board()
-        self.openings = self._find_openings()
-        self.bbbv = self._calc_3bv()
+        if bulk:
+            self.completed_board = self._calc_completed_board_bulk()
+            self.openings = self._find_openings_bulk()
+            self.bbbv = self._calc_3bv_bulk()
+        else:
+            self.completed_board = self._calc_completed_board()
+            self.openings = self._find_openings()
+            self.bbbv = self._calc_3bv()
+        self.opening_index = self._calc_opening_index()
 
     def __repr__(self):
         mines_str = f" with {self.nr_mines} mines" if self.nr_mines else ""
         return f"<{self.x_size}x{self.y_size} minefield{mines_str}>"
 
+    def copy(self) -> "Minefield":
+        """
+        Create a copy of the minefield, not sharing any mutable state with the
+        original.
+        """
+        ret = super().copy()
+        ret.mine_coords = list(self.mine_coords)
+        ret.completed_board = self.completed_board.copy()
+        ret.openings = [list(opening) for opening in self.openings]
+        ret.opening_index = list(self.opening_index)
+        return ret
+
     @classmethod
-    def from_grid(cls, grid: utils.Grid, *, per_cell: int = 1) -> "Minefield":
+    def from_grid(
+        cls, grid: Union[utils.Grid, utils.FlatGrid], *, per_cell: int = 1
+    ) -> "Minefield":
         """
         Create a minefield with a grid showing where mines are to lie.
 
@@ -220,20 +265,31 @@ class Minefield(utils.Grid):
         )
 
     def _choose_mine_coords(
-        self, safe_coords: Optional[Iterable[Coord_T]] = None
+        self,
+        safe_coords: Optional[Iterable[Coord_T]] = None,
+        *,
+        rng: Optional[rnd.Random] = None,
     ) -> List[Coord_T]:
         """
         Randomly choose coordinates for mines to be in.
 
+        Only the positions of the mines are sampled, where each cell provides
+        'per_cell' positions.
+
         :param safe_coords:
             Optionally specify coordinates that should not contain a mine when
             filling the minefield. Ignored if a list of mine coords is passed
             in.
+        :param rng:
+            Optionally specify a random number generator to use, otherwise the
+            global random state is used.
         :return:
             A list of randomly chosen mine coords.
         :raise ValueError:
             If the number of mines is too high to fit in the grid.
         """
+        if rng is None:
+            rng = rnd
         safe_coords = set(safe_coords) if safe_coords else None
         self.check_enough_space(
             x_size=self.x_size,
@@ -243,17 +299,81 @@ class Minefield(utils.Grid):
             nr_safe_cells=len(safe_coords) if safe_coords else 1,
         )
 
-        # Get a list of coordinates which can have mines placed in them.
+        # Get the indices of the cells which can have mines placed in them.
+        coords = self.index_coords
         if safe_coords is None:
-            avble_coords = self.all_coords.copy()
+            avble = list(range(len(coords)))
         else:
-            avble_coords = [c for c in self.all_coords if c not in safe_coords]
+            avble = [i for i, c in enumerate(coords) if c not in safe_coords]
         # Make sure there is at least one safe cell.
-        if len(avble_coords) == len(self.all_coords):
-            avble_coords.pop(rnd.randint(0, len(avble_coords) - 1))
-        avble_coords *= self.per_cell
-        rnd.shuffle(avble_coords)
-        return avble_coords[: self.nr_mines]
+        if len(avble) == len(coords):
+            del avble[rng.randrange(len(avble))]
+        positions = rng.sample(range(len(avble) * self.per_cell), self.nr_mines)
+        return [coords[avble[p % len(avble)]] for p in positions]
+
+    @classmethod
+    def generate_many(
+        cls,
+        n: Optional[int],
+        x_size: int,
+        y_size: int,
+        mines: int,
+        per_cell: int = 1,
+        *,
+        safe_coords: Optional[Iterable[Coord_T]] = None,
+        seed: Optional[Any] = None,
+        bulk: bool = True,
+    ) -> Iterator["Minefield"]:
+        """
+        Lazily generate a stream of random minefields.
+
+        The minefields are generated using a random number generator private
+        to the stream, so that the stream is reproducible for a given seed and
+        the global random state is not touched.
+
+        :param n:
+            The number of minefields to generate, or None to generate an
+            endless stream.
+        :param x_size:
+            Number of columns in the grid.
+        :param y_size:
+            Number of rows in the grid.
+        :param mines:
+            The number of mines to randomly place.
+        :param per_cell:
+            Maximum number of mines per cell.
+        :param safe_coords:
+            Optionally specify coordinates that should not contain a mine.
+        :param seed:
+            Seed for the stream's random number generator.
+        :param bulk:
+            See Minefield.__init__().
+        :return:
+            An iterator of the generated minefields.
+        :raise ValueError:
+            If the number of mines is too high to fit in the grid.
+        """
+        safe_coords = list(safe_coords) if safe_coords else None
+        cls.check_enough_space(
+            x_size=x_size,
+            y_size=y_size,
+            mines=mines,
+            per_cell=per_cell,
+            nr_safe_cells=len(set(safe_coords)) if safe_coords else 1,
+        )
+        rng = rnd.Random(seed)
+        return (
+            cls(
+                x_size,
+                y_size,
+                mines=mines,
+                per_cell=per_cell,
+                safe_coords=safe_coords,
+                bulk=bulk,
+                rng=rng,
+            )
+            for _ in (itertools.count() if n is None else range(n))
+        )
 
     @staticmethod
     def check_enough_space(
@@ -304,13 +424,34 @@ class Minefield(utils.Grid):
             mines = self[c]
             if mines > 0:
                 completed_board[c] = CellContents.Flag(mines)
-                for nbr in self.get_nbrs(c):
+                for nbr in self.iter_nbrs(c):
                     # For neighbouring cells that don't contain mines, increment
                     #  their number.
                     if not self.cell_contains_mine(nbr):
                         completed_board[nbr] += mines
         return completed_board
 
+    def _calc_completed_board_bulk(self) -> Board:
+        """
+        Bulk equivalent of _calc_completed_board(), summing the mines around
+        each cell over the flat neighbour index table.
+        """
+        cells = self.cells
+        nbr_indices = self.nbr_indices
+        nums = [0] * len(cells)
+        for i, mines in enumerate(cells):
+            if mines > 0:
+                for j in nbr_indices[i]:
+                    nums[j] += mines
+        completed_board = Board(self.x_size, self.y_size)
+        flag_code = CellContents.Flag(1).code - 1
+        num_code = CellContents.Num(0).code
+        completed_board.cells = completed_board._new_cells(
+            flag_code + mines if mines > 0 else num_code + nums[i]
+            for i, mines in enumerate(cells)
+        )
+        return completed_board
+
     def _find_openings(self) -> List[List[Coord_T]]:
         """
         Find the openings of the board.
@@ -342,6 +483,61 @@ class Minefield(utils.Grid):
             blanks_to_check -= opening
         return openings
 
+    def _find_openings_bulk(self) -> List[List[Coord_T]]:
+        """
+        Bulk equivalent of _find_openings(), labelling the connected
+        components of blank cells over the flat neighbour index table.
+        """
+        blank = CellContents.Num(0).code
+        is_blank = [c == blank for c in self.completed_board.cells]
+        nbr_indices = self.nbr_indices
+        coords = self.index_coords
+        labelled = [False] * len(is_blank)
+        openings = []
+        for i, i_blank in enumerate(is_blank):
+            if not i_blank or labelled[i]:
+                continue
+            labelled[i] = True
+            opening = {i}  # Indices belonging to the opening
+            check = [i]  # Blank indices whose neighbours need checking
+            while check:
+                for j in nbr_indices[check.pop()]:
+                    if j not in opening:
+                        opening.add(j)
+                        if is_blank[j]:
+                            labelled[j] = True
+                            check.append(j)
+            openings.append(sorted(coords[j] for j in opening))
+        return openings
+
+    def _calc_opening_index(self) -> List[int]:
+        """
+        Create the index of which opening each blank cell belongs to. Note that
+        cells at the edge of an opening may belong to multiple openings, so are
+        not indexed.
+        """
+        blank = CellContents.Num(0).code
+        completed_cells = self.completed_board.cells
+        opening_index = [-1] * len(completed_cells)
+        for i, opening in enumerate(self.openings):
+            for c in opening:
+                j = self.index_of(c)
+                if completed_cells[j] == blank:
+                    opening_index[j] = i
+        return opening_index
+
+    def get_opening(self, coord: Coord_T) -> Optional[Collection[Coord_T]]:
+        """
+        Get the opening a blank cell belongs to.
+
+        :param coord:
+            The coordinate of the cell.
+        :return:
+            The coordinates of the opening, or None if the cell is not blank.
+        """
+        i = self.opening_index[self.index_of(coord)]
+        return self.openings[i] if i >= 0 else None
+
     def _calc_3bv(self) -> int:
         """Calculate the 3bv of the board."""
         assert self.openings is not None
@@ -349,3 +545,16 @@ class Minefield(utils.Grid):
         exposed = len({c for opening in self.openings for c in opening})
         clicks += self.x_size * self.y_size - len(set(self.mine_coords)) - exposed
         return clicks
+
+    def _calc_3bv_bulk(self) -> int:
+        """
+        Bulk equivalent of _calc_3bv(), counting cells over the flat storage.
+        """
+        assert self.openings is not None
+        exposed = bytearray(len(self.cells))
+        index_of = self.index_of
+        for opening in self.openings:
+            for c in opening:
+                exposed[index_of(c)] = 1
+        nr_mine_cells = len(self.cells) - self.cells.count(0)
+        return len(self.openings) + len(self.cells) - nr_mine_cells - exposed.count(1)
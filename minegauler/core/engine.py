@@ -8,15 +8,26 @@ Exports
 .. class:: BaseController
     Implementation of game logic.
 
+.. class:: LatencyHistogram
+    Histogram of latencies in logarithmic buckets.
+
+.. class:: LatencyStats
+    Latency histograms of controller actions.
+
 """
 
-__all__ = ("BaseController",)
+__all__ = ("BaseController", "LatencyHistogram", "LatencyStats")
 
 import abc
+import bisect
+import functools
 import json
 import logging
 import os
-from typing import Dict, Optional
+import random as rnd
+import threading
+import time as tm
+from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Tuple
 
 import attr
 
@@ -29,7 +40,7 @@ from ..shared.types import (
     UIMode,
 )
 from ..shared.utils import GameOptsStruct, Grid
-from . import api, game
+from . import api, game, noguess
 from .board import Board, Minefield
 
 
@@ -53,6 +64,307 @@ def _save_minefield(mf: Minefield, file: PathLike) -> None:
         json.dump(mf.to_json(), f)
 
 
+class LatencyHistogram:
+    """
+    Histogram of latencies, counted in buckets whose upper bounds double from
+    10 microseconds up to around 5 seconds, plus an overflow bucket.
+    """
+
+    bucket_bounds: Tuple[float, ...] = tuple(10e-6 * 2 ** i for i in range(20))
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(self.bucket_bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+
+    def add(self, latency: float) -> None:
+        """
+        Add a latency to the histogram.
+
+        :param latency:
+            The latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.bucket_bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get an upper bound on a percentile of the latencies, given by the upper
+        bound of the bucket it falls in (or the max latency if lower).
+
+        :param pct:
+            The percentile to get, between 0 and 100.
+        :return:
+            The latency in seconds, or zero if there are no latencies.
+        """
+        if not self.count:
+            return 0
+        target = pct / 100 * self.count
+        cumulative = 0
+        for bound, count in zip(self.bucket_bounds, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serialisable summary of the histogram."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "bucket_bounds": list(self.bucket_bounds),
+            "counts": self.counts,
+        }
+
+
+class LatencyStats:
+    """
+    Latency histograms of controller actions, per board and action, with the
+    time split into game logic and dispatching updates to listeners.
+    """
+
+    parts = ("logic", "dispatch")
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = dict()
+
+    def record(self, board: str, action: str, logic: float, dispatch: float) -> None:
+        """
+        Record the latency of an action.
+
+        :param board:
+            A label for the board settings, e.g. "16x16/40".
+        :param action:
+            The name of the action, e.g. "select_cell".
+        :param logic:
+            The time spent in game logic, in seconds.
+        :param dispatch:
+            The time spent dispatching updates to listeners, in seconds.
+        """
+        for part, latency in zip(self.parts, (logic, dispatch)):
+            key = (board, action, part)
+            if key not in self._histograms:
+                self._histograms[key] = LatencyHistogram()
+            self._histograms[key].add(latency)
+
+    def get(self, board: str, action: str, part: str) -> LatencyHistogram:
+        """
+        Get a histogram of recorded latencies.
+
+        :param board:
+            The board label, see record().
+        :param action:
+            The name of the action.
+        :param part:
+            Either "logic" or "dispatch".
+        :return:
+            The histogram, which is empty if nothing was recorded.
+        """
+        if part not in self.parts:
+            raise ValueError(
+                f"Unrecognised part {part!r}, expected one of {self.parts}"
+            )
+        return self._histograms.get((board, action, part), LatencyHistogram())
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Get a JSON-serialisable summary, nested by board, action and part.
+        """
+        result = dict()
+        for (board, action, part), hist in sorted(self._histograms.items()):
+            action_results = result.setdefault(board, dict()).setdefault(action, dict())
+            action_results[part] = hist.to_dict()
+        return result
+
+    def dump(self, file: PathLike) -> None:
+        """
+        Dump the summary of latencies to a JSON file.
+
+        :param file:
+            The path of the file to write.
+        :raises OSError:
+            If writing to file fails.
+        """
+        with open(file, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _timed(action: str) -> Callable:
+    """
+    Decorator for BaseController methods to record their latency when latency
+    stats are enabled.
+
+    :param action:
+        The name of the action to record against.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapped(self: "BaseController", *args, **kwargs):
+            stats = self._latency_stats
+            if not self._record_latency:
+                return method(self, *args, **kwargs)
+            dispatch_start = self._notif.dispatch_time
+            start = tm.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                elapsed = tm.perf_counter() - start
+                dispatch = self._notif.dispatch_time - dispatch_start
+                stats.record(self._board_label(), action, elapsed - dispatch, dispatch)
+
+        return wrapped
+
+    return decorator
+
+
+class _MinefieldPool:
+    """
+    A pool of minefields pregenerated in a background thread, to avoid
+    generating a minefield when the first cell of a game is selected.
+
+    Minefields are only kept for the most recently requested board settings,
+    see prepare(). Minefields that are checked against the safe coordinates of
+    a take() and don't fit are discarded rather than kept for later, so that
+    the pool keeps being refilled and each minefield given out is an unbiased
+    random choice among those that fit.
+    """
+
+    def __init__(self, size: int = 10):
+        """
+        :param size:
+            The number of minefields to keep pregenerated.
+        """
+        self.size: int = size
+        self._key: Optional[Tuple[int, int, int, int]] = None
+        self._minefields: List[Minefield] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._rng = rnd.Random()
+
+    def prepare(self, x_size: int, y_size: int, mines: int, per_cell: int) -> None:
+        """
+        Start pregenerating minefields with the given settings, discarding any
+        minefields with other settings.
+
+        :param x_size:
+            Number of columns in the grid.
+        :param y_size:
+            Number of rows in the grid.
+        :param mines:
+            The number of mines.
+        :param per_cell:
+            Maximum number of mines per cell.
+        """
+        key = (x_size, y_size, mines, per_cell)
+        with self._lock:
+            if key != self._key:
+                self._key = key
+                self._minefields = []
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="minefield-pool", daemon=True
+            )
+            self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread, discarding any pregenerated minefields.
+        The thread is started again by a subsequent call to prepare().
+
+        :param timeout:
+            The maximum time in seconds to wait for the thread to finish.
+        """
+        if self._thread is None:
+            return
+        with self._lock:
+            self._stopping.set()
+            self._key = None
+            self._minefields = []
+            self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def take(
+        self,
+        x_size: int,
+        y_size: int,
+        mines: int,
+        per_cell: int,
+        safe_coords: Collection[Coord_T],
+    ) -> Optional[Minefield]:
+        """
+        Take a pregenerated minefield with no mines in the given coordinates,
+        discarding any checked minefields that have mines in them.
+
+        :param x_size:
+            Number of columns in the grid.
+        :param y_size:
+            Number of rows in the grid.
+        :param mines:
+            The number of mines.
+        :param per_cell:
+            Maximum number of mines per cell.
+        :param safe_coords:
+            Coordinates that must not contain a mine.
+        :return:
+            The minefield, or None if no suitable minefield is available.
+        """
+        mf = None
+        with self._lock:
+            if (x_size, y_size, mines, per_cell) == self._key:
+                while self._minefields:
+                    candidate = self._minefields.pop(0)
+                    if not any(candidate.cell_contains_mine(c) for c in safe_coords):
+                        mf = candidate
+                        break
+        self._wakeup.set()
+        return mf
+
+    def _run(self) -> None:
+        """Keep the pool topped up. Run in the background thread."""
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                if self._stopping.is_set():
+                    break
+                key = self._key
+                if key is None or len(self._minefields) >= self.size:
+                    self._wakeup.clear()
+                    continue
+            x_size, y_size, mines, per_cell = key
+            try:
+                mf = Minefield(
+                    x_size, y_size, mines=mines, per_cell=per_cell, rng=self._rng
+                )
+            except ValueError:
+                logger.debug("Unable to pregenerate minefields for %s", key)
+                with self._lock:
+                    if key == self._key:
+                        self._wakeup.clear()
+                continue
+            with self._lock:
+                if key == self._key:
+                    self._minefields.append(mf)
+
+
 @attr.attrs(auto_attribs=True, kw_only=True)
 class _SharedInfo:
     """
@@ -60,7 +372,7 @@ class _SharedInfo:
 
     Elements:
     cell_updates
-        Dictionary of updates to cells, mapping the coordinate to the new
+        Mapping of updates to cells, mapping the coordinate to the new
         contents of the cell.
     game_state
         The state of the game.
@@ -72,7 +384,7 @@ class _SharedInfo:
         The number of lives remaining.
     """
 
-    cell_updates: Optional[Dict[Coord_T, CellContents]] = None
+    cell_updates: Optional[Mapping[Coord_T, CellContents]] = None
     game_state: GameState = GameState.READY
     mines_remaining: int = 0
     lives_remaining: int = 0
@@ -88,12 +400,23 @@ class _AbstractSubController(api.AbstractController, metaclass=abc.ABCMeta):
 class BaseController(api.AbstractController):
     """Base controller implementing all user interaction methods."""
 
-    def __init__(self, opts: GameOptsStruct):
+    def __init__(self, opts: GameOptsStruct, *, pregenerate_minefields: bool = True):
+        """
+        :param opts:
+            Game options.
+        :param pregenerate_minefields:
+            Whether to pregenerate minefields in a background thread.
+        """
         super().__init__(opts)
         self._mode = UIMode.GAME
+        self._mf_pool: Optional[_MinefieldPool] = None
+        if pregenerate_minefields:
+            self._mf_pool = _MinefieldPool()
         self._active_ctrlr: _AbstractSubController = _GameController(
-            self._opts, notif=self._notif
+            self._opts, notif=self._notif, mf_pool=self._mf_pool
         )
+        self._latency_stats: Optional[LatencyStats] = None
+        self._record_latency: bool = False
 
     def switch_mode(self, mode: UIMode) -> None:
         """Switch the mode of the UI, e.g. into 'create' mode."""
@@ -102,7 +425,9 @@ class BaseController(api.AbstractController):
             logger.debug("Ignore switch mode request because mode is already %s", mode)
             return
         if mode is UIMode.GAME:
-            self._active_ctrlr = _GameController(self._opts, notif=self._notif)
+            self._active_ctrlr = _GameController(
+                self._opts, notif=self._notif, mf_pool=self._mf_pool
+            )
         elif mode is UIMode.CREATE:
             self._active_ctrlr = _CreateController(self._opts, notif=self._notif)
         else:
@@ -110,6 +435,56 @@ class BaseController(api.AbstractController):
         self._mode = mode
         self._notif.reset()
 
+    def shutdown(self) -> None:
+        """
+        Stop background work, i.e. pregenerating minefields. Should be called
+        when the controller is no longer needed.
+        """
+        if self._mf_pool:
+            self._mf_pool.stop()
+
+    def enable_latency_stats(self, enable: bool = True) -> None:
+        """
+        Enable or disable recording latency stats for user actions. Any
+        previously recorded stats are kept.
+
+        :param enable:
+            Whether to enable recording.
+        """
+        if enable and self._latency_stats is None:
+            self._latency_stats = LatencyStats()
+        self._record_latency = enable
+        self._notif.time_dispatch = enable
+
+    def get_latency_stats(self) -> Optional[LatencyStats]:
+        """
+        Get the recorded latency stats, or None if never enabled.
+        """
+        return self._latency_stats
+
+    def dump_latency_stats(self, file: PathLike) -> None:
+        """
+        Dump the recorded latency stats to a JSON file.
+
+        :param file:
+            The path of the file to write.
+        :raises RuntimeError:
+            If latency stats have never been enabled.
+        :raises OSError:
+            If writing to file fails.
+        """
+        if self._latency_stats is None:
+            raise RuntimeError("Latency stats have not been enabled")
+        logger.info("Dumping latency stats to %s", file)
+        self._latency_stats.dump(file)
+
+    def _board_label(self) -> str:
+        opts = self._active_ctrlr._opts
+        label = f"{opts.x_size}x{opts.y_size}/{opts.mines}"
+        if opts.per_cell > 1:
+            label += f"/{opts.per_cell}"
+        return label
+
     # ----------------------------------
     # Delegated abstractmethods
     # ----------------------------------
@@ -117,21 +492,27 @@ class BaseController(api.AbstractController):
     def board(self) -> Board:
         return self._active_ctrlr.board
 
+    @_timed("get_game_info")
     def get_game_info(self) -> api.GameInfo:
         return self._active_ctrlr.get_game_info()
 
+    @_timed("new_game")
     def new_game(self) -> None:
         self._active_ctrlr.new_game()
 
+    @_timed("restart_game")
     def restart_game(self) -> None:
         self._active_ctrlr.restart_game()
 
+    @_timed("select_cell")
     def select_cell(self, coord: Coord_T) -> None:
         self._active_ctrlr.select_cell(coord)
 
+    @_timed("flag_cell")
     def flag_cell(self, coord: Coord_T, *, flag_only: bool = False) -> None:
         self._active_ctrlr.flag_cell(coord, flag_only=flag_only)
 
+    @_timed("chord_on_cell")
     def chord_on_cell(self, coord: Coord_T) -> None:
         self._active_ctrlr.chord_on_cell(coord)
 
@@ -144,6 +525,9 @@ class BaseController(api.AbstractController):
     def set_first_success(self, value: bool) -> None:
         self._active_ctrlr.set_first_success(value)
 
+    def set_no_guess(self, value: bool) -> None:
+        self._active_ctrlr.set_no_guess(value)
+
     def set_per_cell(self, value: int) -> None:
         self._active_ctrlr.set_per_cell(value)
 
@@ -175,25 +559,22 @@ class _GameController(_AbstractSubController):
         opts: GameOptsStruct,
         *,
         notif: api.AbstractListener,
+        mf_pool: Optional[_MinefieldPool] = None,
     ):
         """
         :param opts:
             Game options.
         :param notif:
             A notifier defining callbacks.
+        :param mf_pool:
+            Optionally specify a pool of pregenerated minefields to use.
         """
         super().__init__(opts)
         # Use a reference to the given opts rather than a copy.
         self._opts = opts
         self._notif = notif
-        self._game = game.Game(
-            x_size=self._opts.x_size,
-            y_size=self._opts.y_size,
-            mines=self._opts.mines,
-            per_cell=self._opts.per_cell,
-            lives=self._opts.lives,
-            first_success=self._opts.first_success,
-        )
+        self._mf_pool = mf_pool
+        self._game = self._create_game()
         self._last_update = _SharedInfo()
         self._send_updates()
         self._notif.set_mines(self._opts.mines)
@@ -212,6 +593,7 @@ class _GameController(_AbstractSubController):
             difficulty=self._game.difficulty,
             per_cell=self._game.per_cell,
             first_success=self._game.first_success,
+            no_guess=self._game.no_guess,
             minefield_known=self._game.minefield_known,
         )
         if self._game.state.started():
@@ -244,14 +626,7 @@ class _GameController(_AbstractSubController):
             )
             self._opts.mines = self._opts.x_size * self._opts.y_size - 1
             self._notif.set_mines(self._opts.mines)
-        self._game = game.Game(
-            x_size=self._opts.x_size,
-            y_size=self._opts.y_size,
-            mines=self._opts.mines,
-            per_cell=self._opts.per_cell,
-            lives=self._opts.lives,
-            first_success=self._opts.first_success,
-        )
+        self._game = self._create_game()
         self._send_reset_update()
 
     def restart_game(self) -> None:
@@ -259,7 +634,9 @@ class _GameController(_AbstractSubController):
         if not self._game.mf:
             return
         super().restart_game()
-        self._game = game.Game(minefield=self._game.mf, lives=self._opts.lives)
+        self._game = game.Game(
+            minefield=self._game.mf, lives=self._opts.lives, compact_updates=True
+        )
         self._send_reset_update()
 
     def select_cell(self, coord: Coord_T) -> None:
@@ -324,14 +701,7 @@ class _GameController(_AbstractSubController):
         self._opts.y_size = y_size
         self._opts.mines = mines
 
-        self._game = game.Game(
-            x_size=self._opts.x_size,
-            y_size=self._opts.y_size,
-            mines=self._opts.mines,
-            per_cell=self._opts.per_cell,
-            lives=self._opts.lives,
-            first_success=self._opts.first_success,
-        )
+        self._game = self._create_game()
         self._send_resize_update()
 
     def set_first_success(self, value: bool) -> None:
@@ -343,6 +713,18 @@ class _GameController(_AbstractSubController):
         if not self._game.state.started():
             self._game.first_success = value
 
+    def set_no_guess(self, value: bool) -> None:
+        """
+        Set whether minefields should be solvable without guessing.
+        """
+        super().set_no_guess(value)
+        self._opts.no_guess = value
+        if value:
+            # Start the worker processes ahead of the first click.
+            noguess.start_worker_pool()
+        if not self._game.state.started():
+            self._game.no_guess = value
+
     def set_per_cell(self, value: int) -> None:
         """
         Set the maximum number of mines per cell.
@@ -396,12 +778,41 @@ class _GameController(_AbstractSubController):
         self._opts.x_size = mf.x_size
         self._opts.y_size = mf.y_size
         self._opts.mines = mf.nr_mines
-        self._game = game.Game(minefield=mf, lives=self._opts.lives)
+        self._game = game.Game(
+            minefield=mf, lives=self._opts.lives, compact_updates=True
+        )
         self._send_resize_update()
 
     # --------------------------------------------------------------------------
     # Helper methods
     # --------------------------------------------------------------------------
+    def _create_game(self) -> game.Game:
+        """Create a new game using the current options."""
+        minefield_pool = None
+        if self._mf_pool:
+            pool_args = (
+                self._opts.x_size,
+                self._opts.y_size,
+                self._opts.mines,
+                self._opts.per_cell,
+            )
+            self._mf_pool.prepare(*pool_args)
+            minefield_pool = functools.partial(self._mf_pool.take, *pool_args)
+        if self._opts.no_guess:
+            # Start the worker processes ahead of the first click.
+            noguess.start_worker_pool()
+        return game.Game(
+            x_size=self._opts.x_size,
+            y_size=self._opts.y_size,
+            mines=self._opts.mines,
+            per_cell=self._opts.per_cell,
+            lives=self._opts.lives,
+            first_success=self._opts.first_success,
+            no_guess=self._opts.no_guess,
+            minefield_pool=minefield_pool,
+            compact_updates=True,
+        )
+
     def _send_reset_update(self) -> None:
         """Send an update to reset the board."""
         self._notif.reset()
@@ -414,27 +825,28 @@ class _GameController(_AbstractSubController):
         self._send_updates()
 
     def _send_updates(
-        self, cells_updated: Optional[Dict[Coord_T, CellContents]] = None
+        self, cells_updated: Optional[Mapping[Coord_T, CellContents]] = None
     ) -> None:
         """Send updates to registered listeners."""
-        update = _SharedInfo(
-            cell_updates=cells_updated,
-            mines_remaining=self._game.mines_remaining,
-            lives_remaining=self._game.lives_remaining,
-            game_state=self._game.state,
-        )
+        last_update = self._last_update
+        mines_remaining = self._game.mines_remaining
+        game_state = self._game.state
 
         # Send updates to registered listeners.
-        if update.cell_updates:
-            self._notif.update_cells(update.cell_updates)
-        if update.mines_remaining != self._last_update.mines_remaining:
-            self._notif.update_mines_remaining(update.mines_remaining)
-        # if update.lives_remaining != self._last_update.lives_remaining:
-        #     self._notif.update_lives_remaining(update.lives_remaining)
-        if update.game_state is not self._last_update.game_state:
-            self._notif.update_game_state(update.game_state)
-
-        self._last_update = update
+        if cells_updated:
+            self._notif.update_cells(cells_updated)
+        if mines_remaining != last_update.mines_remaining:
+            self._notif.update_mines_remaining(mines_remaining)
+        # if lives_remaining != last_update.lives_remaining:
+        #     self._notif.update_lives_remaining(lives_remaining)
+        if game_state is not last_update.game_state:
+            self._notif.update_game_state(game_state)
+
+        # Update the stored info in place. The cell updates may be a reusable
+        #  buffer, so are not kept.
+        last_update.mines_remaining = mines_remaining
+        last_update.lives_remaining = self._game.lives_remaining
+        last_update.game_state = game_state
 
 
 class _CreateController(_AbstractSubController):
@@ -464,6 +876,7 @@ class _CreateController(_AbstractSubController):
             ),
             per_cell=self._opts.per_cell,
             first_success=self._opts.first_success,
+            no_guess=self._opts.no_guess,
             minefield_known=True,
         )
 
@@ -551,6 +964,10 @@ class _CreateController(_AbstractSubController):
         super().set_first_success(value)
         self._opts.first_success = value
 
+    def set_no_guess(self, value: bool) -> None:
+        super().set_no_guess(value)
+        self._opts.no_guess = value
+
     def set_per_cell(self, value: int) -> None:
         super().set_per_cell(value)
         self._opts.per_cell = value
@@ -15,14 +15,28 @@ __all__ = ("Game", "GameNotStartedError")
 import functools
 import logging
 import math
+import random as rnd
 import time as tm
-from typing import Callable, Dict, Iterable, Optional, Union
-
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+from ..shared.logs import get_trace_logger
 from ..shared.types import CellContents, CellContents_T, Coord_T, Difficulty, GameState
+from .api import CellUpdates
 from .board import Board, Minefield
 
 
 logger = logging.getLogger(__name__)
+trace_logger = get_trace_logger(__name__)
 
 
 def _check_coord(method: Callable) -> Callable:
@@ -149,6 +163,11 @@ class Game:
     standard interactions such as selecting or flagging a cell and chording.
     """
 
+    # Whether to perform expensive consistency checks on the tracked state.
+    debug_checks: bool = False
+    # The maximum time to spend generating a no-guess minefield, in seconds.
+    no_guess_timeout: float = 5
+
     def __init__(
         self,
         *,
@@ -158,7 +177,14 @@ class Game:
         per_cell: int = 1,
         lives: int = 1,
         first_success: bool = False,
+        no_guess: bool = False,
         minefield: Optional[Minefield] = None,
+        minefield_pool: Optional[
+            Callable[[Collection[Coord_T]], Optional[Minefield]]
+        ] = None,
+        rng: Optional[rnd.Random] = None,
+        compact_updates: bool = False,
+        game_logger: Optional[logging.Logger] = None,
     ):
         """
         :param x_size:
@@ -180,9 +206,30 @@ class Game:
             give an opening if possible. Ignored if a minefield is passed in, as
             the minefield is not created in response to the first select, so it
             is not possible to guarantee success on the first select.
+        :param no_guess:
+            Whether the minefield should be solvable without guessing from the
+            first cell selected, which is also guaranteed to give an opening.
+            Falls back to 'first_success' behaviour if no such minefield is
+            found in time. Ignored if a minefield is passed in.
         :param minefield:
             A minefield to use for the game. Takes precedence over various other
             arguments, see above.
+        :param minefield_pool:
+            Optionally specify a function to get a pregenerated minefield with
+            no mines in the given coordinates, returning None if there isn't
+            one available. Used in preference to generating a minefield when
+            the first cell is selected, except in no-guess mode.
+        :param rng:
+            Optionally specify a random number generator to use when creating
+            the minefield, rather than the global random state.
+        :param compact_updates:
+            Whether to return cell updates from actions in the compact
+            CellUpdates format rather than as a dictionary. The returned
+            updates are reused as a buffer, so are only valid until the next
+            action.
+        :param game_logger:
+            Optionally specify a logger to use for all logging from the game,
+            including on the trace channel, rather than this module's loggers.
         :raise ValueError:
             If the number of mines is too high to fit in the grid.
         """
@@ -193,6 +240,7 @@ class Game:
             mines = minefield.nr_mines
             per_cell = minefield.per_cell
             first_success = False
+            no_guess = False
             self.mf = minefield
             self.minefield_known = True
         else:
@@ -212,13 +260,27 @@ class Game:
         self.per_cell: int = per_cell
         self.lives: int = lives
         self.first_success: bool = first_success
+        self.no_guess: bool = no_guess
+        self._minefield_pool = minefield_pool
+        self._rng: Optional[rnd.Random] = rng
+        self._logger: logging.Logger = game_logger or logger
+        self._trace_logger: logging.Logger = game_logger or trace_logger
         self.board: Board = Board(x_size, y_size)
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.state: GameState = GameState.READY
         self.mines_remaining: int = self.mines
         self.lives_remaining: int = self.lives
-        self._cell_updates: Dict[Coord_T, CellContents] = dict()
+        self.compact_updates: bool = compact_updates
+        self._cell_updates: Union[Dict[Coord_T, CellContents], CellUpdates]
+        if compact_updates:
+            # Alternate between two buffers, with the returned updates cleared
+            #  when the next action's updates are returned.
+            self._cell_updates = CellUpdates(self.board)
+            self._spare_cell_updates: Optional[CellUpdates] = CellUpdates(self.board)
+        else:
+            self._cell_updates = dict()
+            self._spare_cell_updates = None
         self._num_flags: int = 0
 
     @property
@@ -227,7 +289,9 @@ class Game:
 
     def get_rem_3bv(self) -> int:
         """
-        Calculate the minimum remaining number of clicks needed to solve.
+        Get the minimum remaining number of clicks needed to solve.
+
+        This is tracked incrementally as cells are revealed.
         """
         if self.state is GameState.READY:
             if not self.mf:
@@ -236,26 +300,29 @@ class Game:
         elif self.state is GameState.WON:
             return 0
         else:
-            partial_mf = Minefield.from_grid(self.mf, per_cell=self.per_cell)
-            # Replace any openings already found with normal clicks (ones).
-            for c in self.board.all_coords:
-                if type(self.board[c]) is CellContents.Num:
-                    partial_mf.completed_board[c] = CellContents.Num(1)
-            # Find the openings which remain.
-            partial_mf.openings = partial_mf._find_openings()
-            rem_opening_coords = {c for opening in partial_mf.openings for c in opening}
-            # Count the number of essential clicks that have already been
-            # done by counting clicked cells minus the ones at the edge of
-            # an undiscovered opening.
-            completed_3bv = len(
-                {
-                    c
-                    for c in self.board.all_coords
-                    if type(self.board[c]) is CellContents.Num
-                }
-                - rem_opening_coords
-            )
-            return partial_mf._calc_3bv() - completed_3bv
+            return self._rem_openings + self._rem_isolated
+
+    def _calc_rem_3bv(self) -> int:
+        """
+        Calculate the minimum remaining number of clicks needed to solve from
+        scratch, by finding the remaining openings on a partial minefield.
+        """
+        partial_mf = Minefield.from_grid(self.mf, per_cell=self.per_cell)
+        # Replace any openings already found with normal clicks (ones).
+        for c in self.board.all_coords:
+            if type(self.board[c]) is CellContents.Num:
+                partial_mf.completed_board[c] = CellContents.Num(1)
+        # Find the openings which remain.
+        partial_mf.openings = partial_mf._find_openings()
+        rem_opening_coords = {c for opening in partial_mf.openings for c in opening}
+        # Count the number of essential clicks that have already been
+        # done by counting clicked cells minus the ones at the edge of
+        # an undiscovered opening.
+        completed_3bv = len(
+            {c for c in self.board.all_coords if type(self.board[c]) is CellContents.Num}
+            - rem_opening_coords
+        )
+        return partial_mf._calc_3bv() - completed_3bv
 
     def get_prop_complete(self) -> float:
         """Calculate the progress of solving the board using 3bv."""
@@ -308,9 +375,40 @@ class Game:
 
     def _create_minefield(self, coord: Coord_T) -> None:
         """Create the minefield in response to a cell being selected."""
-        if self.first_success:
+        if self.no_guess:
+            # Imported here to avoid a circular import.
+            from .noguess import generate_no_guess_minefield
+
+            self._logger.debug("Trying to create no-guess minefield")
+            try:
+                self.mf = generate_no_guess_minefield(
+                    self.x_size,
+                    self.y_size,
+                    self.mines,
+                    self.per_cell,
+                    start=coord,
+                    safe_coords=self.board.get_nbrs(coord, include_origin=True),
+                    timeout=self.no_guess_timeout,
+                    seed=self._rng.getrandbits(64) if self._rng else None,
+                )
+            except ValueError:
+                self.mf = None
+            if self.mf:
+                return
+            self._logger.info(
+                "Unable to create no-guess minefield, ensuring safe start"
+            )
+        elif self._minefield_pool:
+            safe_coords = []
+            if self.first_success:
+                safe_coords = self.board.get_nbrs(coord, include_origin=True)
+            self.mf = self._minefield_pool(safe_coords)
+            if self.mf:
+                self._logger.debug("Using pregenerated minefield")
+                return
+        if self.first_success or self.no_guess:
             safe_coords = self.board.get_nbrs(coord, include_origin=True)
-            logger.debug(
+            self._logger.debug(
                 "Trying to create minefield with the following safe coordinates: %s",
                 safe_coords,
             )
@@ -321,9 +419,10 @@ class Game:
                     mines=self.mines,
                     per_cell=self.per_cell,
                     safe_coords=safe_coords,
+                    rng=self._rng,
                 )
             except ValueError:
-                logger.info(
+                self._logger.info(
                     "Unable to give opening on the first click, "
                     "still ensuring a safe click"
                 )
@@ -334,15 +433,122 @@ class Game:
                     mines=self.mines,
                     per_cell=self.per_cell,
                     safe_coords=[coord],
+                    rng=self._rng,
                 )
             else:
-                logger.debug("Successfully created minefield")
+                self._logger.debug("Successfully created minefield")
         else:
-            logger.debug("Creating minefield without guaranteed first click success")
+            self._logger.debug(
+                "Creating minefield without guaranteed first click success"
+            )
             self.mf = Minefield(
-                self.x_size, self.y_size, mines=self.mines, per_cell=self.per_cell
+                self.x_size,
+                self.y_size,
+                mines=self.mines,
+                per_cell=self.per_cell,
+                rng=self._rng,
             )
 
+    def _init_reveal_tracking(self) -> None:
+        """
+        Initialise the counters used to track the number of safe cells and the
+        remaining 3bv as cells are revealed.
+
+        The remaining 3bv is the number of remaining openings (connected groups
+        of unrevealed blank cells) plus the number of unrevealed safe cells not
+        in or bordering a remaining opening.
+        """
+        # Work with the compact cell encoding, where all numbers have codes at
+        #  least that of a blank cell.
+        blank = CellContents.Num(0).code
+        completed_cells = self.mf.completed_board.cells
+        nbr_indices = self.mf.nbr_indices
+        # The number of safe cells not yet revealed.
+        self._rem_safe_cells: int = self.mf.cells.count(0)
+        # The number of unrevealed blank cells in each opening.
+        self._opening_rem_blanks: List[int] = [0] * len(self.mf.openings)
+        for label in self.mf.opening_index:
+            if label >= 0:
+                self._opening_rem_blanks[label] += 1
+        # The number of remaining groups of unrevealed blanks in each opening.
+        self._opening_rem_groups: List[int] = [1] * len(self.mf.openings)
+        # Openings that have had cells revealed since the last update.
+        self._touched_openings: Set[int] = set()
+        # The number of unrevealed blank cells around each cell.
+        self._unrevealed_blank_nbrs: List[int] = [
+            sum(1 for j in nbrs if completed_cells[j] == blank) for nbrs in nbr_indices
+        ]
+        self._rem_openings: int = len(self.mf.openings)
+        self._rem_isolated: int = sum(
+            1
+            for i, c in enumerate(completed_cells)
+            if c > blank and self._unrevealed_blank_nbrs[i] == 0
+        )
+
+    def _track_revealed_cell(self, coord: Coord_T) -> None:
+        """
+        Update the tracking counters for a safe cell being revealed.
+
+        Must be called before the board is updated.
+        """
+        self._rem_safe_cells -= 1
+        i = self.mf.index_of(coord)
+        label = self.mf.opening_index[i]
+        if label < 0:
+            # A non-blank cell - only counted if not bordering an opening.
+            if self._unrevealed_blank_nbrs[i] == 0:
+                self._rem_isolated -= 1
+            return
+        self._opening_rem_blanks[label] -= 1
+        self._touched_openings.add(label)
+        mf_cells = self.mf.cells
+        board_cells = self.board.cells
+        num_code = CellContents.Num(0).code
+        for j in self.mf.nbr_indices[i]:
+            self._unrevealed_blank_nbrs[j] -= 1
+            if (
+                self._unrevealed_blank_nbrs[j] == 0
+                and self.mf.opening_index[j] < 0
+                and mf_cells[j] == 0
+                and board_cells[j] < num_code
+            ):
+                # An unrevealed cell no longer bordering a remaining opening.
+                self._rem_isolated += 1
+
+    def _update_rem_openings(self) -> None:
+        """
+        Update the count of remaining openings for the openings touched since
+        the last update.
+
+        Openings are normally either untouched or fully revealed, but may be
+        left split into separate groups, e.g. when blocked by incorrect flags.
+        """
+        nbr_indices = self.mf.nbr_indices
+        board_cells = self.board.cells
+        num_code = CellContents.Num(0).code
+        for label in self._touched_openings:
+            if self._opening_rem_blanks[label] == 0:
+                groups = 0
+            else:
+                # Count the connected groups of unrevealed blank cells.
+                rem_blanks = {
+                    i
+                    for i in map(self.mf.index_of, self.mf.openings[label])
+                    if self.mf.opening_index[i] == label and board_cells[i] < num_code
+                }
+                groups = 0
+                while rem_blanks:
+                    groups += 1
+                    check = [rem_blanks.pop()]
+                    while check:
+                        for j in nbr_indices[check.pop()]:
+                            if j in rem_blanks:
+                                rem_blanks.remove(j)
+                                check.append(j)
+            self._rem_openings += groups - self._opening_rem_groups[label]
+            self._opening_rem_groups[label] = groups
+        self._touched_openings.clear()
+
     def _set_cell(self, coord: Coord_T, state: CellContents):
         """
         Set the contents of a cell and store the update.
@@ -352,20 +558,38 @@ class Game:
         :param state:
             The state to set the cell to.
         """
+        if (
+            type(state) is CellContents.Num
+            and type(self.board[coord]) is not CellContents.Num
+        ):
+            self._track_revealed_cell(coord)
         self.board[coord] = state
         self._cell_updates[coord] = state
 
+    def _take_cell_updates(self) -> Mapping[Coord_T, CellContents]:
+        """
+        Get the cell updates stored since the last call, resetting the store.
+        """
+        updates = self._cell_updates
+        if self._spare_cell_updates is None:
+            self._cell_updates = dict()
+        else:
+            self._cell_updates = self._spare_cell_updates
+            self._cell_updates.clear()
+            self._spare_cell_updates = updates
+        return updates
+
     def _select_cell_action(self, coord: Coord_T) -> None:
         """
         Implementation of the action of selecting/clicking a cell.
         """
         if self.mf.cell_contains_mine(coord):
-            logger.debug("Mine hit at %s", coord)
+            self._trace_logger.debug("Mine hit at %s", coord)
             self._set_cell(coord, CellContents.HitMine(self.mf[coord]))
             self.lives_remaining -= 1
 
             if self.lives_remaining == 0:
-                logger.info("Game lost")
+                self._logger.info("Game lost")
                 self.end_time = tm.time()
                 self.state = GameState.LOST
 
@@ -384,64 +608,78 @@ class Game:
             else:
                 self.mines_remaining -= self.mf[coord]
         elif self.mf.completed_board[coord] is CellContents.Num(0):
-            for full_opening in self.mf.openings:
-                if coord in full_opening:
-                    # Found the opening, quit the loop here.
-                    logger.debug("Opening hit: %s", full_opening)
-                    break
+            full_opening = self.mf.get_opening(coord)
+            self._trace_logger.debug(
+                "Opening hit of %d cells at %s", len(full_opening), coord
+            )
+            if all(
+                self.board[c] is CellContents.Unclicked
+                for c in full_opening
+                if self.mf.completed_board[c] is CellContents.Num(0)
+            ):
+                # Nothing can block the opening's propagation, so reveal the
+                # whole opening directly, skipping already revealed/flagged
+                # cells at the edge.
+                for c in full_opening:
+                    if self.board[c] is CellContents.Unclicked:
+                        self._set_cell(c, self.mf.completed_board[c])
             else:
-                logger.error(
-                    "Coordinate %s not found in openings %s", coord, self.mf.openings
-                )
-
-            # Get the propagation of cells forming part of the opening.
-            opening = set()  # Coords belonging to the opening
-            check = {coord}  # Coords whose neighbours need checking
-            while check:
-                c = check.pop()
-                unclicked_nbrs = {
-                    z
-                    for z in self.board.get_nbrs(c, include_origin=True)
-                    if self.board[z] is CellContents.Unclicked
-                }
-                check |= {
-                    z
-                    for z in unclicked_nbrs - opening
-                    if self.mf.completed_board[z] is CellContents.Num(0)
-                }
-                opening |= unclicked_nbrs
-
-            logger.debug("Propagated opening: %s", list(opening))
-            bad_opening_cells = {}
-            for c in opening:
-                if self.board[c] is CellContents.Unclicked:
-                    self._set_cell(c, self.mf.completed_board[c])
-                else:
-                    bad_opening_cells[c] = self.board[c]
-            if bad_opening_cells:
-                logger.error(
-                    "Should only have clicked cells in opening, found: %s",
-                    bad_opening_cells,
-                )
+                self._reveal_blocked_opening(coord)
         else:
-            logger.debug("Regular cell revealed")
+            self._trace_logger.debug("Regular cell revealed")
             self._set_cell(coord, self.mf.completed_board[coord])
 
-    def _check_for_completion(self) -> None:
+    def _is_board_complete(self) -> bool:
         """
-        Check if game is complete by comparing the board to the minefield's
-        completed board. If it is, display flags in remaining unclicked cells.
+        Check whether all safe cells are revealed by comparing the board to the
+        minefield's completed board.
         """
-        # Assume (for contradiction) that game is complete.
-        is_complete = True
         for c in self.mf.all_coords:
             exp_val = self.mf.completed_board[c]
             if type(exp_val) is CellContents.Num and exp_val != self.board[c]:
-                is_complete = False
-                break
+                return False
+        return True
+
+    def _reveal_blocked_opening(self, coord: Coord_T) -> None:
+        """
+        Reveal the part of an opening that propagates from a given blank cell,
+        where blank cells in the opening may already be revealed or flagged.
+        """
+        # Get the propagation of cells forming part of the opening.
+        opening = set()  # Coords belonging to the opening
+        check = {coord}  # Coords whose neighbours need checking
+        while check:
+            c = check.pop()
+            unclicked_nbrs = {
+                z
+                for z in self.board.get_nbrs(c, include_origin=True)
+                if self.board[z] is CellContents.Unclicked
+            }
+            check |= {
+                z
+                for z in unclicked_nbrs - opening
+                if self.mf.completed_board[z] is CellContents.Num(0)
+            }
+            opening |= unclicked_nbrs
+
+        self._trace_logger.debug("Propagated opening of %d cells", len(opening))
+        for c in opening:
+            self._set_cell(c, self.mf.completed_board[c])
+
+    def _check_for_completion(self) -> None:
+        """
+        Check if game is complete using the count of unrevealed safe cells. If
+        it is, display flags in remaining unclicked cells.
+        """
+        is_complete = self._rem_safe_cells == 0
+        if self.debug_checks:
+            assert is_complete == self._is_board_complete(), (
+                f"Unrevealed safe cell count ({self._rem_safe_cells}) inconsistent "
+                f"with board"
+            )
 
         if is_complete:
-            logger.info("Game won")
+            self._logger.info("Game won")
 
             self.end_time = tm.time()
             self.state = GameState.WON
@@ -459,7 +697,7 @@ class Game:
         game_state=(GameState.READY, GameState.ACTIVE),
         cell_state=CellContents.Unclicked,
     )
-    def select_cell(self, coord: Coord_T) -> Dict[Coord_T, CellContents]:
+    def select_cell(self, coord: Coord_T) -> Mapping[Coord_T, CellContents]:
         """
         Perform the action of selecting/clicking a cell. Game must be started
         before calling this method.
@@ -468,18 +706,17 @@ class Game:
         if self.state is GameState.READY:
             if not self.mf:
                 self._create_minefield(coord)
+            self._init_reveal_tracking()
             self.state = GameState.ACTIVE
             self.start_time = tm.time()
             just_started = True
         self._select_cell_action(coord)
+        self._update_rem_openings()
         if not self.state.finished():
             self._check_for_completion()
             if self.state is GameState.WON and just_started:
                 self.end_time = self.start_time
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = dict()
+        return self._take_cell_updates()
 
     @_check_coord
     @_ignore_if_not(
@@ -488,7 +725,7 @@ class Game:
     )
     def set_cell_flags(
         self, coord: Coord_T, nr_flags: int
-    ) -> Dict[Coord_T, CellContents]:
+    ) -> Mapping[Coord_T, CellContents]:
         """Set the number of flags in a cell."""
         if nr_flags < 0 or nr_flags > self.per_cell:
             raise ValueError(
@@ -506,20 +743,17 @@ class Game:
         self.mines_remaining += old_nr_flags - nr_flags
         self._num_flags += nr_flags - old_nr_flags
 
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = dict()
+        return self._take_cell_updates()
 
     @_check_coord
     @_ignore_if_not(game_state=GameState.ACTIVE, cell_state=CellContents.Num)
-    def chord_on_cell(self, coord: Coord_T) -> Dict[Coord_T, CellContents]:
+    def chord_on_cell(self, coord: Coord_T) -> Mapping[Coord_T, CellContents]:
         """Chord on a cell that contains a revealed number."""
         nbrs = self.board.get_nbrs(coord)
         num_flagged_nbrs = sum(
             [self.board[c].num for c in nbrs if self.board[c].is_mine_type()]
         )
-        logger.debug(
+        self._trace_logger.debug(
             "%s flagged mine(s) around clicked cell showing number %s",
             num_flagged_nbrs,
             self.board[coord],
@@ -530,16 +764,16 @@ class Game:
             self.board[coord] != CellContents.Num(num_flagged_nbrs)
             or not unclicked_nbrs
         ):
-            return dict()
+            return self._take_cell_updates()
 
-        logger.info("Successful chording, selecting cells %s", unclicked_nbrs)
+        self._trace_logger.debug(
+            "Successful chording, selecting cells %s", unclicked_nbrs
+        )
         for c in unclicked_nbrs:
             self._select_cell_action(c)
+        self._update_rem_openings()
 
         if self.state != GameState.LOST:
             self._check_for_completion()
 
-        try:
-            return self._cell_updates
-        finally:
-            self._cell_updates = dict()
+        return self._take_cell_updates()
@@ -0,0 +1,278 @@
+# October 2026, Lewis Gaul
+
+"""
+Generation of minefields that can be solved without guessing.
+
+Exports
+-------
+.. function:: is_no_guess
+    Check whether a minefield can be solved without guessing.
+
+.. function:: generate_no_guess_minefield
+    Generate a minefield that can be solved without guessing.
+
+.. function:: start_worker_pool
+    Start the pool of worker processes used for generation.
+
+"""
+
+__all__ = ("generate_no_guess_minefield", "is_no_guess", "start_worker_pool")
+
+import atexit
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import queue
+import random as rnd
+import threading
+import time as tm
+from typing import Any, Iterable, List, Optional, Tuple
+
+from ..shared.types import Coord_T, GameState
+from .board import Board, Minefield
+from .game import Game
+from .solver import Solver
+
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[multiprocessing.pool.Pool] = None
+_pool_size: int = 0
+_pool_lock = threading.Lock()
+
+
+def is_no_guess(mf: Minefield, start: Coord_T) -> bool:
+    """
+    Check whether a minefield can be solved without guessing, by repeatedly
+    revealing the cells the solver finds to be safe.
+
+    This stops as soon as there are no safe cells to reveal, so rejecting a
+    minefield is generally quicker than accepting one.
+
+    :param mf:
+        The minefield to check.
+    :param start:
+        The coordinate of the first cell to select.
+    :return:
+        Whether the minefield can be solved without guessing.
+    """
+    game = Game(minefield=mf)
+    solver = Solver(Board(mf.x_size, mf.y_size), mf.nr_mines, mf.per_cell)
+    updates = game.select_cell(start)
+    while game.state is GameState.ACTIVE:
+        result = solver.update(updates)
+        if not result.safe:
+            return False
+        updates = dict()
+        for c in result.safe:
+            updates.update(game.select_cell(c) or {})
+    return game.state is GameState.WON
+
+
+def _search_batch(
+    x_size: int,
+    y_size: int,
+    mines: int,
+    per_cell: int,
+    safe_coords: Optional[List[Coord_T]],
+    start: Coord_T,
+    seed: Any,
+    batch_size: int,
+    deadline: float,
+) -> Tuple[Optional[List[Coord_T]], int]:
+    """
+    Search a batch of randomly generated candidate minefields for one that can
+    be solved without guessing. Run in worker processes.
+
+    :return:
+        The mine coordinates of the minefield found, or None, and the number of
+        candidates tried.
+    """
+    tried = 0
+    for mf in Minefield.generate_many(
+        batch_size,
+        x_size,
+        y_size,
+        mines,
+        per_cell,
+        safe_coords=safe_coords,
+        seed=seed,
+    ):
+        if tm.time() > deadline:
+            break
+        tried += 1
+        if is_no_guess(mf, start):
+            return mf.mine_coords, tried
+    return None, tried
+
+
+def start_worker_pool(processes: Optional[int] = None) -> None:
+    """
+    Start the shared pool of worker processes used by
+    generate_no_guess_minefield(), if not already started.
+
+    Starting the workers takes a while, so this should be called ahead of
+    generating minefields, e.g. when a no-guess game is created.
+
+    :param processes:
+        The number of worker processes, defaulting to the number of CPUs.
+    """
+    _get_pool(processes or os.cpu_count() or 1)
+
+
+def _get_pool(processes: int) -> multiprocessing.pool.Pool:
+    """
+    Get the shared pool of worker processes, creating it if necessary.
+
+    Workers are spawned rather than forked, since forking a multithreaded
+    process (such as the GUI) can deadlock. Spawned workers only import this
+    module's dependencies, with the application entry point being guarded
+    against rerunning (see multiprocessing's 'spawn' start method).
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            if _pool is not None:
+                _pool.terminate()
+            logger.debug(
+                "Creating pool of %d processes for no-guess generation", processes
+            )
+            _pool = multiprocessing.get_context("spawn").Pool(processes)
+            _pool_size = processes
+        return _pool
+
+
+@atexit.register
+def _close_pool() -> None:
+    if _pool is not None:
+        _pool.terminate()
+
+
+def generate_no_guess_minefield(
+    x_size: int,
+    y_size: int,
+    mines: int,
+    per_cell: int = 1,
+    *,
+    start: Coord_T,
+    safe_coords: Optional[Iterable[Coord_T]] = None,
+    timeout: float = 5,
+    processes: Optional[int] = None,
+    batch_size: int = 10,
+    seed: Optional[Any] = None,
+) -> Optional[Minefield]:
+    """
+    Generate a minefield that can be solved without guessing from a given
+    starting cell.
+
+    Batches of candidate minefields are checked in parallel across a pool of
+    worker processes, stopping as soon as one is found.
+
+    :param x_size:
+        Number of columns in the grid.
+    :param y_size:
+        Number of rows in the grid.
+    :param mines:
+        The number of mines to randomly place.
+    :param per_cell:
+        Maximum number of mines per cell.
+    :param start:
+        The coordinate of the first cell to be selected. Always kept safe.
+    :param safe_coords:
+        Optionally specify other coordinates that should not contain a mine,
+        typically the neighbours of the starting cell.
+    :param timeout:
+        The maximum time to spend searching, in seconds.
+    :param processes:
+        The number of worker processes to use, defaulting to the number of
+        CPUs. If zero, candidates are checked in the calling process.
+    :param batch_size:
+        The number of candidates to check in each batch.
+    :param seed:
+        Seed for the random number generator used to seed each batch.
+    :return:
+        The minefield, or None if one was not found within the timeout.
+    :raise ValueError:
+        If the number of mines is too high to fit in the grid.
+    """
+    safe_coords = list(safe_coords) if safe_coords else []
+    if start not in safe_coords:
+        safe_coords.append(start)
+    Minefield.check_enough_space(
+        x_size=x_size,
+        y_size=y_size,
+        mines=mines,
+        per_cell=per_cell,
+        nr_safe_cells=len(set(safe_coords)),
+    )
+    if processes is None:
+        processes = os.cpu_count() or 1
+    rng = rnd.Random(seed)
+    deadline = tm.time() + timeout
+
+    def batch_args() -> Tuple:
+        return (
+            x_size,
+            y_size,
+            mines,
+            per_cell,
+            safe_coords,
+            start,
+            rng.getrandbits(64),
+            batch_size,
+            deadline,
+        )
+
+    start_time = tm.time()
+    mine_coords = None
+    tried = 0
+    pool = _get_pool(processes) if processes > 0 else None
+    if pool is None:
+        while mine_coords is None and tm.time() < deadline:
+            mine_coords, batch_tried = _search_batch(*batch_args())
+            tried += batch_tried
+    else:
+        # Keep every worker busy, with results collected from a queue so that
+        #  the search stops on the first success.
+        results: queue.Queue = queue.Queue()
+        in_flight = 0
+
+        def submit() -> None:
+            nonlocal in_flight
+            pool.apply_async(
+                _search_batch,
+                batch_args(),
+                callback=results.put,
+                error_callback=lambda e: results.put(e),
+            )
+            in_flight += 1
+
+        for _ in range(processes):
+            submit()
+        while in_flight > 0 and mine_coords is None:
+            try:
+                result = results.get(timeout=max(0, deadline - tm.time()))
+            except queue.Empty:
+                break
+            in_flight -= 1
+            if isinstance(result, BaseException):
+                raise result
+            mine_coords, batch_tried = result
+            tried += batch_tried
+            if mine_coords is None and tm.time() < deadline:
+                submit()
+
+    if mine_coords is None:
+        logger.info(
+            "No no-guess minefield found in %.2fs after %d candidates",
+            timeout,
+            tried,
+        )
+        return None
+    logger.info(
+        "Found no-guess minefield in %.2fs after %d candidates",
+        tm.time() - start_time,
+        tried,
+    )
+    return Minefield(x_size, y_size, mines=mine_coords, per_cell=per_cell)
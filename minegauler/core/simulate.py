@@ -0,0 +1,269 @@
+# October 2026, Lewis Gaul
+
+"""
+Headless simulation of many games, for bots and analysis.
+
+Exports
+-------
+.. class:: Action
+    Enum of actions that can be performed on a simulated game.
+
+.. class:: SimStats
+    Throughput statistics for a simulator.
+
+.. class:: Simulator
+    Runs many games side by side with batched actions.
+
+"""
+
+__all__ = ("Action", "SimStats", "Simulator")
+
+import array
+import enum
+import logging
+import random as rnd
+import time as tm
+from typing import Any, Iterable, List, Optional, Tuple
+
+import attr
+
+from ..shared.types import CellContents, Coord_T, GameState
+from .api import CellUpdates
+from .game import Game
+
+
+logger = logging.getLogger(__name__)
+
+ActionSpec_T = Tuple[int, "Action", Coord_T]
+
+
+class Action(enum.Enum):
+    """Enum of actions that can be performed on a simulated game."""
+
+    SELECT = "select"
+    FLAG = "flag"
+    UNFLAG = "unflag"
+    CHORD = "chord"
+
+
+@attr.attrs(auto_attribs=True)
+class SimStats:
+    """
+    Throughput statistics for a simulator.
+
+    Elements:
+    games_started
+        The number of games created.
+    games_won
+        The number of games that have been won.
+    games_lost
+        The number of games that have been lost.
+    actions
+        The number of actions applied.
+    elapsed
+        The time spent applying actions, in seconds.
+    """
+
+    games_started: int = 0
+    games_won: int = 0
+    games_lost: int = 0
+    actions: int = 0
+    elapsed: float = 0
+
+    @property
+    def games_finished(self) -> int:
+        return self.games_won + self.games_lost
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games_finished / self.elapsed if self.elapsed else 0
+
+    @property
+    def actions_per_second(self) -> float:
+        return self.actions / self.elapsed if self.elapsed else 0
+
+
+# Logger for games run with 'quiet' set, which is only enabled for warnings
+#  and above (unless configured otherwise), without affecting logging from any
+#  other games.
+_quiet_game_logger = logging.getLogger(f"{__name__}.quiet_game")
+_quiet_game_logger.setLevel(logging.WARNING)
+
+
+class Simulator:
+    """
+    Runs many games side by side without any frontend, driven by batches of
+    actions.
+
+    There are no listeners to notify, and the per-action logging from the core
+    game logic is suppressed for the simulated games (unless 'quiet' is
+    False). The cell updates resulting from each action are returned as flat
+    arrays of integers, alternating between the flat index of a cell (see
+    FlatGrid) and the code of its new contents (see CellContents.code).
+    """
+
+    def __init__(
+        self,
+        nr_games: int,
+        x_size: int,
+        y_size: int,
+        mines: int,
+        *,
+        per_cell: int = 1,
+        lives: int = 1,
+        first_success: bool = True,
+        seed: Optional[Any] = None,
+        quiet: bool = True,
+    ):
+        """
+        :param nr_games:
+            The number of games to run side by side.
+        :param x_size:
+            Number of columns in each game.
+        :param y_size:
+            Number of rows in each game.
+        :param mines:
+            The number of mines in each game.
+        :param per_cell:
+            Maximum number of mines per cell.
+        :param lives:
+            The number of lives in each game.
+        :param first_success:
+            Whether the first cell selected in each game should be safe.
+        :param seed:
+            Seed for the random number generator used to create minefields.
+        :param quiet:
+            Whether to suppress info and debug logging from the games.
+        :raise ValueError:
+            If the number of mines is too high to fit in the grid.
+        """
+        self.x_size: int = x_size
+        self.y_size: int = y_size
+        self.mines: int = mines
+        self.per_cell: int = per_cell
+        self.lives: int = lives
+        self.first_success: bool = first_success
+        self.quiet: bool = quiet
+        self.stats: SimStats = SimStats()
+        self._rng = rnd.Random(seed)
+        self.games: List[Game] = [self._create_game() for _ in range(nr_games)]
+
+    def __repr__(self):
+        return (
+            f"<Simulator of {len(self.games)} games, "
+            f"{self.x_size}x{self.y_size} with {self.mines} mines>"
+        )
+
+    def new_game(self, game_idx: int) -> None:
+        """
+        Replace a game with a new one.
+
+        :param game_idx:
+            The index of the game to replace.
+        """
+        self.games[game_idx] = self._create_game()
+
+    def get_cells(self, game_idx: int) -> array.array:
+        """
+        Get the cells of a game's board, as an array of cell contents codes.
+
+        This is the board's storage rather than a copy, so should not be
+        modified.
+
+        :param game_idx:
+            The index of the game.
+        :return:
+            The flat array of codes, see CellContents.code.
+        """
+        return self.games[game_idx].board.cells
+
+    def get_states(self) -> List[GameState]:
+        """Get the state of each game."""
+        return [g.state for g in self.games]
+
+    def apply(self, actions: Iterable[ActionSpec_T]) -> List[array.array]:
+        """
+        Apply a batch of actions.
+
+        Actions that have no effect, e.g. selecting an already revealed cell
+        or acting on a finished game, are ignored and give no cell updates.
+
+        :param actions:
+            The actions to apply, each given as a tuple of the index of the
+            game, the action and the coordinate of the cell to act on.
+        :return:
+            A list with the cell updates from each action, each given as an
+            array alternating between flat cell index and cell contents code.
+        :raise ValueError:
+            If a coordinate is out of bounds.
+        """
+        results = []
+        nr_actions = 0
+        start = tm.perf_counter()
+        try:
+            for game_idx, action, coord in actions:
+                game = self.games[game_idx]
+                was_finished = game.state.finished()
+                updates = self._apply_action(game, action, coord)
+                results.append(self._encode_updates(updates))
+                nr_actions += 1
+                if not was_finished:
+                    if game.state is GameState.WON:
+                        self.stats.games_won += 1
+                    elif game.state is GameState.LOST:
+                        self.stats.games_lost += 1
+        finally:
+            self.stats.actions += nr_actions
+            self.stats.elapsed += tm.perf_counter() - start
+        return results
+
+    # --------------------------------------------------------------------------
+    # Helper methods
+    # --------------------------------------------------------------------------
+    def _create_game(self) -> Game:
+        self.stats.games_started += 1
+        return Game(
+            x_size=self.x_size,
+            y_size=self.y_size,
+            mines=self.mines,
+            per_cell=self.per_cell,
+            lives=self.lives,
+            first_success=self.first_success,
+            rng=self._rng,
+            compact_updates=True,
+            game_logger=_quiet_game_logger if self.quiet else None,
+        )
+
+    @staticmethod
+    def _apply_action(
+        game: Game, action: Action, coord: Coord_T
+    ) -> Optional[CellUpdates]:
+        """Apply a single action to a game, returning the cell updates."""
+        if action is Action.SELECT:
+            return game.select_cell(coord)
+        elif action is Action.CHORD:
+            return game.chord_on_cell(coord)
+        elif action is Action.FLAG:
+            # Add a flag, up to the max per cell.
+            cell = game.board[coord]
+            if cell is CellContents.Unclicked:
+                return game.set_cell_flags(coord, 1)
+            elif type(cell) is CellContents.Flag and cell.num < game.per_cell:
+                return game.set_cell_flags(coord, cell.num + 1)
+            return None
+        elif action is Action.UNFLAG:
+            if type(game.board[coord]) is CellContents.Flag:
+                return game.set_cell_flags(coord, 0)
+            return None
+        else:
+            raise ValueError(f"Unrecognised action: {action}")
+
+    @staticmethod
+    def _encode_updates(updates: Optional[CellUpdates]) -> array.array:
+        """Encode cell updates as an array of interleaved flat indices and codes."""
+        if not updates:
+            return array.array("I")
+        encoded = array.array("I", [0]) * (2 * len(updates))
+        encoded[0::2] = updates.indices
+        encoded[1::2] = array.array("I", updates.codes)
+        return encoded
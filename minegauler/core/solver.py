@@ -0,0 +1,456 @@
+# October 2026, Lewis Gaul
+
+"""
+Minesweeper solver, deducing which cells are safe or contain mines and
+calculating the probability of each cell containing a mine.
+
+Exports
+-------
+.. class:: Solver
+    Solver for a minesweeper board.
+
+.. class:: SolverResult
+    The deductions and probabilities found by the solver.
+
+.. exception:: InconsistentBoardError
+    The board has no valid arrangement of mines.
+
+"""
+
+__all__ = ("InconsistentBoardError", "Solver", "SolverResult")
+
+import array
+import collections
+import functools
+import logging
+from typing import Dict, FrozenSet, List, Mapping, Set, Tuple
+
+import attr
+
+from ..shared import utils
+from ..shared.types import CellContents, Coord_T
+from .board import Board
+
+
+logger = logging.getLogger(__name__)
+
+_NUM_CODE = CellContents.Num(0).code
+
+
+def _make_known_mines_table() -> Tuple[int, ...]:
+    """
+    Create a table mapping cell contents codes to the number of mines known to
+    be in the cell. Flags are not trusted, so only count revealed mines.
+    """
+    table = [0] * len(CellContents.by_code)
+    for item in CellContents.by_code:
+        if type(item) in [CellContents.Mine, CellContents.HitMine]:
+            table[item.code] = item.num
+    return tuple(table)
+
+
+_KNOWN_MINES = _make_known_mines_table()
+
+
+@functools.lru_cache(maxsize=None)
+def _comb(n: int, k: int) -> int:
+    """The binomial coefficient, 'n choose k'."""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    result = 1
+    for i in range(1, k + 1):
+        result = result * (n - k + i) // i
+    return result
+
+
+def _convolve(a: Mapping[int, int], b: Mapping[int, int], limit: int) -> Dict[int, int]:
+    """Convolve two distributions of weights by mine count, up to a limit."""
+    result = collections.defaultdict(int)
+    for i, x in a.items():
+        for j, y in b.items():
+            if i + j <= limit:
+                result[i + j] += x * y
+    return dict(result)
+
+
+class InconsistentBoardError(ValueError):
+    """The board has no valid arrangement of mines."""
+
+
+@attr.attrs(auto_attribs=True)
+class SolverResult:
+    """
+    The deductions and probabilities found by the solver.
+
+    Elements:
+    safe
+        Unrevealed cells that are certain to be safe.
+    mines
+        Unrevealed cells that are certain to contain at least one mine.
+    probs
+        The probability of each cell containing at least one mine, where
+        revealed numbers have probability 0 and revealed mines probability 1.
+    """
+
+    safe: List[Coord_T]
+    mines: List[Coord_T]
+    probs: utils.FlatGrid
+
+
+@attr.attrs(auto_attribs=True, frozen=True)
+class _ComponentResult:
+    """
+    The result of counting the arrangements of mines in a connected component
+    of constraints.
+
+    Elements:
+    groups
+        The groups of interchangeable cells, as cell indices.
+    weights
+        The total weight of arrangements, by number of mines in the component.
+    safe_weights
+        The weight of arrangements where a given cell in each group is safe,
+        by number of mines in the component.
+    """
+
+    groups: Tuple[Tuple[int, ...], ...]
+    weights: Dict[int, int]
+    safe_weights: Tuple[Dict[int, int], ...]
+
+
+class Solver:
+    """
+    Solver for a minesweeper board.
+
+    Each revealed number gives a constraint on the number of mines in its
+    unrevealed neighbours, and flags are not trusted. Trivial constraints
+    (where all or none of the cells must contain mines) are applied first. The
+    remaining constraints are split into connected components, and the cells
+    in each component are grouped by the constraints they appear in, since
+    such cells are interchangeable. The arrangements of mines in each component
+    are then counted exactly, and combined with the cells not touched by any
+    constraint using the total number of mines.
+
+    With more than one mine allowed per cell, each cell is treated as having
+    'per_cell' slots for mines, matching how minefields are generated, and the
+    probabilities given are those of a cell containing at least one mine.
+
+    The solver may be updated incrementally with the cell updates from a game,
+    in which case only the constraints around the updated cells are rebuilt
+    and the counts are only redone for components that have changed.
+    """
+
+    def __init__(self, board: Board, mines: int, per_cell: int = 1):
+        """
+        :param board:
+            The board to solve. Not modified, and not tracked after creation,
+            see update().
+        :param mines:
+            The total number of mines.
+        :param per_cell:
+            Maximum number of mines per cell.
+        """
+        self.x_size: int = board.x_size
+        self.y_size: int = board.y_size
+        self.mines: int = mines
+        self.per_cell: int = per_cell
+        self._nbr_indices = board.nbr_indices
+        self._index_coords = board.index_coords
+        self._cells = array.array("B", board.cells)
+        # Constraints from revealed numbers with unrevealed neighbours, mapping
+        #  the number's index to the number of mines in the unrevealed
+        #  neighbours and the indices of those neighbours.
+        self._constraints: Dict[int, Tuple[int, Tuple[int, ...]]] = dict()
+        self._component_cache: Dict[Tuple, _ComponentResult] = dict()
+        for i in range(len(self._cells)):
+            self._update_constraint(i)
+
+    def __repr__(self):
+        return f"<Solver for {self.x_size}x{self.y_size} board>"
+
+    def update(self, cell_updates: Mapping[Coord_T, CellContents]) -> SolverResult:
+        """
+        Update the solver with changes to the board and solve.
+
+        :param cell_updates:
+            The updated cells, mapping coordinates to the new cell contents,
+            as returned by Game methods.
+        :return:
+            The result of solving the updated board.
+        :raise InconsistentBoardError:
+            If the board has no valid arrangement of mines.
+        """
+        affected = set()
+        for (x, y), contents in cell_updates.items():
+            i = y * self.x_size + x
+            self._cells[i] = contents.code
+            affected.add(i)
+            affected.update(self._nbr_indices[i])
+        for i in affected:
+            self._update_constraint(i)
+        return self.solve()
+
+    def solve(self) -> SolverResult:
+        """
+        Solve the board.
+
+        :return:
+            The result, including the certain deductions and the probability
+            of each cell containing a mine.
+        :raise InconsistentBoardError:
+            If the board has no valid arrangement of mines.
+        """
+        per_cell = self.per_cell
+        deduced, constraints = self._apply_trivial_constraints()
+        components = self._find_components(constraints)
+
+        results = []
+        cache = dict()
+        for comp in components:
+            key = tuple(sorted((v, tuple(sorted(vs))) for v, vs in comp))
+            result = self._component_cache.get(key)
+            if result is None:
+                result = self._count_component(comp)
+            cache[key] = result
+            results.append(result)
+        self._component_cache = cache
+
+        # Combine the components with the cells outside any constraint.
+        known_mines = sum(_KNOWN_MINES[c] for c in self._cells)
+        rem_mines = self.mines - known_mines - sum(deduced.values())
+        constrained = {i for r in results for grp in r.groups for i in grp}
+        outside = [
+            i
+            for i, c in enumerate(self._cells)
+            if c < _NUM_CODE
+            and not _KNOWN_MINES[c]
+            and i not in deduced
+            and i not in constrained
+        ]
+        outside_slots = len(outside) * per_cell
+
+        prefixes = [{0: 1}]
+        for r in results:
+            prefixes.append(_convolve(prefixes[-1], r.weights, rem_mines))
+        suffixes = [{0: 1}]
+        for r in reversed(results):
+            suffixes.append(_convolve(suffixes[-1], r.weights, rem_mines))
+        suffixes.reverse()
+
+        total = sum(
+            w * _comb(outside_slots, rem_mines - n) for n, w in prefixes[-1].items()
+        )
+        if total == 0:
+            raise InconsistentBoardError("No valid arrangement of mines")
+
+        safe_weights: Dict[int, int] = {i: total for i in deduced if deduced[i] == 0}
+        safe_weights.update({i: 0 for i in deduced if deduced[i] > 0})
+        for idx, r in enumerate(results):
+            others = _convolve(prefixes[idx], suffixes[idx + 1], rem_mines)
+            # The weight of the rest of the board, by mines in this component.
+            outer = {
+                n: sum(
+                    w * _comb(outside_slots, rem_mines - n - m)
+                    for m, w in others.items()
+                )
+                for n in r.weights
+            }
+            for grp, grp_safe_weights in zip(r.groups, r.safe_weights):
+                weight = sum(w * outer[n] for n, w in grp_safe_weights.items())
+                for i in grp:
+                    safe_weights[i] = weight
+        if outside:
+            weight = sum(
+                w * _comb(outside_slots - per_cell, rem_mines - n)
+                for n, w in prefixes[-1].items()
+            )
+            for i in outside:
+                safe_weights[i] = weight
+
+        probs = utils.FlatGrid(self.x_size, self.y_size, fill=0.0, typecode="d")
+        for i, c in enumerate(self._cells):
+            if _KNOWN_MINES[c]:
+                probs.cells[i] = 1.0
+        safe, mines = [], []
+        for i, weight in sorted(safe_weights.items()):
+            probs.cells[i] = 1 - weight / total
+            if weight == total:
+                safe.append(self._index_coords[i])
+            elif weight == 0:
+                mines.append(self._index_coords[i])
+        return SolverResult(safe=safe, mines=mines, probs=probs)
+
+    # --------------------------------------------------------------------------
+    # Helper methods
+    # --------------------------------------------------------------------------
+    def _update_constraint(self, i: int) -> None:
+        """Update the constraint given by a cell, if it's a revealed number."""
+        code = self._cells[i]
+        if code < _NUM_CODE:
+            self._constraints.pop(i, None)
+            return
+        value = code - _NUM_CODE
+        unknown = []
+        for j in self._nbr_indices[i]:
+            nbr_code = self._cells[j]
+            if nbr_code >= _NUM_CODE:
+                continue
+            elif _KNOWN_MINES[nbr_code]:
+                value -= _KNOWN_MINES[nbr_code]
+            else:
+                unknown.append(j)
+        if unknown or value != 0:
+            self._constraints[i] = (value, tuple(unknown))
+        else:
+            self._constraints.pop(i, None)
+
+    def _apply_trivial_constraints(
+        self,
+    ) -> Tuple[Dict[int, int], List[Tuple[int, Set[int]]]]:
+        """
+        Repeatedly apply constraints where the cells must either all be safe or
+        all be full of mines.
+
+        :return:
+            The deduced cells, mapping index to number of mines, and the
+            remaining non-trivial constraints.
+        """
+        per_cell = self.per_cell
+        work = {k: [v, set(vs)] for k, (v, vs) in self._constraints.items()}
+        var_constraints = collections.defaultdict(list)
+        for k, (_, vs) in work.items():
+            for j in vs:
+                var_constraints[j].append(k)
+
+        deduced = dict()
+        queue = list(work)
+        while queue:
+            value, variables = work[queue.pop()]
+            if not variables:
+                continue
+            if value == 0:
+                fill = 0
+            elif value == per_cell * len(variables):
+                fill = per_cell
+            elif 0 < value < per_cell * len(variables):
+                continue
+            else:
+                raise InconsistentBoardError("Number cannot be satisfied")
+            for j in list(variables):
+                deduced[j] = fill
+                for k in var_constraints[j]:
+                    entry = work[k]
+                    if j in entry[1]:
+                        entry[1].discard(j)
+                        entry[0] -= fill
+                        queue.append(k)
+        for value, variables in work.values():
+            if not variables and value != 0:
+                raise InconsistentBoardError("Number cannot be satisfied")
+        return deduced, [(v, vs) for v, vs in work.values() if vs]
+
+    @staticmethod
+    def _find_components(
+        constraints: List[Tuple[int, Set[int]]]
+    ) -> List[List[Tuple[int, FrozenSet[int]]]]:
+        """Split constraints into components connected by shared cells."""
+        var_constraints = collections.defaultdict(list)
+        for k, (_, vs) in enumerate(constraints):
+            for j in vs:
+                var_constraints[j].append(k)
+        seen = [False] * len(constraints)
+        components = []
+        for start in range(len(constraints)):
+            if seen[start]:
+                continue
+            seen[start] = True
+            comp = []
+            check = [start]
+            while check:
+                k = check.pop()
+                value, variables = constraints[k]
+                comp.append((value, frozenset(variables)))
+                for j in variables:
+                    for k2 in var_constraints[j]:
+                        if not seen[k2]:
+                            seen[k2] = True
+                            check.append(k2)
+            components.append(comp)
+        return components
+
+    def _count_component(
+        self, component: List[Tuple[int, FrozenSet[int]]]
+    ) -> _ComponentResult:
+        """Count the arrangements of mines in a component of constraints."""
+        per_cell = self.per_cell
+        # Group cells by the constraints they are in.
+        signatures = collections.defaultdict(list)
+        for k, (_, vs) in enumerate(component):
+            for j in vs:
+                signatures[j].append(k)
+        grouped = collections.defaultdict(list)
+        for j, sig in signatures.items():
+            grouped[tuple(sig)].append(j)
+
+        # Order the groups so that constraints are completed early.
+        groups: List[Tuple[int, ...]] = []
+        group_sigs: List[Tuple[int, ...]] = []
+        by_constraint = collections.defaultdict(list)
+        for sig, grp in grouped.items():
+            for k in sig:
+                by_constraint[k].append(sig)
+        seen_sigs = set()
+        for k in range(len(component)):
+            for sig in by_constraint[k]:
+                if sig not in seen_sigs:
+                    seen_sigs.add(sig)
+                    groups.append(tuple(sorted(grouped[sig])))
+                    group_sigs.append(sig)
+
+        caps = [len(grp) * per_cell for grp in groups]
+        rem_value = [v for v, _ in component]
+        rem_cap = [0] * len(component)
+        for sig, cap in zip(group_sigs, caps):
+            for k in sig:
+                rem_cap[k] += cap
+
+        weights = collections.defaultdict(int)
+        safe_weights = [collections.defaultdict(int) for _ in groups]
+        assigned = [0] * len(groups)
+
+        def search(g: int, total: int, weight: int) -> None:
+            if g == len(groups):
+                weights[total] += weight
+                for h, t in enumerate(assigned):
+                    size = caps[h]
+                    safe_weights[h][total] += (
+                        weight // _comb(size, t) * _comb(size - per_cell, t)
+                    )
+                return
+            sig, cap = group_sigs[g], caps[g]
+            low, high = 0, cap
+            for k in sig:
+                # This group must leave a satisfiable amount for the rest.
+                high = min(high, rem_value[k])
+                low = max(low, rem_value[k] - (rem_cap[k] - cap))
+            for k in sig:
+                rem_cap[k] -= cap
+            for t in range(low, high + 1):
+                for k in sig:
+                    rem_value[k] -= t
+                assigned[g] = t
+                search(g + 1, total + t, weight * _comb(cap, t))
+                for k in sig:
+                    rem_value[k] += t
+            for k in sig:
+                rem_cap[k] += cap
+
+        search(0, 0, 1)
+        if not weights:
+            raise InconsistentBoardError("No valid arrangement of mines")
+        return _ComponentResult(
+            groups=tuple(groups),
+            weights=dict(weights),
+            safe_weights=tuple(dict(w) for w in safe_weights),
+        )
@@ -108,7 +108,7 @@ class HighscoresModel(QAbstractTableModel):
     def __init__(self, parent: Optional[QWidget], state_: state.HighscoreWindowState):
         super().__init__(parent)
         self._state: state.HighscoreWindowState = state_
-        self._all_data: List[highscores.HighscoreStruct] = []
+        self._settings: Optional[highscores.HighscoreSettingsStruct] = None
         self._displayed_data: List[highscores.HighscoreStruct] = []
 
     @property
@@ -195,7 +195,7 @@ class HighscoresModel(QAbstractTableModel):
         """
         Change the data to be highscores for a different set of settings.
         """
-        self._all_data = highscores.get_highscores(settings=settings)
+        self._settings = settings
         self.filter_and_sort()
 
     def _get_active_row(self) -> Optional[int]:
@@ -226,9 +226,15 @@ class HighscoresModel(QAbstractTableModel):
     def filter_and_sort(self):
         """Update the displayed data based on current filters/sorting."""
         self.layoutAboutToBeChanged.emit()
-        self._displayed_data = highscores.filter_and_sort(
-            self._all_data, self._state.sort_by, self._filters
-        )
+        if self._settings is None:
+            self._displayed_data = []
+        else:
+            self._displayed_data = highscores.get_ranked_highscores(
+                settings=self._settings,
+                sort_key=self._state.sort_by,
+                name=self._state.name_filter or None,
+                flagging=self._state.flagging_filter or None,
+            )
         # TODO: Should call changePersistentIndexList()?
         self.layoutChanged.emit()
         self.dataChanged.emit(QModelIndex(), QModelIndex())
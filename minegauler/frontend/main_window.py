@@ -25,6 +25,7 @@ from PyQt5.QtWidgets import (
     QWIDGETSIZE_MAX,
     QAction,
     QActionGroup,
+    QApplication,
     QDialog,
     QFileDialog,
     QFrame,
@@ -36,6 +37,7 @@ from PyQt5.QtWidgets import (
     QMenu,
     QMenuBar,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QSizePolicy,
     QSlider,
@@ -202,6 +204,10 @@ class MinegaulerGUI(
 ):
     """The main Minegauler GUI window."""
 
+    # Cell updates are passed straight on to the minefield widget, which copies
+    #  any it keeps.
+    compact_cell_updates = True
+
     def __init__(self, ctrlr: api.AbstractController, initial_state: state.State):
         """
         :param ctrlr:
@@ -503,6 +509,18 @@ class MinegaulerGUI(
         self._opts_menu.addAction(first_act)
         first_act.triggered.connect(toggle_first_success)
 
+        # No-guess minefields
+        def toggle_no_guess():
+            new_val = not self._state.pending_no_guess
+            self._state.no_guess = new_val
+            self._ctrlr.set_no_guess(new_val)
+
+        no_guess_act = QAction(
+            "No guess", self, checkable=True, checked=self._state.no_guess
+        )
+        self._opts_menu.addAction(no_guess_act)
+        no_guess_act.triggered.connect(toggle_no_guess)
+
         # Drag select
         drag_act = self._opts_menu.addAction(
             "Drag select",
@@ -590,11 +608,13 @@ class MinegaulerGUI(
 
         self._panel_widget.timer.set_time(int(info.started_info.elapsed + 1))
 
-        # Store the highscore if the game was won.
+        # Store the highscore if the game was won. No-guess games don't count
+        #  towards highscores, since the minefields are easier.
         if (
             info.game_state is GameState.WON
             and info.difficulty is not Difficulty.CUSTOM
             and not info.minefield_known
+            and not info.no_guess
         ):
             assert info.started_info.prop_complete == 1
             highscore = HighscoreStruct(
@@ -614,11 +634,8 @@ class MinegaulerGUI(
                 logger.exception("Error inserting highscore")
             self._state.highscores_state.current_highscore = highscore
             # Check whether to pop up the highscores window.
-            # TODO: This is too slow...
             try:
-                new_best = shared.highscores.is_highscore_new_best(
-                    highscore, shared.highscores.get_highscores(settings=highscore)
-                )
+                new_best = shared.highscores.is_highscore_new_best(highscore)
             except Exception:
                 logger.exception("Error getting highscores")
             else:
@@ -754,9 +771,20 @@ class MinegaulerGUI(
             )
             return
 
+        progress_dialog = QProgressDialog("Merging highscores...", None, 0, 0, self)
+        progress_dialog.setWindowTitle("Retrieving highscores")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        def progress_cb(processed: int, total: int) -> None:
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(processed)
+            QApplication.processEvents()
+
         try:
             logger.info("Fetching highscores from %s", file)
-            added = retrieve_highscores(file)
+            added = retrieve_highscores(file, progress=progress_cb)
+            progress_dialog.close()
             _msg_popup(
                 self,
                 QMessageBox.Information,
@@ -764,6 +792,7 @@ class MinegaulerGUI(
                 f"Number of highscores added: {added}",
             )
         except Exception as e:
+            progress_dialog.close()
             _msg_popup(
                 self,
                 QMessageBox.Critical,
@@ -23,12 +23,14 @@ from PyQt5.QtGui import QImage, QMouseEvent, QPainter, QPixmap
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QSizePolicy, QWidget
 
 from ..core import Board, api
+from ..shared.logs import get_trace_logger
 from ..shared.types import CellContents, CellImageType, Coord_T
 from .state import State
 from .utils import IMG_DIR, CellUpdate_T, MouseMove
 
 
 logger = logging.getLogger(__name__)
+trace_logger = get_trace_logger(__name__)
 
 _RAISED_CELL = CellContents.Unclicked
 _SUNKEN_CELL = CellContents.UnclickedSunken
@@ -278,18 +280,18 @@ class MinefieldWidget(QGraphicsView):
 
         ## Bothclick
         if event.buttons() == (Qt.LeftButton | Qt.RightButton):
-            logger.debug("Both mouse buttons down on cell %s", coord)
+            trace_logger.debug("Both mouse buttons down on cell %s", coord)
             self._both_mouse_buttons_pressed = True
             if coord:
                 self.both_buttons_down(coord)
         ## Leftclick
         elif event.button() == Qt.LeftButton:
-            logger.debug("Left mouse button down on cell %s", coord)
+            trace_logger.debug("Left mouse button down on cell %s", coord)
             assert coord is not None
             self.left_button_down(coord)
         ## Rightclick
         elif event.button() == Qt.RightButton:
-            logger.debug("Right mouse button down on cell %s", coord)
+            trace_logger.debug("Right mouse button down on cell %s", coord)
             assert coord is not None
             self.right_button_down(coord)
 
@@ -348,19 +350,21 @@ class MinefieldWidget(QGraphicsView):
         ## Bothclick (one of the buttons still down)
         if self._both_mouse_buttons_pressed:
             if event.buttons():
-                logger.debug("Mouse button release on cell %s after both down", coord)
+                trace_logger.debug(
+                    "Mouse button release on cell %s after both down", coord
+                )
                 self.first_of_both_buttons_release(coord)
             if not self._state.drag_select or event.buttons() == Qt.RightButton:
                 # Only right button down - no risk.
                 self.no_risk_signal.emit()
         ## Left release
         elif event.button() == Qt.LeftButton and not self._was_double_left_click:
-            logger.debug("Left mouse button release on cell %s", coord)
+            trace_logger.debug("Left mouse button release on cell %s", coord)
             self.left_button_release(coord)
 
         # Reset variables if neither of the mouse buttons are down.
         if not event.buttons():
-            logger.debug("No mouse buttons down, reset variables")
+            trace_logger.debug("No mouse buttons down, reset variables")
             self.all_buttons_release()
 
     # --------------------------------------------------------------------------
@@ -572,8 +576,11 @@ class MinefieldWidget(QGraphicsView):
         Called to indicate some cells have changed state.
 
         :param cell_updates:
-            A mapping of cell coordinates to their new state.
+            A mapping of cell coordinates to their new state. May be a reused
+            CellUpdates buffer, so is copied to be stored.
         """
+        if isinstance(cell_updates, api.CellUpdates):
+            cell_updates = cell_updates.copy()
         self._mouse_events.append((self._elapsed, cell_updates))
         for c, state in cell_updates.items():
             self._set_cell_image(c, state)
@@ -39,6 +39,7 @@ class PerGameState(StructConstructorMixin):
     y_size: int = 8
     mines: int = 10
     first_success: bool = True
+    no_guess: bool = False
     per_cell: int = 1
     lives: int = 1
     drag_select: bool = False
@@ -154,6 +155,21 @@ class State:
         else:
             return self._current_game_state.first_success
 
+    @property
+    def no_guess(self):
+        return self._current_game_state.no_guess
+
+    @no_guess.setter
+    def no_guess(self, value):
+        self._update_game_state("no_guess", value)
+
+    @property
+    def pending_no_guess(self):
+        if self.has_pending_game_state():
+            return self.pending_game_state.no_guess
+        else:
+            return self._current_game_state.no_guess
+
     @property
     def per_cell(self):
         return self._current_game_state.per_cell
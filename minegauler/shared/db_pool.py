@@ -0,0 +1,262 @@
+# October 2026, Lewis Gaul
+
+"""
+A bounded, thread-safe pool of database connections.
+
+The pool is independent of the database library, taking a function to create
+connections, such that it can be used with mysql.connector as well as sqlite3.
+
+Exports
+-------
+.. class:: ConnectionPool
+    A bounded pool of database connections.
+
+.. class:: PoolMetrics
+    A snapshot of a connection pool's metrics.
+
+.. exception:: PoolTimeoutError
+    Timed out waiting for a connection from the pool.
+
+"""
+
+__all__ = ("ConnectionPool", "PoolMetrics", "PoolTimeoutError")
+
+import contextlib
+import logging
+import threading
+import time as tm
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Type
+
+import attr
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Timed out waiting for a connection from the pool."""
+
+
+@attr.attrs(auto_attribs=True, frozen=True)
+class PoolMetrics:
+    """A snapshot of a connection pool's metrics."""
+
+    max_size: int
+    # Connections currently open, in use or idle.
+    size: int
+    in_use: int
+    idle: int
+    # Cumulative counts.
+    checkouts: int
+    waits: int
+    wait_time: float
+    created: int
+    discarded: int
+    failed_checks: int
+
+
+class _PooledConnection:
+    """A connection owned by the pool."""
+
+    def __init__(self, conn: Any):
+        self.conn = conn
+        self.last_used = tm.monotonic()
+
+
+class ConnectionPool:
+    """
+    A bounded pool of database connections.
+
+    Connections are checked out by a thread using connection(), and returned
+    to the pool at the end of the 'with' block. Nested checkouts in the same
+    thread share the thread's connection.
+
+    Connections that have been idle for a while are health-checked before
+    being handed out, and are replaced if the check fails. Connections in use
+    when a disconnection error is raised are discarded rather than returned to
+    the pool.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        max_size: int = 5,
+        timeout: Optional[float] = 10,
+        check: Optional[Callable[[Any], bool]] = None,
+        check_after: float = 30,
+        discard_on: Tuple[Type[BaseException], ...] = (),
+    ):
+        """
+        :param connect:
+            Function to create a new connection.
+        :param max_size:
+            The maximum number of open connections.
+        :param timeout:
+            The maximum time in seconds to wait for a connection when all are
+            in use, or None to wait indefinitely.
+        :param check:
+            Optional function to check the health of a connection, returning
+            whether it's usable.
+        :param check_after:
+            The time in seconds a connection must have been idle for before it
+            is checked.
+        :param discard_on:
+            Exception types indicating a connection has been lost.
+        """
+        self._connect = connect
+        self._max_size = max_size
+        self._timeout = timeout
+        self._check = check
+        self._check_after = check_after
+        self._discard_on = discard_on
+        self._idle: List[_PooledConnection] = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        # Metrics.
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._created = 0
+        self._discarded = 0
+        self._failed_checks = 0
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Check out a connection for use by the current thread.
+
+        :raise PoolTimeoutError:
+            If no connection becomes available within the timeout.
+        :raise Exception:
+            Any error raised when creating a new connection.
+        """
+        held: Optional[_PooledConnection] = getattr(self._local, "held", None)
+        if held is not None:
+            yield held.conn
+            return
+
+        pooled = self._acquire()
+        self._local.held = pooled
+        discard = False
+        try:
+            yield pooled.conn
+        except self._discard_on:
+            discard = True
+            raise
+        finally:
+            self._local.held = None
+            self._release(pooled, discard=discard)
+
+    def current_connection(self) -> Any:
+        """
+        Get the connection checked out by the current thread.
+
+        :raise RuntimeError:
+            If the current thread doesn't have a connection checked out.
+        """
+        held: Optional[_PooledConnection] = getattr(self._local, "held", None)
+        if held is None:
+            raise RuntimeError("No connection checked out by the current thread")
+        return held.conn
+
+    def metrics(self) -> PoolMetrics:
+        """Get a snapshot of the pool's metrics."""
+        with self._cond:
+            return PoolMetrics(
+                max_size=self._max_size,
+                size=self._size,
+                in_use=self._size - len(self._idle),
+                idle=len(self._idle),
+                checkouts=self._checkouts,
+                waits=self._waits,
+                wait_time=self._wait_time,
+                created=self._created,
+                discarded=self._discarded,
+                failed_checks=self._failed_checks,
+            )
+
+    def close(self) -> None:
+        """Close all idle connections, and others as they are returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._close_conn(pooled)
+
+    def _acquire(self) -> _PooledConnection:
+        """Take an idle connection, or create one if below the maximum size."""
+        with self._cond:
+            self._checkouts += 1
+            if not self._idle and self._size >= self._max_size:
+                self._waits += 1
+                start = tm.monotonic()
+                ok = self._cond.wait_for(
+                    lambda: self._closed or self._idle or self._size < self._max_size,
+                    self._timeout,
+                )
+                self._wait_time += tm.monotonic() - start
+                if not ok:
+                    raise PoolTimeoutError(
+                        f"Timed out waiting for one of {self._max_size} connections"
+                    )
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            pooled = self._idle.pop() if self._idle else None
+            # Reserve the slot while connecting/checking outside the lock.
+            if pooled is None:
+                self._size += 1
+
+        if pooled is not None and not self._is_healthy(pooled):
+            self._close_conn(pooled)
+            with self._cond:
+                self._discarded += 1
+                self._failed_checks += 1
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = _PooledConnection(self._connect())
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._created += 1
+        return pooled
+
+    def _release(self, pooled: _PooledConnection, *, discard: bool) -> None:
+        """Return a connection to the pool, or discard it."""
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._discarded += discard
+            else:
+                pooled.last_used = tm.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        if discard or self._closed:
+            logger.debug("Discarding pooled connection")
+            self._close_conn(pooled)
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        if self._check is None:
+            return True
+        if tm.monotonic() - pooled.last_used < self._check_after:
+            return True
+        try:
+            return self._check(pooled.conn)
+        except Exception:
+            logger.debug("Error checking pooled connection", exc_info=True)
+            return False
+
+    @staticmethod
+    def _close_conn(pooled: _PooledConnection) -> None:
+        try:
+            pooled.conn.close()
+        except Exception:
+            logger.debug("Error closing pooled connection", exc_info=True)
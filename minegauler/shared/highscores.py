@@ -9,29 +9,43 @@ __all__ = (
     "HighscoreSettingsStruct",
     "HighscoreStruct",
     "HighscoresDatabases",
+    "PersonalBestCache",
+    "PlayerStats",
+    "compare_with_personal_best",
     "filter_and_sort",
+    "get_best_times",
+    "get_combined_times",
     "get_highscores",
+    "get_player_stats",
+    "get_ranked_highscores",
     "insert_highscore",
+    "is_highscore_new_best",
+    "query_highscores",
     "retrieve_highscores",
+    "start_remote_submission",
 )
 
 import abc
+import atexit
+import collections
 import enum
 import logging
+import operator
 import os
 import pathlib
 import sqlite3
 import threading
 from textwrap import dedent
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import attr
 import mysql.connector
 import mysql.connector.cursor
-import requests
 
 from .. import ROOT_DIR
 from . import utils
+from .db_pool import ConnectionPool, PoolMetrics, PoolTimeoutError
+from .post_queue import PostQueue
 from .types import Difficulty, PathLike
 from .utils import StructConstructorMixin
 
@@ -39,6 +53,10 @@ from .utils import StructConstructorMixin
 logger = logging.getLogger(__name__)
 
 _REMOTE_POST_URL = "http://minegauler.lewisgaul.co.uk/api/v1/highscore"
+_REMOTE_BATCH_POST_URL = "http://minegauler.lewisgaul.co.uk/api/v1/highscores"
+
+_remote_post_queue: Optional[PostQueue] = None
+_remote_post_queue_lock = threading.Lock()
 
 
 @attr.attrs(auto_attribs=True, frozen=True)
@@ -71,6 +89,149 @@ class HighscoreStruct(HighscoreSettingsStruct):
 
 _highscore_fields = attr.fields_dict(HighscoreStruct).keys()
 
+# The fields identifying a highscore, used to break ties when paginating.
+_IDENTITY_FIELDS = ("timestamp", "name", "difficulty", "per_cell", "drag_select")
+
+# The maximum value for a SQL 'LIMIT', when only an offset is given.
+_MAX_SQL_LIMIT = 2 ** 63 - 1
+
+# A player's best time and best 3bv/s for a settings group.
+_PersonalBest = Tuple[float, float]
+
+# The difficulties included in a combined time, and the time counted for each
+#  difficulty a player has no highscore for.
+_COMBINED_DIFFICULTIES = (
+    Difficulty.BEGINNER,
+    Difficulty.INTERMEDIATE,
+    Difficulty.EXPERT,
+)
+_COMBINED_MISSING_TIME = 1000
+
+
+@attr.attrs(auto_attribs=True, frozen=True)
+class PlayerStats:
+    """Summary statistics for a player's highscores."""
+
+    # The player's name, lower case.
+    name: str
+    # The sum of the player's best times for each combined difficulty.
+    combined_time: float
+    # The number of settings groups the player has highscores for.
+    types_played: int
+    # The timestamp of the player's latest highscore.
+    last_highscore: int
+
+
+class PersonalBestCache:
+    """
+    Cache of each player's best time and 3bv/s for each settings group.
+
+    Entries are fetched on first lookup and then kept up to date by calling
+    update() for each highscore inserted. The cache is only valid as long as
+    all inserts go through the owner of the cache.
+
+    Fetches are made without holding the cache's lock, such that lookups for
+    other players aren't blocked. Concurrent lookups for the same player and
+    settings group share a single fetch.
+    """
+
+    class _PendingFetch:
+        """A fetch in progress, with updates made while fetching."""
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.updates: List[HighscoreStruct] = []
+
+    def __init__(self):
+        self._cache: Dict[Tuple, Optional[_PersonalBest]] = {}
+        self._pending: Dict[Tuple, PersonalBestCache._PendingFetch] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(settings: HighscoreSettingsStruct, name: str) -> Tuple:
+        return (
+            settings.difficulty,
+            settings.per_cell,
+            settings.drag_select,
+            name.lower(),
+        )
+
+    @staticmethod
+    def _merge(
+        best: Optional[_PersonalBest], highscore: HighscoreStruct
+    ) -> _PersonalBest:
+        if best is None:
+            return highscore.elapsed, highscore.bbbvps
+        return min(best[0], highscore.elapsed), max(best[1], highscore.bbbvps)
+
+    def get(
+        self,
+        settings: HighscoreSettingsStruct,
+        name: str,
+        fetch: Callable[[], Optional[_PersonalBest]],
+    ) -> Optional[_PersonalBest]:
+        """
+        Get a player's best time and 3bv/s for a settings group.
+
+        :param settings:
+            The settings group.
+        :param name:
+            The player's name, case insensitive.
+        :param fetch:
+            Function to fetch the best time and 3bv/s if not already cached.
+        :return:
+            The best time and 3bv/s, or None if the player has no highscores.
+        """
+        key = self._key(settings, name)
+        while True:
+            with self._lock:
+                try:
+                    return self._cache[key]
+                except KeyError:
+                    pass
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = self._PendingFetch()
+                    break
+            # Wait for another thread's fetch, then check the cache again.
+            pending.done.wait()
+
+        try:
+            best = fetch()
+        except BaseException:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+            pending.done.set()
+            raise
+        with self._lock:
+            for highscore in pending.updates:
+                best = self._merge(best, highscore)
+            # Not stored if the cache was cleared while fetching.
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+                self._cache[key] = best
+        pending.done.set()
+        return best
+
+    def update(self, highscore: HighscoreStruct) -> None:
+        """Update the cache with a highscore that has been inserted."""
+        key = self._key(highscore, highscore.name)
+        with self._lock:
+            if key in self._cache:
+                self._cache[key] = self._merge(self._cache[key], highscore)
+            elif key in self._pending:
+                # The fetch may not include this highscore.
+                self._pending[key].updates.append(highscore)
+            # Otherwise fetched from the DB on first lookup, including this
+            #  highscore.
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+            self._pending.clear()
+
 
 class DBConnectionError(Exception):
     """Unable to connect to a database."""
@@ -103,6 +264,220 @@ class AbstractHighscoresDB(abc.ABC):
         logger.debug("%s: Getting highscores", type(self).__name__)
         return NotImplemented
 
+    def get_ranked_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        sort_key: str = "time",
+        name: Optional[str] = None,
+        flagging: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[HighscoreStruct]:
+        """
+        Fetch ranked highscores from the database, see filter_and_sort().
+
+        This implementation fetches all highscores matching the settings and
+        ranks them in Python, subclasses may rank them in the database.
+
+        :param sort_key:
+            What to rank by, either "time" or "3bv/s".
+        :param name:
+            Optionally specify a name to filter by, in which case all of the
+            player's highscores are included rather than only their best.
+        :param flagging:
+            Optionally filter by flagging ("F") or non-flagging ("NF").
+        :param limit:
+            Optionally specify the maximum number of highscores to return.
+        :param offset:
+            The number of ranked highscores to skip.
+        :raise ValueError:
+            If the limit or offset is negative.
+        """
+        if limit is not None and limit < 0 or offset < 0:
+            raise ValueError("Limit and offset must not be negative")
+        ranked = filter_and_sort(
+            self.get_highscores(
+                difficulty=difficulty, per_cell=per_cell, drag_select=drag_select
+            ),
+            sort_key,
+            {"name": name, "flagging": flagging},
+        )
+        return ranked[offset : offset + limit if limit is not None else None]
+
+    def query_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        name: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a page of highscores from the database as JSON-serialisable
+        dictionaries, see query_highscores().
+
+        This implementation fetches all highscores matching the filters and
+        sorts and paginates them in Python, subclasses may do so in the
+        database.
+        """
+        fields = _check_fields(fields)
+        highscores = list(
+            self.get_highscores(
+                difficulty=difficulty,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                name=name,
+            )
+        )
+        paginated = limit is not None or offset > 0
+        for field, desc in reversed(_parse_order_by(order_by, stable=paginated)):
+            highscores.sort(key=operator.attrgetter(field), reverse=desc)
+        end = offset + limit if limit is not None else None
+        return [
+            _highscore_to_dict([getattr(h, f) for f in fields], fields)
+            for h in highscores[offset:end]
+        ]
+
+    def get_personal_best(
+        self, settings: HighscoreSettingsStruct, name: str
+    ) -> Optional[_PersonalBest]:
+        """
+        Get a player's best time and 3bv/s for a settings group.
+
+        :param settings:
+            The settings group.
+        :param name:
+            The player's name, case insensitive.
+        :return:
+            The best time and 3bv/s, or None if the player has no highscores.
+        """
+        return _get_personal_best(
+            self.get_highscores(
+                difficulty=settings.difficulty,
+                per_cell=settings.per_cell,
+                drag_select=settings.drag_select,
+                name=name,
+            )
+        )
+
+    def get_best_times(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        """
+        Get each player's best time, see get_best_times().
+
+        This implementation aggregates all matching highscores in Python,
+        subclasses may do so in the database.
+        """
+        names = _lower_names(names)
+        best = dict()
+        for h in self.get_highscores(
+            difficulty=difficulty, per_cell=per_cell, drag_select=drag_select
+        ):
+            name = h.name.lower()
+            if names is None or name in names:
+                best[name] = min(best.get(name, h.elapsed), h.elapsed)
+        return best
+
+    def get_combined_times(
+        self,
+        *,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        """
+        Get each player's combined time, see get_combined_times().
+
+        This implementation aggregates all matching highscores in Python,
+        subclasses may do so in the database.
+        """
+        best_times = [
+            self.get_best_times(
+                difficulty=diff, per_cell=per_cell, drag_select=drag_select, names=names
+            )
+            for diff in _COMBINED_DIFFICULTIES
+        ]
+        return {
+            name: sum(t.get(name, _COMBINED_MISSING_TIME) for t in best_times)
+            for name in set().union(*best_times)
+        }
+
+    def get_player_stats(self, names: Iterable[str]) -> Dict[str, PlayerStats]:
+        """
+        Get summary statistics for players, see get_player_stats().
+
+        This implementation aggregates all highscores in Python, subclasses
+        may do so in the database.
+        """
+        names = _lower_names(names)
+        settings_groups = collections.defaultdict(set)
+        last_highscore = dict()
+        for h in self.get_highscores():
+            name = h.name.lower()
+            if name in names:
+                settings_groups[name].add((h.difficulty, h.per_cell, h.drag_select))
+                last_highscore[name] = max(
+                    last_highscore.get(name, h.timestamp), h.timestamp
+                )
+        return self._make_player_stats(
+            [(n, len(settings_groups[n]), last_highscore[n]) for n in last_highscore],
+            names,
+        )
+
+    def _make_player_stats(
+        self, rows: Iterable[Tuple[str, int, int]], names: Iterable[str]
+    ) -> Dict[str, PlayerStats]:
+        """
+        Create player statistics, fetching combined times.
+
+        :param rows:
+            The lower case name, number of settings groups played and latest
+            highscore timestamp for each player with highscores.
+        :param names:
+            The names the statistics were fetched for.
+        """
+        rows = list(rows)
+        if not rows:
+            return dict()
+        combined_times = self.get_combined_times(names=names)
+        no_combined_time = _COMBINED_MISSING_TIME * len(_COMBINED_DIFFICULTIES)
+        return {
+            name: PlayerStats(
+                name, combined_times.get(name, no_combined_time), types_played, last
+            )
+            for name, types_played, last in rows
+        }
+
+    def has_highscore(self, highscore: HighscoreStruct) -> bool:
+        """
+        Check whether a highscore is already in the database, matching on the
+        settings, name and timestamp.
+
+        :param highscore:
+            The highscore to look for.
+        """
+        return any(
+            h.name == highscore.name and h.timestamp == highscore.timestamp
+            for h in self.get_highscores(
+                difficulty=highscore.difficulty,
+                per_cell=highscore.per_cell,
+                drag_select=highscore.drag_select,
+            )
+        )
+
     @abc.abstractmethod
     def count_highscores(self) -> int:
         """Count the number of rows in the highscores table."""
@@ -116,6 +491,16 @@ class AbstractHighscoresDB(abc.ABC):
             "%s: Inserting highscore into DB: %s", type(self).__name__, highscore
         )
 
+    def insert_highscores(self, highscores: Iterable[HighscoreStruct]) -> None:
+        """
+        Insert multiple highscores into the database.
+
+        :param highscores:
+            The highscores to insert.
+        """
+        for highscore in highscores:
+            self.insert_highscore(highscore)
+
     def execute(self, cmd: str, params: Tuple = (), *, commit=False, **cursor_args):
         """
         Execute a command on the database.
@@ -161,29 +546,270 @@ class _SQLMixin:
         )"""
     )
 
-    def _get_select_highscores_sql(
-        self,
+    # The orderings for ranking highscores, matching filter_and_sort().
+    _RANK_ORDER_SQL = {
+        "time": "elapsed ASC, bbbv DESC",
+        "3bv/s": "bbbvps DESC, bbbv ASC, elapsed ASC",
+    }
+
+    @staticmethod
+    def _get_where_sql(
         *,
         difficulty: Optional[Difficulty] = None,
         per_cell: Optional[int] = None,
         drag_select: Optional[bool] = None,
         name: Optional[str] = None,
-    ) -> str:
-        """Get the SQL command to get/select highscores from a DB."""
+        flagging: Optional[str] = None,
+        difficulties: Optional[Iterable[Difficulty]] = None,
+        names: Optional[Iterable[str]] = None,
+        fmt: str = "%s",
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL 'WHERE' clause for filtering highscores, along with the
+        parameters to pass with the command.
+        """
         conditions = []
+        params = []
+
+        def add_in_condition(column: str, values: List) -> None:
+            if values:
+                conditions.append(f"{column} IN ({', '.join(fmt for _ in values)})")
+                params.extend(values)
+            else:
+                conditions.append("0=1")
+
         if difficulty is not None:
-            conditions.append(f"difficulty='{difficulty.value}'")
+            conditions.append(f"difficulty={fmt}")
+            params.append(difficulty.value)
+        if difficulties is not None:
+            add_in_condition("difficulty", [d.value for d in difficulties])
         if per_cell is not None:
-            conditions.append(f"per_cell={per_cell}")
+            conditions.append(f"per_cell={fmt}")
+            params.append(per_cell)
         if drag_select is not None:
-            conditions.append(f"drag_select={drag_select:d}")
+            conditions.append(f"drag_select={fmt}")
+            params.append(int(drag_select))
         if name is not None:
-            conditions.append(f"LOWER(name)='{name.lower()}'")
-        return "SELECT {fields} FROM {table} {where} ORDER BY elapsed ASC".format(
-            fields=", ".join(_highscore_fields),
+            conditions.append(f"LOWER(name)={fmt}")
+            params.append(name.lower())
+        if names is not None:
+            add_in_condition("LOWER(name)", sorted(_lower_names(names)))
+        if flagging == "F":
+            conditions.append(f"flagging>{fmt}")
+            params.append(utils.FLAGGING_THRESHOLD)
+        elif flagging == "NF":
+            conditions.append(f"flagging<={fmt}")
+            params.append(utils.FLAGGING_THRESHOLD)
+        elif flagging:
+            raise ValueError(f"Unrecognised flagging filter: {flagging!r}")
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, tuple(params)
+
+    def _get_select_highscores_sql(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        name: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fmt: str = "%s",
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get/select highscores from a DB, along with the
+        parameters to pass with the command. See query_highscores().
+        """
+        where, params = self._get_where_sql(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            name=name,
+            fmt=fmt,
+        )
+        order = ", ".join(
+            f"{field} {'DESC' if desc else 'ASC'}"
+            for field, desc in _parse_order_by(
+                order_by, stable=limit is not None or offset > 0
+            )
+        )
+        cmd = "SELECT {fields} FROM {table} {where} ORDER BY {order}".format(
+            fields=", ".join(_check_fields(fields)),
             table=self._TABLE_NAME,
-            where="WHERE " + " AND ".join(conditions) if conditions else "",
+            where=where,
+            order=order,
         )
+        if limit is not None or offset:
+            if limit is not None and limit < 0 or offset < 0:
+                raise ValueError("Limit and offset must not be negative")
+            cmd += f" LIMIT {fmt} OFFSET {fmt}"
+            params += (_MAX_SQL_LIMIT if limit is None else limit, offset)
+        return cmd, params
+
+    def _get_ranked_highscores_sql(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        sort_key: str = "time",
+        name: Optional[str] = None,
+        flagging: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fmt: str = "%s",
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get ranked highscores from a DB, along with the
+        parameters to pass with the command. See filter_and_sort().
+
+        Without a name filter only the best highscore for each name is
+        included, which requires window function support. When paging through
+        the results with a limit or offset, ties are broken by the fields
+        identifying a highscore so that the order is stable.
+        """
+        try:
+            order = self._RANK_ORDER_SQL[sort_key]
+        except KeyError:
+            raise ValueError(f"Unrecognised sort key: {sort_key!r}") from None
+        where, params = self._get_where_sql(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            name=name,
+            flagging=flagging,
+            fmt=fmt,
+        )
+        fields = ", ".join(_highscore_fields)
+        if name:
+            cmd = f"SELECT {fields} FROM {self._TABLE_NAME} {where} ORDER BY {order}"
+        else:
+            cmd = (
+                f"SELECT {fields} FROM ("
+                f"SELECT {fields}, ROW_NUMBER() OVER "
+                f"(PARTITION BY LOWER(name) ORDER BY {order}) AS name_rank "
+                f"FROM {self._TABLE_NAME} {where}"
+                f") AS ranked WHERE name_rank=1 ORDER BY {order}"
+            )
+        if limit is not None or offset:
+            if limit is not None and limit < 0 or offset < 0:
+                raise ValueError("Limit and offset must not be negative")
+            cmd += "".join(f", {f} ASC" for f in _IDENTITY_FIELDS)
+            cmd += f" LIMIT {fmt} OFFSET {fmt}"
+            params += (_MAX_SQL_LIMIT if limit is None else limit, offset)
+        return cmd, params
+
+    def _get_personal_best_sql(
+        self, settings: HighscoreSettingsStruct, name: str, fmt: str = "%s"
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get a player's best time and 3bv/s for a
+        settings group, along with the parameters to pass with the command.
+        """
+        where, params = self._get_where_sql(
+            difficulty=settings.difficulty,
+            per_cell=settings.per_cell,
+            drag_select=settings.drag_select,
+            name=name,
+            fmt=fmt,
+        )
+        cmd = f"SELECT MIN(elapsed), MAX(bbbvps) FROM {self._TABLE_NAME} {where}"
+        return cmd, params
+
+    def _get_best_times_sql(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+        fmt: str = "%s",
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get each player's best time, along with the
+        parameters to pass with the command. See get_best_times().
+        """
+        where, params = self._get_where_sql(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            names=names,
+            fmt=fmt,
+        )
+        cmd = (
+            f"SELECT LOWER(name), MIN(elapsed) FROM {self._TABLE_NAME} {where} "
+            f"GROUP BY LOWER(name)"
+        )
+        return cmd, params
+
+    def _get_combined_times_sql(
+        self,
+        *,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+        fmt: str = "%s",
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get each player's combined time, along with the
+        parameters to pass with the command. See get_combined_times().
+        """
+        where, params = self._get_where_sql(
+            per_cell=per_cell,
+            drag_select=drag_select,
+            difficulties=_COMBINED_DIFFICULTIES,
+            names=names,
+            fmt=fmt,
+        )
+        cmd = (
+            f"SELECT player, SUM(best) + {_COMBINED_MISSING_TIME} * "
+            f"({len(_COMBINED_DIFFICULTIES)} - COUNT(*)) FROM ("
+            f"SELECT LOWER(name) AS player, MIN(elapsed) AS best "
+            f"FROM {self._TABLE_NAME} {where} GROUP BY LOWER(name), difficulty"
+            f") AS best_times GROUP BY player"
+        )
+        return cmd, params
+
+    def _get_player_stats_sql(
+        self, names: Iterable[str], fmt: str = "%s"
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to get each player's number of settings groups
+        played and latest highscore timestamp, along with the parameters to
+        pass with the command. See get_player_stats().
+        """
+        where, params = self._get_where_sql(names=names, fmt=fmt)
+        cmd = (
+            f"SELECT player, COUNT(*), MAX(last_timestamp) FROM ("
+            f"SELECT LOWER(name) AS player, MAX(timestamp) AS last_timestamp "
+            f"FROM {self._TABLE_NAME} {where} "
+            f"GROUP BY LOWER(name), difficulty, per_cell, drag_select"
+            f") AS settings_groups GROUP BY player"
+        )
+        return cmd, params
+
+    def _get_has_highscore_sql(
+        self, highscore: HighscoreStruct, fmt: str = "%s"
+    ) -> Tuple[str, Tuple]:
+        """
+        Get the SQL command to count the rows matching a highscore's settings,
+        name and timestamp, along with the parameters to pass with the command.
+        """
+        cmd = (
+            f"SELECT COUNT(*) FROM {self._TABLE_NAME} "
+            f"WHERE difficulty={fmt} AND per_cell={fmt} AND drag_select={fmt} "
+            f"AND name={fmt} AND timestamp={fmt}"
+        )
+        params = (
+            highscore.difficulty.value,
+            highscore.per_cell,
+            int(highscore.drag_select),
+            highscore.name,
+            highscore.timestamp,
+        )
+        return cmd, params
 
     def _get_insert_highscore_sql(self, fmt="%s") -> str:
         """Get the SQL command to insert a highscore into a DB."""
@@ -201,16 +827,54 @@ class _SQLMixin:
 class LocalHighscoresDB(_SQLMixin, AbstractHighscoresDB):
     """Database of local highscores."""
 
+    # The current version of the DB schema, see _migrate().
+    _DB_VERSION = 2
+
+    # The columns uniquely identifying a highscore.
+    _KEY_FIELDS = (
+        "difficulty",
+        "per_cell",
+        "drag_select",
+        "name",
+        "timestamp",
+        "elapsed",
+    )
+
+    # Indexes for filtering highscores by settings and/or name, ordered by time
+    #  or 3bv/s.
+    _CREATE_INDEXES_SQL = (
+        f"CREATE INDEX IF NOT EXISTS settings_elapsed_idx ON {_SQLMixin._TABLE_NAME} "
+        f"(difficulty, per_cell, drag_select, elapsed)",
+        f"CREATE INDEX IF NOT EXISTS settings_bbbvps_idx ON {_SQLMixin._TABLE_NAME} "
+        f"(difficulty, per_cell, drag_select, bbbvps)",
+        f"CREATE INDEX IF NOT EXISTS name_elapsed_idx ON {_SQLMixin._TABLE_NAME} "
+        f"(LOWER(name), elapsed)",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS highscore_key_idx "
+        f"ON {_SQLMixin._TABLE_NAME} ({', '.join(_KEY_FIELDS)})",
+    )
+
+    # Personal best caches for each DB path, shared between instances.
+    _best_caches: Dict[pathlib.Path, PersonalBestCache] = {}
+
     def __init__(self, path: pathlib.Path = ROOT_DIR / "data" / "highscores.db"):
         self._path = path
+        self._best_cache = self._best_caches.setdefault(
+            pathlib.Path(path).absolute(), PersonalBestCache()
+        )
         if os.path.exists(path):
             self._conn = sqlite3.connect(str(path))
         else:
             os.makedirs(path.parent, exist_ok=True)
             self._conn = sqlite3.connect(str(path))
+            self._best_cache.clear()
 
             self.execute(self._CREATE_TABLE_SQL)
             self.execute("PRAGMA user_version = 0")
+        # Allow reads concurrent with writes, and only sync to disk at
+        #  checkpoints, which is safe from corruption in WAL mode.
+        self.execute("PRAGMA journal_mode = WAL")
+        self.execute("PRAGMA synchronous = NORMAL")
+        self._migrate()
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -222,16 +886,42 @@ class LocalHighscoresDB(_SQLMixin, AbstractHighscoresDB):
 
     @staticmethod
     def _highscore_row_factory(cursor: sqlite3.Cursor, row: Tuple) -> HighscoreStruct:
-        """Create a HighscoreStruct instance from a row in the highscores table."""
-        return HighscoreStruct(
-            **{col[0]: row[i] for i, col in enumerate(cursor.description)}
-        )
+        """
+        Create a HighscoreStruct instance from a row in the highscores table,
+        selected with the columns in the order of the struct's fields.
+        """
+        return HighscoreStruct(*row)
 
     def get_db_version(self) -> int:
         """Get the database version number."""
         cursor = self.execute("PRAGMA user_version")
         return self.extract_single_elem(cursor)
 
+    def _migrate(self) -> None:
+        """Migrate the database to the current version, if necessary."""
+        version = self.get_db_version()
+        if version >= self._DB_VERSION:
+            return
+        logger.info(
+            "Migrating highscores DB from version %d to %d", version, self._DB_VERSION
+        )
+        with self._conn:
+            if version < 2:
+                # Remove duplicates before creating the unique index.
+                self.execute(
+                    f"DELETE FROM {self._TABLE_NAME} WHERE rowid NOT IN "
+                    f"(SELECT MIN(rowid) FROM {self._TABLE_NAME} "
+                    f"GROUP BY {', '.join(self._KEY_FIELDS)})"
+                )
+                self._create_indexes()
+            # PRAGMA doesn't support parameters.
+            self.execute(f"PRAGMA user_version = {self._DB_VERSION:d}")
+
+    def _create_indexes(self) -> None:
+        """Create the indexes on the highscores table, if they don't exist."""
+        for cmd in self._CREATE_INDEXES_SQL:
+            self.execute(cmd)
+
     def get_highscores(
         self,
         *,
@@ -245,43 +935,210 @@ class LocalHighscoresDB(_SQLMixin, AbstractHighscoresDB):
         )
         self._conn.row_factory = self._highscore_row_factory
         cursor = self.execute(
-            self._get_select_highscores_sql(
+            *self._get_select_highscores_sql(
                 difficulty=difficulty,
                 per_cell=per_cell,
                 drag_select=drag_select,
                 name=name,
+                fmt="?",
             )
         )
         self._conn.row_factory = None
         return cursor.fetchall()
 
+    def get_ranked_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        sort_key: str = "time",
+        name: Optional[str] = None,
+        flagging: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[HighscoreStruct]:
+        kwargs = dict(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            sort_key=sort_key,
+            name=name,
+            flagging=flagging,
+            limit=limit,
+            offset=offset,
+        )
+        # Window functions were added in SQLite 3.25.
+        if sqlite3.sqlite_version_info < (3, 25, 0):
+            return super().get_ranked_highscores(**kwargs)
+        self._conn.row_factory = self._highscore_row_factory
+        try:
+            cursor = self.execute(*self._get_ranked_highscores_sql(**kwargs, fmt="?"))
+        finally:
+            self._conn.row_factory = None
+        return cursor.fetchall()
+
+    def query_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        name: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        fields = _check_fields(fields)
+        cursor = self.execute(
+            *self._get_select_highscores_sql(
+                difficulty=difficulty,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                name=name,
+                fields=fields,
+                order_by=order_by,
+                limit=limit,
+                offset=offset,
+                fmt="?",
+            )
+        )
+        return [_highscore_to_dict(row, fields) for row in cursor]
+
+    def get_personal_best(
+        self, settings: HighscoreSettingsStruct, name: str
+    ) -> Optional[_PersonalBest]:
+        """
+        Get a player's best time and 3bv/s for a settings group.
+
+        Results are cached, and the cache is updated on insert.
+        """
+
+        def fetch() -> Optional[_PersonalBest]:
+            cursor = self.execute(*self._get_personal_best_sql(settings, name, fmt="?"))
+            elapsed, bbbvps = next(cursor)
+            return None if elapsed is None else (elapsed, bbbvps)
+
+        return self._best_cache.get(settings, name, fetch)
+
+    def get_best_times(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        return dict(
+            self.execute(
+                *self._get_best_times_sql(
+                    difficulty=difficulty,
+                    per_cell=per_cell,
+                    drag_select=drag_select,
+                    names=names,
+                    fmt="?",
+                )
+            )
+        )
+
+    def get_combined_times(
+        self,
+        *,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        return dict(
+            self.execute(
+                *self._get_combined_times_sql(
+                    per_cell=per_cell, drag_select=drag_select, names=names, fmt="?"
+                )
+            )
+        )
+
+    def get_player_stats(self, names: Iterable[str]) -> Dict[str, PlayerStats]:
+        names = _lower_names(names)
+        return self._make_player_stats(
+            self.execute(*self._get_player_stats_sql(names, fmt="?")), names
+        )
+
     def count_highscores(self) -> int:
         """Count the number of rows in the highscores table."""
         super().count_highscores()
         return next(self.execute(self._get_highscores_count_sql()))[0]
 
-    def merge_highscores(self, path: PathLike) -> int:
-        """Merge in highscores from a given other SQLite DB."""
-        if pathlib.Path(path) == self._path:
+    def merge_highscores(
+        self,
+        path: PathLike,
+        *,
+        chunk_size: int = 10_000,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Merge in highscores from a given other SQLite DB.
+
+        Highscores already in this DB are skipped. The merge is done in chunks
+        within a single transaction, so either all highscores are added or
+        none are.
+
+        :param path:
+            The path to the DB to merge in.
+        :param chunk_size:
+            The number of highscores to merge in at a time.
+        :param progress:
+            Optional callback for reporting progress, called with the number of
+            highscores processed and the total number after each chunk.
+        :return:
+            The number of highscores added.
+        """
+        if pathlib.Path(path).resolve() == pathlib.Path(self._path).resolve():
             raise ValueError("Cannot merge database into itself")
 
         hs_table = self._TABLE_NAME
-        tmp_table = "mergedTable"
         attach_db = "toMergeDB"
+        fields = ", ".join(_highscore_fields)
 
-        first_count = self.count_highscores()
-        self.execute(f"ATTACH DATABASE '{path!s}' AS {attach_db}")
-
-        self.execute(
-            f"CREATE TABLE IF NOT EXISTS {tmp_table} AS "
-            f"SELECT * FROM {hs_table} UNION SELECT * FROM {attach_db}.{hs_table}"
-        )
-        # TODO: This is not completely atomic, can we do better?
-        self.execute(f"DROP TABLE IF EXISTS {hs_table}")
-        self.execute(f"ALTER TABLE {tmp_table} RENAME TO {hs_table}")
-        self.execute(f"DETACH DATABASE {attach_db}")
-        self.conn.commit()
-        return self.count_highscores() - first_count
+        # Attaching and detaching can't be done inside a transaction.
+        self.execute(f"ATTACH DATABASE ? AS {attach_db}", (str(path),))
+        try:
+            total = self.extract_single_elem(
+                self.execute(f"SELECT COUNT(*) FROM {attach_db}.{hs_table}")
+            )
+            added = processed = 0
+            last_rowid = -1
+            with self._conn:
+                while True:
+                    count, max_rowid = next(
+                        self.execute(
+                            f"SELECT COUNT(*), MAX(rowid) FROM ("
+                            f"SELECT rowid FROM {attach_db}.{hs_table} "
+                            f"WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+                            (last_rowid, chunk_size),
+                        )
+                    )
+                    if count == 0:
+                        break
+                    cursor = self.execute(
+                        f"INSERT OR IGNORE INTO main.{hs_table} ({fields}) "
+                        f"SELECT {fields} FROM {attach_db}.{hs_table} "
+                        f"WHERE rowid > ? AND rowid <= ?",
+                        (last_rowid, max_rowid),
+                    )
+                    added += cursor.rowcount
+                    processed += count
+                    last_rowid = max_rowid
+                    if progress:
+                        progress(processed, total)
+        finally:
+            self.execute(f"DETACH DATABASE {attach_db}")
+        self._best_cache.clear()
+        logger.info("Merged %d of %d highscores from %s", added, total, path)
+        return added
+
+    def has_highscore(self, highscore: HighscoreStruct) -> bool:
+        cursor = self.execute(*self._get_has_highscore_sql(highscore, fmt="?"))
+        return self.extract_single_elem(cursor) > 0
 
     def insert_highscore(self, highscore: HighscoreStruct) -> None:
         super().insert_highscore(highscore)
@@ -290,6 +1147,17 @@ class LocalHighscoresDB(_SQLMixin, AbstractHighscoresDB):
             attr.astuple(highscore),
             commit=True,
         )
+        self._best_cache.update(highscore)
+
+    def insert_highscores(self, highscores: Iterable[HighscoreStruct]) -> None:
+        """Insert multiple highscores in a single transaction."""
+        rows = [attr.astuple(h) for h in highscores]
+        logger.debug(
+            "%s: Inserting %d highscores into DB", type(self).__name__, len(rows)
+        )
+        with self._conn:
+            self._conn.executemany(self._get_insert_highscore_sql(fmt="?"), rows)
+        self._best_cache.clear()
 
     def execute(
         self, cmd: str, params: Tuple = (), *, commit=False, **cursor_args
@@ -304,37 +1172,76 @@ class RemoteHighscoresDB(_SQLMixin, AbstractHighscoresDB):
     _HOST = "minegauler-highscores.cb4tvkuqujyi.eu-west-2.rds.amazonaws.com"
     _DB_NAME = "minegauler"
 
-    _cached_conn: Optional[mysql.connector.MySQLConnection] = None
+    _POOL_SIZE = 8
+
+    # Errors indicating the connection to the DB has been lost.
+    _DISCONNECT_ERRORS = (
+        mysql.connector.errors.InterfaceError,
+        mysql.connector.errors.OperationalError,
+    )
+
+    # Connection pool shared by all instances, created on first use.
+    _pool: Optional[ConnectionPool] = None
+    _pool_lock = threading.Lock()
+    _server_version: Optional[Tuple[int, ...]] = None
 
     def __init__(self):
-        """
-        :raise DBConnectionError:
-            If connecting to the DB fails for any reason.
-        """
         cls = type(self)
-        if not cls._cached_conn:
-            logger.info("Initialising connection to remote highscores DB")
-            try:
-                cls._cached_conn = mysql.connector.connect(
-                    user=self._USER,
-                    password=self._PASSWORD,
-                    host=self._HOST,
-                    database=self._DB_NAME,
+        with cls._pool_lock:
+            if cls._pool is None:
+                logger.info("Initialising connection pool for remote highscores DB")
+                cls._pool = ConnectionPool(
+                    self._connect,
+                    max_size=self._POOL_SIZE,
+                    check=lambda conn: conn.is_connected(),
+                    discard_on=self._DISCONNECT_ERRORS,
                 )
-            except mysql.connector.Error as e:
-                raise DBConnectionError(
-                    "Unable to connect to remote highscores database"
-                ) from e
-        self._conn = cls._cached_conn
 
     @property
     def conn(self) -> mysql.connector.MySQLConnection:
-        return self._conn
+        """
+        The connection checked out by the current thread, see connection().
+
+        :raise RuntimeError:
+            If the current thread doesn't have a connection checked out.
+        """
+        return self._pool.current_connection()
 
     @property
     def _PASSWORD(self):
         return os.environ.get("SQL_DB_PASSWORD")
 
+    @classmethod
+    def get_pool_metrics(cls) -> Optional[PoolMetrics]:
+        """Get the connection pool metrics, or None if not yet created."""
+        return cls._pool.metrics() if cls._pool else None
+
+    def connection(self):
+        """
+        Check out a connection from the pool for the current thread, to be
+        used as a context manager.
+        """
+        return self._pool.connection()
+
+    def _connect(self) -> mysql.connector.MySQLConnection:
+        logger.debug("Connecting to remote highscores DB")
+        conn = mysql.connector.connect(
+            user=self._USER,
+            password=self._PASSWORD,
+            host=self._HOST,
+            database=self._DB_NAME,
+            # Avoid pooled connections holding open a stale read snapshot.
+            autocommit=True,
+        )
+        type(self)._server_version = conn.get_server_version()
+        return conn
+
+    def _get_server_version(self) -> Tuple[int, ...]:
+        if self._server_version is None:
+            with self.connection():
+                pass
+        return self._server_version
+
     def get_highscores(
         self,
         *,
@@ -347,7 +1254,7 @@ class RemoteHighscoresDB(_SQLMixin, AbstractHighscoresDB):
             difficulty=difficulty, per_cell=per_cell, drag_select=drag_select, name=name
         )
         cursor = self.execute(
-            self._get_select_highscores_sql(
+            *self._get_select_highscores_sql(
                 difficulty=difficulty,
                 per_cell=per_cell,
                 drag_select=drag_select,
@@ -357,11 +1264,122 @@ class RemoteHighscoresDB(_SQLMixin, AbstractHighscoresDB):
         )
         return [HighscoreStruct(**r) for r in cursor.fetchall()]
 
+    def query_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        name: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        fields = _check_fields(fields)
+        cursor = self.execute(
+            *self._get_select_highscores_sql(
+                difficulty=difficulty,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                name=name,
+                fields=fields,
+                order_by=order_by,
+                limit=limit,
+                offset=offset,
+            )
+        )
+        return [_highscore_to_dict(row, fields) for row in cursor.fetchall()]
+
+    def get_personal_best(
+        self, settings: HighscoreSettingsStruct, name: str
+    ) -> Optional[_PersonalBest]:
+        elapsed, bbbvps = next(
+            self.execute(*self._get_personal_best_sql(settings, name))
+        )
+        return None if elapsed is None else (elapsed, bbbvps)
+
+    def get_best_times(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        cursor = self.execute(
+            *self._get_best_times_sql(
+                difficulty=difficulty,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                names=names,
+            )
+        )
+        return dict(cursor.fetchall())
+
+    def get_combined_times(
+        self,
+        *,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        cursor = self.execute(
+            *self._get_combined_times_sql(
+                per_cell=per_cell, drag_select=drag_select, names=names
+            )
+        )
+        # MySQL sums to a decimal.
+        return {name: float(t) for name, t in cursor.fetchall()}
+
+    def get_player_stats(self, names: Iterable[str]) -> Dict[str, PlayerStats]:
+        names = _lower_names(names)
+        cursor = self.execute(*self._get_player_stats_sql(names))
+        return self._make_player_stats(cursor.fetchall(), names)
+
+    def get_ranked_highscores(
+        self,
+        *,
+        difficulty: Optional[Difficulty] = None,
+        per_cell: Optional[int] = None,
+        drag_select: Optional[bool] = None,
+        sort_key: str = "time",
+        name: Optional[str] = None,
+        flagging: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[HighscoreStruct]:
+        kwargs = dict(
+            difficulty=difficulty,
+            per_cell=per_cell,
+            drag_select=drag_select,
+            sort_key=sort_key,
+            name=name,
+            flagging=flagging,
+            limit=limit,
+            offset=offset,
+        )
+        # Window functions were added in MySQL 8.0.
+        try:
+            server_version = self._get_server_version()
+        except mysql.connector.Error as e:
+            raise DBConnectionError("Unable to connect to remote DB") from e
+        if server_version < (8, 0):
+            return super().get_ranked_highscores(**kwargs)
+        cursor = self.execute(
+            *self._get_ranked_highscores_sql(**kwargs), dictionary=True
+        )
+        return [HighscoreStruct(**r) for r in cursor.fetchall()]
+
     def count_highscores(self) -> int:
         """Count the number of rows in the highscores table."""
         super().count_highscores()
         return next(self.execute(self._get_highscores_count_sql()))[0]
 
+    def has_highscore(self, highscore: HighscoreStruct) -> bool:
+        cursor = self.execute(*self._get_has_highscore_sql(highscore))
+        return self.extract_single_elem(cursor) > 0
+
     def insert_highscore(self, highscore: HighscoreStruct) -> None:
         super().insert_highscore(highscore)
         self.execute(
@@ -371,10 +1389,33 @@ class RemoteHighscoresDB(_SQLMixin, AbstractHighscoresDB):
     def execute(
         self, cmd: str, params: Tuple = (), *, commit=False, **cursor_args
     ) -> mysql.connector.cursor.MySQLCursor:
-        try:
-            return super().execute(cmd, params, commit=commit, **cursor_args)
-        except mysql.connector.Error as e:
-            raise DBConnectionError("Error occurred trying to execute command") from e
+        """
+        Execute a command on the database using a pooled connection.
+
+        Results are buffered, such that the connection can be returned to the
+        pool. Commands that aren't committed are retried once on a new
+        connection if the connection is found to have been lost.
+
+        :raise DBConnectionError:
+            If executing the command fails.
+        """
+        attempts = 1 if commit else 2
+        for attempt in range(1, attempts + 1):
+            try:
+                with self.connection():
+                    return super().execute(
+                        cmd, params, commit=commit, buffered=True, **cursor_args
+                    )
+            except self._DISCONNECT_ERRORS as e:
+                if attempt == attempts:
+                    raise DBConnectionError("Lost connection to remote DB") from e
+                logger.warning("Lost connection to remote DB, retrying: %s", e)
+            except mysql.connector.Error as e:
+                raise DBConnectionError(
+                    "Error occurred trying to execute command"
+                ) from e
+            except PoolTimeoutError as e:
+                raise DBConnectionError("No remote DB connection available") from e
 
 
 class HighscoresDatabases(enum.Enum):
@@ -421,21 +1462,235 @@ def get_highscores(
     )
 
 
+def get_ranked_highscores(
+    database=HighscoresDatabases.LOCAL,
+    *,
+    settings: Optional[HighscoreSettingsStruct] = None,
+    difficulty: Optional[Difficulty] = None,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+    sort_key: str = "time",
+    name: Optional[str] = None,
+    flagging: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[HighscoreStruct]:
+    """
+    Fetch ranked highscores from a database, as given by filter_and_sort().
+
+    :param database:
+        The database type to fetch from.
+    :param settings:
+        Optionally specify settings to filter by.
+    :param difficulty:
+        Optionally specify difficulty to filter by. Ignored if settings given.
+    :param per_cell:
+        Optionally specify per_cell to filter by. Ignored if settings given.
+    :param drag_select:
+        Optionally specify drag_select to filter by. Ignored if settings given.
+    :param sort_key:
+        What to rank by, either "time" or "3bv/s".
+    :param name:
+        Optionally specify a name to filter by, otherwise only the best
+        highscore for each name is included.
+    :param flagging:
+        Optionally filter by flagging ("F") or non-flagging ("NF").
+    :param limit:
+        Optionally specify the maximum number of highscores to return.
+    :param offset:
+        The number of ranked highscores to skip.
+    """
+    if settings is not None:
+        difficulty = settings.difficulty
+        per_cell = settings.per_cell
+        drag_select = settings.drag_select
+    return database.get_db_instance().get_ranked_highscores(
+        difficulty=difficulty,
+        per_cell=per_cell,
+        drag_select=drag_select,
+        sort_key=sort_key,
+        name=name,
+        flagging=flagging,
+        limit=limit,
+        offset=offset,
+    )
+
+
+def query_highscores(
+    database=HighscoresDatabases.LOCAL,
+    *,
+    settings: Optional[HighscoreSettingsStruct] = None,
+    difficulty: Optional[Difficulty] = None,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+    name: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    order_by: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a page of highscores from a database as JSON-serialisable
+    dictionaries, for serving over a REST API.
+
+    :param database:
+        The database type to fetch from.
+    :param settings:
+        Optionally specify settings to filter by.
+    :param difficulty:
+        Optionally specify difficulty to filter by. Ignored if settings given.
+    :param per_cell:
+        Optionally specify per_cell to filter by. Ignored if settings given.
+    :param drag_select:
+        Optionally specify drag_select to filter by. Ignored if settings given.
+    :param name:
+        Optionally specify a name to filter by.
+    :param fields:
+        The highscore fields to include, defaulting to all fields.
+    :param order_by:
+        The fields to sort by, each optionally prefixed with '-' for
+        descending order. Defaults to sorting by time.
+    :param limit:
+        Optionally specify the maximum number of highscores to return.
+    :param offset:
+        The number of highscores to skip.
+    :raise ValueError:
+        If an unrecognised field is given, or a negative limit/offset.
+    """
+    if settings is not None:
+        difficulty = settings.difficulty
+        per_cell = settings.per_cell
+        drag_select = settings.drag_select
+    return database.get_db_instance().query_highscores(
+        difficulty=difficulty,
+        per_cell=per_cell,
+        drag_select=drag_select,
+        name=name,
+        fields=fields,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
+    )
+
+
+def get_best_times(
+    database=HighscoresDatabases.LOCAL,
+    *,
+    settings: Optional[HighscoreSettingsStruct] = None,
+    difficulty: Optional[Difficulty] = None,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """
+    Get each player's best time from a database.
+
+    :param database:
+        The database type to fetch from.
+    :param settings:
+        Optionally specify settings to filter by.
+    :param difficulty:
+        Optionally specify difficulty to filter by. Ignored if settings given.
+    :param per_cell:
+        Optionally specify per_cell to filter by. Ignored if settings given.
+    :param drag_select:
+        Optionally specify drag_select to filter by. Ignored if settings given.
+    :param names:
+        Optionally specify the names of players to include.
+    :return:
+        A mapping of lower case player name to best time, for players with
+        matching highscores.
+    """
+    if settings is not None:
+        difficulty = settings.difficulty
+        per_cell = settings.per_cell
+        drag_select = settings.drag_select
+    return database.get_db_instance().get_best_times(
+        difficulty=difficulty, per_cell=per_cell, drag_select=drag_select, names=names
+    )
+
+
+def get_combined_times(
+    database=HighscoresDatabases.LOCAL,
+    *,
+    per_cell: Optional[int] = None,
+    drag_select: Optional[bool] = None,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """
+    Get each player's combined time from a database, being the sum of their
+    best beginner, intermediate and expert times. A time of 1000 is counted
+    for each of these difficulties a player has no highscore for.
+
+    :param database:
+        The database type to fetch from.
+    :param per_cell:
+        Optionally specify per_cell to filter by.
+    :param drag_select:
+        Optionally specify drag_select to filter by.
+    :param names:
+        Optionally specify the names of players to include.
+    :return:
+        A mapping of lower case player name to combined time, for players with
+        matching highscores.
+    """
+    return database.get_db_instance().get_combined_times(
+        per_cell=per_cell, drag_select=drag_select, names=names
+    )
+
+
+def get_player_stats(
+    database=HighscoresDatabases.LOCAL, *, names: Iterable[str]
+) -> Dict[str, PlayerStats]:
+    """
+    Get summary statistics for players from a database.
+
+    :param database:
+        The database type to fetch from.
+    :param names:
+        The names of players to get statistics for.
+    :return:
+        A mapping of lower case player name to statistics, for players with
+        highscores.
+    """
+    return database.get_db_instance().get_player_stats(names)
+
+
 def insert_highscore(highscore: HighscoreStruct) -> None:
-    """Insert a highscore into DBs."""
+    """
+    Insert a highscore into the local DB, and queue it to be posted to the
+    remote server in the background.
+    """
     LocalHighscoresDB().insert_highscore(highscore)
+    try:
+        _get_remote_post_queue().put(attr.asdict(highscore))
+    except Exception:
+        logger.exception("Failed to queue highscore to be posted to remote")
 
-    def _post_catch_exc():
-        try:
-            _post_highscore_to_remote(highscore)
-        except Exception:
-            logger.exception("Failed to insert highscore into remote DB")
 
-    threading.Thread(target=_post_catch_exc).start()
+def start_remote_submission() -> None:
+    """
+    Start posting highscores to the remote server in the background, including
+    any left queued from a previous run.
+    """
+    _get_remote_post_queue()
+
 
+def retrieve_highscores(
+    path: PathLike, *, progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Merge highscores from another local highscores DB into the local DB.
 
-def retrieve_highscores(path: PathLike) -> int:
-    return LocalHighscoresDB().merge_highscores(path)
+    :param path:
+        The path to the DB to merge in.
+    :param progress:
+        Optional callback for reporting progress, see
+        LocalHighscoresDB.merge_highscores().
+    :return:
+        The number of highscores added.
+    """
+    return LocalHighscoresDB().merge_highscores(path, progress=progress)
 
 
 def filter_and_sort(
@@ -480,21 +1735,20 @@ def filter_and_sort(
         ret.sort(key=lambda h: (h.bbbvps, -h.bbbv), reverse=True)
     if "name" not in filters:
         # If no name filter, only include best highscore for each name.
-        names = []
-        i = 0
-        while i < len(ret):
-            hs = ret[i]
-            name = hs["name"].lower()
-            if name in names:
-                ret.pop(i)
-            else:
-                names.append(name)
-                i += 1
+        names = set()
+        best = []
+        for hs in ret:
+            name = hs.name.lower()
+            if name not in names:
+                names.add(name)
+                best.append(hs)
+        ret = best
     return ret
 
 
 def is_highscore_new_best(
-    highscore: HighscoreStruct, all_highscores: Iterable[HighscoreStruct]
+    highscore: HighscoreStruct,
+    all_highscores: Optional[Iterable[HighscoreStruct]] = None,
 ) -> Optional[str]:
     """
     Test to see if a new top highscore has been set.
@@ -503,23 +1757,135 @@ def is_highscore_new_best(
         The highscore to check.
     :param all_highscores:
         The list of highscores to check against. May or may not include the
-        highscore being checked.
+        highscore being checked. If not given, the player's cached personal
+        best in the local DB is checked against.
+    :return:
+        If a new highscore was set, return which category it was set in. If not,
+        return None.
+    """
+    if all_highscores is None:
+        best = LocalHighscoresDB().get_personal_best(highscore, highscore.name)
+    else:
+        name = highscore.name.lower()
+        best = _get_personal_best(h for h in all_highscores if h.name.lower() == name)
+    return compare_with_personal_best(highscore, best)
+
+
+def compare_with_personal_best(
+    highscore: HighscoreStruct, best: Optional[Tuple[float, float]]
+) -> Optional[str]:
+    """
+    Test to see if a highscore is a new personal best.
+
+    :param highscore:
+        The highscore to check.
+    :param best:
+        The player's best time and 3bv/s, or None if the player has no
+        highscores. May or may not include the highscore being checked.
     :return:
         If a new highscore was set, return which category it was set in. If not,
         return None.
     """
-    all_highscores = list(all_highscores)
-    top_time = filter_and_sort(all_highscores, "time", {"name": highscore.name})
-    top_3bvps = filter_and_sort(all_highscores, "3bv/s", {"name": highscore.name})
-    if not top_time or highscore.elapsed <= top_time[0].elapsed:
+    if best is None or highscore.elapsed <= best[0]:
         return "time"
-    elif not top_3bvps or highscore.bbbvps >= top_3bvps[0].bbbvps:
+    elif highscore.bbbvps >= best[1]:
         return "3bv/s"
     else:
         return None
 
 
-def _post_highscore_to_remote(highscore: HighscoreStruct):
-    """Send a highscore to the remote server to be added to the remote DB."""
-    logger.info("Posting highscore to remote")
-    requests.post(_REMOTE_POST_URL, json=attr.asdict(highscore), timeout=5)
+def _get_personal_best(
+    highscores: Iterable[HighscoreStruct],
+) -> Optional[_PersonalBest]:
+    """Get the best time and 3bv/s from an iterable of highscores."""
+    best = None
+    for h in highscores:
+        if best is None:
+            best = (h.elapsed, h.bbbvps)
+        else:
+            best = (min(best[0], h.elapsed), max(best[1], h.bbbvps))
+    return best
+
+
+def _lower_names(names: Optional[Iterable[str]]) -> Optional[Set[str]]:
+    """Normalise player names for case-insensitive matching."""
+    return None if names is None else {n.lower() for n in names}
+
+
+def _check_fields(fields: Optional[Sequence[str]]) -> Sequence[str]:
+    """
+    Check the given highscore fields are valid, defaulting to all fields.
+
+    :raise ValueError:
+        If an unrecognised field is given.
+    """
+    if not fields:
+        return tuple(_highscore_fields)
+    for field in fields:
+        if field not in _highscore_fields:
+            raise ValueError(f"Unrecognised highscore field: {field!r}")
+    return fields
+
+
+def _parse_order_by(
+    order_by: Optional[Sequence[str]], *, stable: bool = False
+) -> List[Tuple[str, bool]]:
+    """
+    Parse fields to sort by, each optionally prefixed with '-' for descending.
+
+    :param order_by:
+        The fields to sort by, defaulting to sorting by time.
+    :param stable:
+        Whether to add fields identifying a highscore to break ties, such that
+        the order is the same across paginated queries.
+    :return:
+        A list of field names and whether to sort descending.
+    :raise ValueError:
+        If an unrecognised field is given.
+    """
+    ret = []
+    for field in order_by or ["elapsed"]:
+        desc = field.startswith("-")
+        if desc:
+            field = field[1:]
+        _check_fields([field])
+        ret.append((field, desc))
+    if stable:
+        ordered = {field for field, _ in ret}
+        ret.extend((f, False) for f in _IDENTITY_FIELDS if f not in ordered)
+    return ret
+
+
+def _highscore_to_dict(row: Sequence, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Convert a row of highscore fields to a JSON-serialisable dictionary.
+
+    :param row:
+        The values of the fields, in order.
+    :param fields:
+        The fields in the row.
+    """
+    ret = dict(zip(fields, row))
+    if "difficulty" in ret:
+        ret["difficulty"] = Difficulty.from_str(ret["difficulty"]).value
+    if "drag_select" in ret:
+        ret["drag_select"] = bool(ret["drag_select"])
+    return ret
+
+
+def _get_remote_post_queue() -> PostQueue:
+    """
+    Get the queue of highscores to post to the remote server, stored in the
+    local DB, starting the worker on first use.
+    """
+    global _remote_post_queue
+    with _remote_post_queue_lock:
+        if _remote_post_queue is None:
+            _remote_post_queue = PostQueue(
+                LocalHighscoresDB().path,
+                _REMOTE_POST_URL,
+                batch_url=_REMOTE_BATCH_POST_URL,
+            )
+            _remote_post_queue.start()
+            atexit.register(_remote_post_queue.stop, timeout=1)
+        return _remote_post_queue
@@ -0,0 +1,128 @@
+# October 2026, Lewis Gaul
+
+"""
+Logging utilities.
+
+Per-click debug logging goes to a separate trace channel, under the logger
+named by TRACE_LOGGER_NAME, which is disabled by default to keep the cost of
+logging off the hot path of handling clicks.
+
+Exports
+-------
+.. data:: TRACE_LOGGER_NAME
+    The name of the parent logger of the trace channel.
+
+.. function:: configure_logging
+    Configure logging to file for the application.
+
+.. function:: get_trace_logger
+    Get a logger for the trace channel.
+
+.. function:: set_trace_enabled
+    Enable or disable the trace channel.
+
+.. function:: stop_background_logging
+    Stop background logging threads, flushing any queued log records.
+
+"""
+
+__all__ = (
+    "TRACE_LOGGER_NAME",
+    "configure_logging",
+    "get_trace_logger",
+    "set_trace_enabled",
+    "stop_background_logging",
+)
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import List, Optional
+
+from .types import PathLike
+
+
+TRACE_LOGGER_NAME = "minegauler.trace"
+
+_LOG_FORMAT = "%(asctime)s[%(levelname)s](%(name)s) %(message)s"
+
+_queue_listeners: List[logging.handlers.QueueListener] = []
+
+
+def get_trace_logger(name: str) -> logging.Logger:
+    """
+    Get a logger for the trace channel, for debug logging on hot paths.
+
+    :param name:
+        The name of the module the logger is for, typically __name__.
+    :return:
+        The logger, named under TRACE_LOGGER_NAME.
+    """
+    if name.startswith("minegauler."):
+        name = name[len("minegauler.") :]
+    return logging.getLogger(f"{TRACE_LOGGER_NAME}.{name}")
+
+
+def set_trace_enabled(enabled: bool) -> None:
+    """
+    Enable or disable debug logging on the trace channel.
+
+    :param enabled:
+        Whether to enable the trace channel.
+    """
+    logging.getLogger(TRACE_LOGGER_NAME).setLevel(
+        logging.DEBUG if enabled else logging.INFO
+    )
+
+
+def configure_logging(
+    filename: PathLike,
+    *,
+    level: int = logging.DEBUG,
+    trace: bool = False,
+    background: bool = True,
+) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure the root logger to log to file.
+
+    :param filename:
+        The file to log to.
+    :param level:
+        The log level.
+    :param trace:
+        Whether to enable the trace channel.
+    :param background:
+        Whether to write to file in a background thread, with log records
+        passed through a queue. See stop_background_logging(), which is called
+        at exit.
+    :return:
+        The queue listener if writing in the background, otherwise None.
+    """
+    file_handler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    set_trace_enabled(trace)
+    if not background:
+        logging.basicConfig(level=level, handlers=[file_handler])
+        return None
+    log_queue: queue.Queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    _queue_listeners.append(listener)
+    logging.basicConfig(
+        level=level, handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+    return listener
+
+
+@atexit.register
+def stop_background_logging() -> None:
+    """
+    Stop any background threads writing log records, flushing queued records.
+    """
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+# The trace channel is disabled by default.
+set_trace_enabled(False)
@@ -0,0 +1,262 @@
+# October 2026, Lewis Gaul
+
+"""
+Persistent queue of JSON payloads to POST to a remote server.
+
+Payloads are stored in a table of a local SQLite database, such that they
+survive restarts, and are sent by a single background worker thread using a
+pooled HTTP session. Multiple queued payloads are sent in a single request
+when the server provides a batch URL, and failed sends are retried with
+exponential backoff.
+
+Exports
+-------
+.. class:: PostQueue
+    A persistent queue of JSON payloads to POST.
+
+"""
+
+__all__ = ("PostQueue",)
+
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from .types import PathLike
+
+
+logger = logging.getLogger(__name__)
+
+_Payload = Dict[str, Any]
+
+
+class PostQueue:
+    """
+    A persistent queue of JSON payloads to POST to a remote server.
+
+    Payloads added with put() are stored in the database immediately, and are
+    only removed once they have been accepted by the server (or rejected with
+    a client error, in which case retrying would not help).
+    """
+
+    _TABLE_NAME = "post_queue"
+
+    # HTTP statuses indicating the batch URL is not supported by the server.
+    _BATCH_UNSUPPORTED_STATUSES = (404, 405)
+
+    def __init__(
+        self,
+        db_path: PathLike,
+        url: str,
+        *,
+        batch_url: Optional[str] = None,
+        max_batch: int = 50,
+        timeout: float = 5,
+        min_backoff: float = 1,
+        max_backoff: float = 300,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        :param db_path:
+            Path to the SQLite database to store queued payloads in.
+        :param url:
+            The URL to POST single payloads to.
+        :param batch_url:
+            Optionally, a URL to POST lists of payloads to.
+        :param max_batch:
+            The maximum number of payloads to send in one request.
+        :param timeout:
+            Timeout in seconds for each request.
+        :param min_backoff:
+            The delay in seconds before the first retry after a failure.
+        :param max_backoff:
+            The maximum delay in seconds between retries, which doubles after
+            each consecutive failure.
+        :param session:
+            Optionally, the HTTP session to use.
+        """
+        self._url = url
+        self._batch_url = batch_url
+        self._max_batch = max_batch
+        self._timeout = timeout
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._session = session if session is not None else requests.Session()
+        # The connection is shared with the worker thread, guarded by the lock.
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._TABLE_NAME} ("
+            f"id INTEGER PRIMARY KEY, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+        self._idle = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT COUNT(*) FROM {self._TABLE_NAME}")
+            return cursor.fetchone()[0]
+
+    def put(self, payload: _Payload) -> None:
+        """
+        Add a payload to the queue, waking the worker.
+
+        :param payload:
+            The JSON-serialisable payload.
+        """
+        data = json.dumps(payload)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    f"INSERT INTO {self._TABLE_NAME} (payload) VALUES (?)", (data,)
+                )
+            self._idle.clear()
+            self._wakeup.notify()
+
+    def start(self) -> None:
+        """Start the worker thread, if not already started."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="PostQueueWorker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker thread. Payloads not yet sent remain in the database.
+
+        :param timeout:
+            The maximum time in seconds to wait for the worker to finish.
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        with self._lock:
+            self._wakeup.notify()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def wait_until_empty(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the worker to send everything in the queue.
+
+        :param timeout:
+            The maximum time in seconds to wait.
+        :return:
+            Whether the queue was emptied.
+        """
+        return self._idle.wait(timeout)
+
+    # -------------------------------------------------------------------------
+    # Worker thread
+    # -------------------------------------------------------------------------
+    def _run(self) -> None:
+        logger.debug("Post queue worker started")
+        backoff = 0
+        while not self._stopping.is_set():
+            with self._lock:
+                batch = self._peek(self._max_batch)
+                if not batch:
+                    self._idle.set()
+                    if not self._stopping.is_set():
+                        self._wakeup.wait()
+                    continue
+            try:
+                self._send(batch)
+            except Exception as e:
+                backoff = min(max(backoff * 2, self._min_backoff), self._max_backoff)
+                if isinstance(e, requests.RequestException):
+                    logger.warning(
+                        "Failed to post %d queued item(s), retrying in %ss: %s",
+                        len(batch),
+                        backoff,
+                        e,
+                    )
+                else:
+                    logger.exception(
+                        "Unexpected error posting queued items, retrying in %ss",
+                        backoff,
+                    )
+                self._stopping.wait(backoff)
+            else:
+                backoff = 0
+        logger.debug("Post queue worker stopped")
+
+    def _peek(self, limit: int) -> List[Tuple[int, str]]:
+        """Get the oldest queued payloads, must be called with the lock held."""
+        cursor = self._conn.execute(
+            f"SELECT id, payload FROM {self._TABLE_NAME} ORDER BY id LIMIT ?",
+            (limit,),
+        )
+        return cursor.fetchall()
+
+    def _remove(self, ids: List[int]) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"DELETE FROM {self._TABLE_NAME} WHERE id=?", [(i,) for i in ids]
+                )
+
+    def _send(self, batch: List[Tuple[int, str]]) -> None:
+        """
+        Send a batch of queued payloads, removing them from the queue once sent.
+
+        If the server rejects a batch with a client error, the payloads are
+        posted singly so that only those rejected individually are dropped.
+
+        :raise requests.RequestException:
+            If sending fails and should be retried.
+        """
+        if self._batch_url and len(batch) > 1:
+            payloads = [json.loads(p) for _, p in batch]
+            response = self._post(self._batch_url, payloads)
+            if response.status_code in self._BATCH_UNSUPPORTED_STATUSES:
+                logger.info("Batch posting not supported by server, posting singly")
+                self._batch_url = None
+            elif response.ok:
+                self._remove([i for i, _ in batch])
+                return
+            else:
+                logger.warning(
+                    "Batch of %d payloads rejected by server with status %d, "
+                    "posting singly",
+                    len(batch),
+                    response.status_code,
+                )
+        for i, payload in batch:
+            response = self._post(self._url, json.loads(payload))
+            if not response.ok:
+                logger.error(
+                    "Dropping payload rejected by server with status %d: %s",
+                    response.status_code,
+                    payload,
+                )
+            self._remove([i])
+
+    def _post(self, url: str, payload: Any) -> requests.Response:
+        """
+        POST a payload, checking the response.
+
+        :return:
+            The response, which is successful, rejected as a client error, or
+            indicating the batch URL is not found.
+        :raise requests.RequestException:
+            If the request fails or gets a server error.
+        """
+        response = self._session.post(url, json=payload, timeout=self._timeout)
+        if response.status_code in self._BATCH_UNSUPPORTED_STATUSES:
+            if url == self._batch_url:
+                return response
+            response.raise_for_status()
+        elif not 400 <= response.status_code < 500:
+            response.raise_for_status()
+        return response
@@ -47,9 +47,8 @@ __all__ = (
 )
 
 import enum
-import functools
 import os
-from typing import Tuple, Type, Union
+from typing import Optional, Tuple, Type, Union
 
 
 PathLike = Union[str, bytes, os.PathLike]
@@ -65,14 +64,29 @@ CellContents_T = Union[Type["CellContents"], "CellContents"]
 class _NumericCellContentsMixin:
     """
     A mixin for numeric cell contents types, allowing adding and subtracting integers.
+
+    Instances are interned, with one instance for each number in the range
+    given by '_min_num' and '_max_num', created when the class is set up with
+    _intern_numeric_type().
     """
 
     char: str
+    num: int
+    code: int
+
+    _min_num: int
+    _max_num: int
+    _interned: Tuple["CellContents", ...]
 
-    def __init__(self, num):
+    def __new__(cls, num):
         if not isinstance(num, int):
             raise TypeError("Number should be an integer")
-        self.num = num
+        if not cls._min_num <= num <= cls._max_num:
+            raise ValueError(
+                f"Number for {cls.__name__} should be between {cls._min_num} and "
+                f"{cls._max_num}, got {num}"
+            )
+        return cls._interned[num - cls._min_num]
 
     def __repr__(self):
         return self.char + str(self.num)
@@ -91,9 +105,22 @@ class _NumericCellContentsMixin:
 
 
 class CellContents:
-    """Abstract base class for contents of a minesweeper board cell."""
+    """
+    Abstract base class for contents of a minesweeper board cell.
+
+    There is a single (interned) instance for each possible cell contents
+    value, so instances can be compared by identity. Each instance also has a
+    compact integer encoding in the range 0-255, given by the 'code' attribute,
+    which can be converted back using 'from_code()' or indexing into 'by_code'.
+    The encoding is laid out as follows:
+     - 0: Unclicked
+     - 1: UnclickedSunken
+     - 2-125: Mine, HitMine, Flag, WrongFlag, with 31 codes for each (1-31)
+     - 128-255: Num, with codes for 0-127 (Num(0).code is the lowest)
+    """
 
     char: str
+    code: int
 
     Unclicked = NotImplemented
     UnclickedSunken = NotImplemented
@@ -104,12 +131,14 @@ class CellContents:
     WrongFlag = NotImplemented
 
     items = NotImplemented
+    by_code = NotImplemented
+
+    _instance: "CellContents"
 
-    @functools.lru_cache(maxsize=None)
     def __new__(cls, *args):
         if cls is CellContents:
             raise TypeError("Base class should not be instantiated")
-        return super().__new__(cls)
+        return cls.__dict__["_instance"]
 
     def __str__(self):
         return repr(self)
@@ -117,6 +146,9 @@ class CellContents:
     def __repr__(self):
         return self.char
 
+    def __reduce__(self):
+        return CellContents.from_code, (self.code,)
+
     @staticmethod
     def from_char(char: str) -> CellContents_T:
         return NotImplemented  # Implemented below, after subclasses
@@ -125,6 +157,10 @@ class CellContents:
     def from_str(string: str) -> "CellContents":
         return NotImplemented  # Implemented below, after subclasses
 
+    @staticmethod
+    def from_code(code: int) -> "CellContents":
+        return NotImplemented  # Implemented below, after subclasses
+
     def is_type(self, item: CellContents_T) -> bool:
         if item in [self.Unclicked, self.UnclickedSunken]:
             return self is item
@@ -152,11 +188,6 @@ class _CellNum(_NumericCellContentsMixin, CellContents):
 
     char = ""
 
-    def __init__(self, num):
-        super().__init__(num)
-        if num < 0:
-            raise ValueError("Cell value cannot be negative")
-
 
 class _CellMineType(_NumericCellContentsMixin, CellContents):
     """Abstract base class for the number of a mine type in a cell."""
@@ -169,11 +200,6 @@ class _CellMineType(_NumericCellContentsMixin, CellContents):
             )
         return super().__new__(cls, num)
 
-    def __init__(self, num=1):
-        super().__init__(num)
-        if num < 1:
-            raise ValueError("Mine-type cell contents must represent one or more mines")
-
     def is_mine_type(self) -> bool:
         return True
 
@@ -202,6 +228,35 @@ class _CellWrongFlag(_CellFlag):
     char = "X"
 
 
+def _intern_singleton_type(cls: Type[CellContents], code: int) -> None:
+    """Create the single instance of a non-numeric cell contents type."""
+    obj = object.__new__(cls)
+    obj.code = code
+    cls._instance = obj
+
+
+def _intern_numeric_type(
+    cls: Type[CellContents], min_num: int, max_num: int, first_code: int
+) -> None:
+    """Create the instances of a numeric cell contents type."""
+    cls._min_num = min_num
+    cls._max_num = max_num
+    instances = []
+    for num in range(min_num, max_num + 1):
+        obj = object.__new__(cls)
+        obj.num = num
+        obj.code = first_code + num - min_num
+        instances.append(obj)
+    cls._interned = tuple(instances)
+
+
+_intern_singleton_type(_CellUnclicked, 0)
+_intern_singleton_type(_CellUnclickedSunken, 1)
+for _i, _cls in enumerate([_CellMine, _CellHitMine, _CellFlag, _CellWrongFlag]):
+    _intern_numeric_type(_cls, 1, 31, 2 + 31 * _i)
+_intern_numeric_type(_CellNum, 0, 127, 128)
+del _i, _cls
+
 # Make the base class act like an ADT, serving as the only external API.
 CellContents.Unclicked = _CellUnclicked()
 CellContents.UnclickedSunken = _CellUnclickedSunken()
@@ -222,6 +277,20 @@ CellContents.items = [
 ]
 
 
+def _make_code_table() -> Tuple[Optional[CellContents], ...]:
+    """Create the table of cell contents instances, indexed by their code."""
+    table = [None] * 256
+    for item in [CellContents.Unclicked, CellContents.UnclickedSunken]:
+        table[item.code] = item
+    for cls in CellContents.items[2:]:
+        for obj in cls._interned:
+            table[obj.code] = obj
+    return tuple(table)
+
+
+CellContents.by_code = _make_code_table()
+
+
 def _from_char(char: str) -> CellContents_T:
     """
     Get the class of mine-like cell contents using the character
@@ -249,8 +318,29 @@ def _from_str(string: str) -> CellContents:
         raise ValueError(f"Unknown cell contents representation {string!r}")
 
 
+def _from_code(code: int) -> CellContents:
+    """
+    Get the cell contents instance from its compact integer encoding.
+
+    :param code:
+        The integer encoding, as given by the 'code' attribute.
+    :return:
+        The cell contents instance.
+    :raise ValueError:
+        If the code does not correspond to any cell contents.
+    """
+    try:
+        item = CellContents.by_code[code]
+    except (IndexError, TypeError):
+        item = None
+    if item is None:
+        raise ValueError(f"Unknown cell contents code {code!r}")
+    return item
+
+
 CellContents.from_char = _from_char
 CellContents.from_str = _from_str
+CellContents.from_code = _from_code
 
 
 # ------------------------------------------------------------------------------
@@ -271,6 +361,11 @@ class Difficulty(str, enum.Enum):
     @classmethod
     def from_str(cls, value: Union[str, "Difficulty"]) -> "Difficulty":
         """Create an instance from a string representation."""
+        try:
+            # Fast path for an instance or the exact value.
+            return cls(value)
+        except ValueError:
+            pass
         if value.upper() in [x.name for x in cls]:
             value = value[0].upper()
         elif value.upper() in [x.value for x in cls]:
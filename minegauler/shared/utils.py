@@ -5,12 +5,18 @@ General utilities.
 
 Exports
 -------
+.. data:: FLAGGING_THRESHOLD
+    The proportion of mines flagged above which a game counts as 'flagging'.
+
 .. class:: AllOptsStruct
     A structure class containing all persisted options.
 
 .. class:: GUIOptsStruct
     A structure class containing persisted GUI options.
 
+.. class:: FlatGrid
+    Representation of a 2D array using flat, contiguous storage.
+
 .. class:: GameOptsStruct
     A structure class containing persisted game options.
 
@@ -35,7 +41,9 @@ Exports
 """
 
 __all__ = (
+    "FLAGGING_THRESHOLD",
     "AllOptsStruct",
+    "FlatGrid",
     "GUIOptsStruct",
     "GameOptsStruct",
     "Grid",
@@ -46,10 +54,22 @@ __all__ = (
     "write_settings_to_file",
 )
 
+import array
+import copy
+import functools
 import json
 import logging
 import time
-from typing import Any, Dict, Iterable, List
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Tuple,
+)
 
 import attr
 
@@ -60,6 +80,35 @@ from .types import CellImageType, Coord_T
 logger = logging.getLogger(__name__)
 
 
+def _format_rows(rows: Iterable[Iterable[Any]], mapping=None, cell_size=None) -> str:
+    """
+    Convert rows of a grid to a string in an aligned format, see Grid.__str__().
+    """
+    rows = [list(row) for row in rows]
+    # @@@LG Some attention please :)
+
+    # Use max length of object representation if no cell size given.
+    if cell_size is None:
+        cell_size = max([len(repr(obj)) for row in rows for obj in row])
+
+    cell = "{:>%d}" % cell_size
+    ret = ""
+    for row in rows:
+        for obj in row:
+            if isinstance(mapping, dict):
+                rep = str(mapping[obj]) if obj in mapping else repr(obj)
+            elif mapping is not None:
+                rep = str(mapping(obj))
+            else:
+                rep = repr(obj)
+            ret += cell.format(rep[:cell_size]) + " "
+        ret = ret[:-1]  # Remove trailing space
+        ret += "\n"
+    ret = ret[:-1]  # Remove trailing newline
+
+    return ret
+
+
 class Grid(list):
     """
     Grid representation using a list of lists (2D array).
@@ -111,28 +160,7 @@ class Grid(list):
             The size to display a grid cell as. Defaults to the maximum size of
             the representation of all the objects contained in the grid.
         """
-        # @@@LG Some attention please :)
-
-        # Use max length of object representation if no cell size given.
-        if cell_size is None:
-            cell_size = max([len(repr(obj)) for row in self for obj in row])
-
-        cell = "{:>%d}" % cell_size
-        ret = ""
-        for row in self:
-            for obj in row:
-                if isinstance(mapping, dict):
-                    rep = str(mapping[obj]) if obj in mapping else repr(obj)
-                elif mapping is not None:
-                    rep = str(mapping(obj))
-                else:
-                    rep = repr(obj)
-                ret += cell.format(rep[:cell_size]) + " "
-            ret = ret[:-1]  # Remove trailing space
-            ret += "\n"
-        ret = ret[:-1]  # Remove trailing newline
-
-        return ret
+        return _format_rows(self, mapping, cell_size)
 
     def __getitem__(self, key):
         if type(key) is tuple and len(key) == 2:
@@ -180,27 +208,33 @@ class Grid(list):
             for i in range(len(row)):
                 row[i] = item
 
-    def get_nbrs(self, coord: Coord_T, *, include_origin=False) -> Iterable[Coord_T]:
+    def get_nbrs(self, coord: Coord_T, *, include_origin=False) -> Tuple[Coord_T, ...]:
         """
-        Get a list of the coordinates of neighbouring cells.
+        Get the coordinates of neighbouring cells.
+
+        The result is shared between all grids of the same dimensions, see
+        _get_nbr_coord_table().
 
         Arguments:
         coord ((int, int), within grid boundaries)
             The coordinate to check.
         include_origin=False (bool)
-            Whether to include the original coordinate, coord, in the list.
+            Whether to include the original coordinate, coord, in the result.
 
-        Return: [(int, int), ...]
-            List of coordinates within the boundaries of the grid.
+        Return: ((int, int), ...)
+            Tuple of coordinates within the boundaries of the grid.
+
+        Raises:
+        KeyError
+            - The coordinate is not in the grid.
         """
-        x, y = coord
-        nbrs = []
-        for i in range(max(0, x - 1), min(self.x_size, x + 2)):
-            for j in range(max(0, y - 1), min(self.y_size, y + 2)):
-                nbrs.append((i, j))
-        if not include_origin:
-            nbrs.remove(coord)
-        return nbrs
+        return _get_nbr_coord_table(self.x_size, self.y_size)[coord][include_origin]
+
+    def iter_nbrs(self, coord: Coord_T, *, include_origin=False) -> Iterator[Coord_T]:
+        """
+        Iterate over the coordinates of neighbouring cells, see get_nbrs().
+        """
+        return iter(self.get_nbrs(coord, include_origin=include_origin))
 
     def copy(self):
         ret = Grid(self.x_size, self.y_size)
@@ -213,6 +247,214 @@ class Grid(list):
         return 0 <= x < self.x_size and 0 <= y < self.y_size
 
 
+# The number of grid sizes to cache coordinate and neighbour tables for.
+_GRID_CACHE_SIZE = 16
+
+
+@functools.lru_cache(maxsize=_GRID_CACHE_SIZE)
+def _get_index_coords(x_size: int, y_size: int) -> Tuple[Coord_T, ...]:
+    """Get the coordinates corresponding to each flat index of a grid."""
+    return tuple((i % x_size, i // x_size) for i in range(x_size * y_size))
+
+
+@functools.lru_cache(maxsize=_GRID_CACHE_SIZE)
+def _get_nbr_index_table(x_size: int, y_size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get the table of neighbouring flat indices for each index of a grid.
+
+    The table is shared between all grids of the same dimensions, so must not
+    be modified.
+    """
+    table = []
+    for y in range(y_size):
+        for x in range(x_size):
+            table.append(
+                tuple(
+                    j * x_size + i
+                    for j in range(max(0, y - 1), min(y_size, y + 2))
+                    for i in range(max(0, x - 1), min(x_size, x + 2))
+                    if (i, j) != (x, y)
+                )
+            )
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=_GRID_CACHE_SIZE)
+def _get_nbr_coord_table(
+    x_size: int, y_size: int
+) -> Dict[Coord_T, Tuple[Tuple[Coord_T, ...], Tuple[Coord_T, ...]]]:
+    """
+    Get the table of neighbouring coordinates for each coordinate of a grid,
+    both without and with the origin coordinate (at the end).
+
+    The table is shared between all grids of the same dimensions, so must not
+    be modified.
+    """
+    coords = _get_index_coords(x_size, y_size)
+    table = dict()
+    for coord, nbr_indices in zip(coords, _get_nbr_index_table(x_size, y_size)):
+        nbrs = tuple(coords[i] for i in nbr_indices)
+        table[coord] = (nbrs, nbrs + (coord,))
+    return table
+
+
+class FlatGrid:
+    """
+    Grid representation using flat, contiguous storage.
+
+    Cells can be accessed using (x, y) coordinates in the same way as with
+    Grid, or using integer indices into the flat storage, where the index of
+    coordinate (x, y) is y * x_size + x.
+
+    Attributes:
+    x_size (int > 0)
+        The number of columns.
+    y_size (int > 0)
+        The number of rows.
+    all_coords ([(int, int), ...])
+        List of all coordinates in the grid.
+    cells (list | array.array)
+        The flat storage of the grid's cells.
+    """
+
+    def __init__(
+        self,
+        x_size: int,
+        y_size: int,
+        *,
+        fill: Any = 0,
+        typecode: Optional[str] = None,
+    ):
+        """
+        Arguments:
+        x_size (int > 0)
+            The number of columns.
+        y_size (int > 0)
+            The number of rows.
+        fill=0 (object)
+            What to fill the grid with.
+        typecode=None (str | None)
+            If given, the typecode of an array.array to use for storage,
+            otherwise a list is used.
+        """
+        self.x_size: int = x_size
+        self.y_size: int = y_size
+        self.all_coords: List[Coord_T] = [
+            (x, y) for x in range(x_size) for y in range(y_size)
+        ]
+        self._typecode: Optional[str] = typecode
+        self.cells: MutableSequence = self._new_cells([fill]) * (x_size * y_size)
+
+    def __repr__(self):
+        return f"<{self.x_size}x{self.y_size} grid>"
+
+    def __str__(self, mapping=None, cell_size=None):
+        """See Grid.__str__()."""
+        return _format_rows(self.rows(), mapping, cell_size)
+
+    def __eq__(self, other):
+        if not isinstance(other, FlatGrid):
+            return NotImplemented
+        return (
+            self.x_size == other.x_size
+            and self.y_size == other.y_size
+            and list(self.cells) == list(other.cells)
+        )
+
+    __hash__ = None
+
+    def __getitem__(self, key: Coord_T):
+        x, y = key
+        if not (0 <= x < self.x_size and 0 <= y < self.y_size):
+            raise IndexError(f"Coordinate {key} out of range")
+        return self.cells[y * self.x_size + x]
+
+    def __setitem__(self, key: Coord_T, value):
+        x, y = key
+        if not (0 <= x < self.x_size and 0 <= y < self.y_size):
+            raise IndexError(f"Coordinate {key} out of range")
+        self.cells[y * self.x_size + x] = value
+
+    @classmethod
+    def from_2d_array(cls, array_):
+        """
+        Create an instance using a 2-dimensional array.
+
+        Arguments:
+        array_ ([[object, ...], ...])
+            The array to use in creating the grid instance.
+
+        Return: FlatGrid
+            The resulting grid.
+        """
+        grid = cls(len(array_[0]), len(array_))
+        grid.cells = grid._new_cells(obj for row in array_ for obj in row)
+        return grid
+
+    @property
+    def index_coords(self) -> Tuple[Coord_T, ...]:
+        """The coordinate corresponding to each index, shared between grids."""
+        return _get_index_coords(self.x_size, self.y_size)
+
+    @property
+    def nbr_indices(self) -> Tuple[Tuple[int, ...], ...]:
+        """The neighbouring indices of each index, shared between grids."""
+        return _get_nbr_index_table(self.x_size, self.y_size)
+
+    def index_of(self, coord: Coord_T) -> int:
+        """Get the flat index of a coordinate."""
+        x, y = coord
+        return y * self.x_size + x
+
+    def coord_of(self, index: int) -> Coord_T:
+        """Get the coordinate of a flat index."""
+        return self.index_coords[index]
+
+    def rows(self) -> List[MutableSequence]:
+        """Get a list of the rows of the grid."""
+        x_size = self.x_size
+        return [self.cells[j * x_size : (j + 1) * x_size] for j in range(self.y_size)]
+
+    def fill(self, item):
+        """
+        Fill the grid with a given object.
+
+        Arguments:
+        item (object)
+            The item to fill the grid with.
+        """
+        self.cells = self._new_cells([item]) * len(self.cells)
+
+    def get_nbrs(self, coord: Coord_T, *, include_origin=False) -> Tuple[Coord_T, ...]:
+        """See Grid.get_nbrs()."""
+        return _get_nbr_coord_table(self.x_size, self.y_size)[coord][include_origin]
+
+    def iter_nbrs(self, coord: Coord_T, *, include_origin=False) -> Iterator[Coord_T]:
+        """See Grid.iter_nbrs()."""
+        return iter(self.get_nbrs(coord, include_origin=include_origin))
+
+    def copy(self) -> "FlatGrid":
+        """
+        Create a copy of the grid, not sharing the cell storage. Subclasses
+        with mutable attributes of their own should extend this.
+        """
+        ret = copy.copy(self)
+        ret.all_coords = list(self.all_coords)
+        ret.cells = self._new_cells(self.cells)
+        return ret
+
+    def _new_cells(self, values: Iterable[Any]) -> MutableSequence:
+        """Create flat storage of the grid's type containing the given values."""
+        if self._typecode is None:
+            return list(values)
+        else:
+            return array.array(self._typecode, values)
+
+    def is_coord_in_grid(self, coord: Coord_T) -> bool:
+        x, y = coord
+        return 0 <= x < self.x_size and 0 <= y < self.y_size
+
+
 class StructConstructorMixin:
     """
     A mixin class adding methods for ways to create instances.
@@ -261,6 +503,7 @@ class GameOptsStruct(StructConstructorMixin):
     first_success: bool = True
     per_cell: int = 1
     lives: int = 1
+    no_guess: bool = False
 
 
 @attr.attrs(auto_attribs=True)
@@ -298,9 +541,13 @@ class AllOptsStruct(GameOptsStruct, GUIOptsStruct):
         return cls(**dict_)
 
 
+# The proportion of mines flagged above which a game counts as 'flagging'.
+FLAGGING_THRESHOLD = 0.1
+
+
 def is_flagging_threshold(proportion: float) -> bool:
     """Does the given proportion correspond to a board solved with 'flagging'?"""
-    return proportion > 0.1
+    return proportion > FLAGGING_THRESHOLD
 
 
 def read_settings_from_file():
@@ -9,14 +9,15 @@ import argparse
 import logging
 import os
 import sys
+from typing import Any, Callable, Hashable, Optional, Tuple
 
 import attr
-from flask import Flask, abort, jsonify, redirect, request
+from flask import Flask, Response, abort, redirect, request
 
 import bot
 from minegauler.shared import highscores as hs
 from minegauler.shared.types import Difficulty
-from server.utils import is_highscore_new_best
+from server.utils import is_highscore_new_best, record_new_highscore, response_cache
 
 from . import get_new_highscore_hooks
 
@@ -39,22 +40,71 @@ def api_v1_highscore():
     Perform any desired handling for each highscore (e.g. usage logging), and
     also perform special handling for new records (e.g. add to the remote DB).
     """
-    data = request.get_json()
-    # verify_highscore(data)  TODO
-    highscore = hs.HighscoreStruct.from_dict(data)
+    try:
+        highscore = _parse_highscore(request.get_json())
+    except ValueError as e:
+        logger.warning("Rejecting invalid highscore: %s", e)
+        return str(e), 400
     logger.debug("POST highscore: %s", highscore)
+    try:
+        _handle_new_highscore(highscore)
+    except hs.DBConnectionError as e:
+        return str(e), 503
+    return "", 200
+
+
+@app.route("/api/v1/highscores", methods=["POST"])
+def api_v1_highscores_post():
+    """
+    Notification of a batch of new highscores being set, as a list.
+
+    Each highscore is handled as for the single highscore endpoint. If
+    handling fails the remaining highscores are not handled, and the client
+    is expected to retry the whole batch, with highscores that were already
+    stored being skipped. The whole batch is rejected if any highscore is
+    invalid.
+    """
+    data = request.get_json()
+    try:
+        if not isinstance(data, list):
+            raise ValueError("Expected a list of highscores")
+        highscores = [_parse_highscore(d) for d in data]
+    except ValueError as e:
+        logger.warning("Rejecting invalid highscores batch: %s", e)
+        return str(e), 400
+    logger.debug("POST %d highscores", len(highscores))
+    try:
+        for highscore in highscores:
+            _handle_new_highscore(highscore)
+    except hs.DBConnectionError as e:
+        return str(e), 503
+    return "", 200
+
 
+def _handle_new_highscore(highscore: hs.HighscoreStruct) -> None:
+    """
+    Handle a new highscore, adding it to the remote DB if it's a new best.
+
+    :raise DBConnectionError:
+        If inserting into the remote DB fails.
+    """
     new_best = is_highscore_new_best(highscore)
     if new_best is None:
         logger.debug("Not a new best, ignoring the highscore")
-        return "", 200
+        return
 
+    db = hs.RemoteHighscoresDB()
     try:
-        hs.RemoteHighscoresDB().insert_highscore(highscore)
-    except hs.DBConnectionError as e:
+        # Retried posts may contain highscores that were already stored.
+        if db.has_highscore(highscore):
+            logger.debug("Highscore already stored, ignoring")
+            return
+        db.insert_highscore(highscore)
+    except hs.DBConnectionError:
         logger.exception("Failed to insert highscore into remote DB")
         # TODO: I want to know if this is hit!
-        return str(e), 503
+        raise
+    record_new_highscore(highscore)
 
     for func in get_new_highscore_hooks():
         try:
@@ -62,64 +112,276 @@ def api_v1_highscore():
         except BaseException:
             logger.exception(f"Error in 'new highscore' hook {func.__name__}()")
 
-    return "", 200
+
+# Types of each highscore field in a posted highscore.
+_HIGHSCORE_FIELD_TYPES = {
+    "difficulty": str,
+    "per_cell": int,
+    "drag_select": (bool, int),
+    "name": str,
+    "timestamp": int,
+    "elapsed": (int, float),
+    "bbbv": int,
+    "bbbvps": (int, float),
+    "flagging": (int, float),
+}
+
+
+def _parse_highscore(data: Any) -> hs.HighscoreStruct:
+    """
+    Parse a posted highscore.
+
+    :raise ValueError:
+        If the highscore is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected highscore to be an object")
+    for field, types in _HIGHSCORE_FIELD_TYPES.items():
+        if field not in data:
+            raise ValueError(f"Missing highscore field {field!r}")
+        # Note that bool is a subclass of int.
+        if not isinstance(data[field], types) or (
+            isinstance(data[field], bool) and field != "drag_select"
+        ):
+            raise ValueError(f"Invalid type for highscore field {field!r}")
+    if not data["name"]:
+        raise ValueError("Empty highscore name")
+    highscore = hs.HighscoreStruct.from_dict(data)
+    if highscore.difficulty is Difficulty.CUSTOM:
+        raise ValueError("No highscores for custom difficulty")
+    return attr.evolve(highscore, drag_select=bool(highscore.drag_select))
 
 
 @app.route("/api/v1/highscores", methods=["GET"])
 def api_v1_highscores():
-    """Provide a REST API to get highscores from the DB."""
+    """
+    Provide a REST API to get highscores from the DB.
+
+    As well as filters, accepts the following query args:
+     - fields: Comma-separated highscore fields to include.
+     - order_by: Comma-separated fields to sort by, each optionally prefixed
+       with '-' for descending order.
+     - limit: The maximum number of highscores to return.
+     - offset: The number of highscores to skip.
+    """
     logger.debug("GET highscores with args: %s", dict(request.args))
-    difficulty = request.args.get("difficulty")
-    if difficulty:
-        difficulty = Difficulty.from_str(difficulty)
-    per_cell = request.args.get("per_cell")
-    if per_cell:
-        per_cell = int(per_cell)
-    drag_select = request.args.get("drag_select")
-    if drag_select:
-        drag_select = bool(int(drag_select))
+    difficulty, per_cell, drag_select = _parse_settings_args()
     name = request.args.get("name")
-    return jsonify(
-        [
-            attr.asdict(h)
-            for h in hs.get_highscores(
+    fields, order_by, limit, offset = _parse_page_args()
+    key = (
+        "highscores",
+        difficulty,
+        per_cell,
+        drag_select,
+        name.lower() if name else None,
+        fields,
+        order_by,
+        limit,
+        offset,
+    )
+    try:
+        return _cached_json_response(
+            key,
+            lambda: hs.query_highscores(
                 hs.HighscoresDatabases.REMOTE,
                 drag_select=drag_select,
                 per_cell=per_cell,
                 difficulty=difficulty,
                 name=name,
-            )
-        ]
-    )
+                fields=fields,
+                order_by=order_by,
+                limit=limit,
+                offset=offset,
+            ),
+        )
+    except ValueError as e:
+        return str(e), 400
 
 
 @app.route("/api/v1/highscores/ranks", methods=["GET"])
 def api_v1_highscores_ranks():
-    """Provide a REST API to get highscores from the DB."""
+    """
+    Provide a REST API to get the best highscore for each player from the DB.
+
+    Accepts the same 'fields', 'limit' and 'offset' query args as
+    api_v1_highscores(), while 'order_by' must be either 'elapsed' or
+    '-bbbvps'.
+    """
     logger.debug("GET highscores with args: %s", dict(request.args))
-    difficulty = request.args.get("difficulty")
-    per_cell = request.args.get("per_cell")
-    drag_select = request.args.get("drag_select")
-    if not difficulty or not per_cell or not drag_select:
+    difficulty, per_cell, drag_select = _parse_settings_args()
+    if difficulty is None or per_cell is None or drag_select is None:
         abort(404)
-    difficulty = Difficulty.from_str(difficulty)
-    per_cell = int(per_cell)
-    drag_select = bool(int(drag_select))
-    return jsonify(
-        [
-            attr.asdict(h)
-            for h in hs.filter_and_sort(
-                hs.get_highscores(
-                    hs.HighscoresDatabases.REMOTE,
-                    drag_select=drag_select,
-                    per_cell=per_cell,
-                    difficulty=difficulty,
-                )
+    fields, order_by, limit, offset = _parse_page_args()
+    try:
+        sort_key = _RANK_SORT_KEYS[order_by]
+    except KeyError:
+        return f"Unsupported order for ranks: {','.join(order_by)}", 400
+    unknown = set(fields or ()) - attr.fields_dict(hs.HighscoreStruct).keys()
+    if unknown:
+        return f"Unrecognised highscore fields: {', '.join(sorted(unknown))}", 400
+    key = ("ranks", difficulty, per_cell, drag_select, fields, sort_key, limit, offset)
+    return _cached_json_response(
+        key,
+        lambda: [
+            {k: v for k, v in attr.asdict(h).items() if not fields or k in fields}
+            for h in hs.get_ranked_highscores(
+                hs.HighscoresDatabases.REMOTE,
+                drag_select=drag_select,
+                per_cell=per_cell,
+                difficulty=difficulty,
+                sort_key=sort_key,
+                limit=limit,
+                offset=offset,
+            )
+        ],
+    )
+
+
+@app.route("/api/v1/highscores/times", methods=["GET"])
+def api_v1_highscores_times():
+    """
+    Provide a REST API to get each player's best time, as a mapping of lower
+    case name to time.
+
+    Accepts 'per_cell' and 'drag_select' filters, and 'names' as a
+    comma-separated list of players to include. If 'difficulty' is given the
+    best time for that difficulty is returned, otherwise the combined time.
+    """
+    logger.debug("GET highscore times with args: %s", dict(request.args))
+    difficulty, per_cell, drag_select = _parse_settings_args()
+    names = _parse_names_arg()
+    key = ("times", difficulty, per_cell, drag_select, names)
+
+    def create():
+        if difficulty:
+            return hs.get_best_times(
+                hs.HighscoresDatabases.REMOTE,
+                difficulty=difficulty,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                names=names,
+            )
+        else:
+            return hs.get_combined_times(
+                hs.HighscoresDatabases.REMOTE,
+                per_cell=per_cell,
+                drag_select=drag_select,
+                names=names,
             )
-        ]
+
+    return _cached_json_response(key, create)
+
+
+@app.route("/api/v1/players", methods=["GET"])
+def api_v1_players():
+    """
+    Provide a REST API to get summary statistics for players, as a mapping of
+    lower case name to statistics.
+
+    Requires 'names' as a comma-separated list of players to include, players
+    without any highscores being omitted.
+    """
+    logger.debug("GET players with args: %s", dict(request.args))
+    names = _parse_names_arg()
+    if not names:
+        return "Expected player 'names'", 400
+    return _cached_json_response(
+        ("players", names),
+        lambda: {
+            name: attr.asdict(stats)
+            for name, stats in hs.get_player_stats(
+                hs.HighscoresDatabases.REMOTE, names=names
+            ).items()
+        },
     )
 
 
+# Map of 'order_by' query arg to ranking sort key.
+_RANK_SORT_KEYS = {None: "time", ("elapsed",): "time", ("-bbbvps",): "3bv/s"}
+
+
+def _parse_settings_args() -> Tuple[
+    Optional[Difficulty], Optional[int], Optional[bool]
+]:
+    """
+    Parse the 'difficulty', 'per_cell' and 'drag_select' query args, each
+    being None if not given, aborting the request if they're invalid.
+    """
+    difficulty = request.args.get("difficulty") or None
+    per_cell = request.args.get("per_cell") or None
+    drag_select = request.args.get("drag_select") or None
+    try:
+        if difficulty is not None:
+            difficulty = Difficulty.from_str(difficulty)
+        if per_cell is not None:
+            per_cell = int(per_cell)
+        if drag_select is not None:
+            drag_select = bool(int(drag_select))
+    except ValueError as e:
+        abort(400, f"Invalid highscore settings: {e}")
+    return difficulty, per_cell, drag_select
+
+
+def _parse_page_args() -> Tuple[
+    Optional[Tuple[str, ...]], Optional[Tuple[str, ...]], Optional[int], int
+]:
+    """
+    Parse the 'fields', 'order_by', 'limit' and 'offset' query args, aborting
+    the request if they're invalid.
+    """
+
+    def parse_int(arg: str) -> Optional[int]:
+        value = request.args.get(arg)
+        if value is None:
+            return None
+        try:
+            ret = int(value)
+        except ValueError:
+            ret = -1
+        if ret < 0:
+            abort(400, f"Expected non-negative integer for {arg!r}")
+        return ret
+
+    limit = parse_int("limit")
+    offset = parse_int("offset") or 0
+    return _parse_list_arg("fields"), _parse_list_arg("order_by"), limit, offset
+
+
+def _parse_list_arg(arg: str) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated query arg, returning None if not given."""
+    value = request.args.get(arg)
+    if not value:
+        return None
+    return tuple(x.strip() for x in value.split(","))
+
+
+def _parse_names_arg() -> Optional[Tuple[str, ...]]:
+    """Parse the 'names' query arg into a normalised tuple of player names."""
+    names = _parse_list_arg("names")
+    if names is None:
+        return None
+    return tuple(sorted({n.lower() for n in names}))
+
+
+def _cached_json_response(key: Hashable, create: Callable[[], Any]) -> Response:
+    """
+    Create a JSON response using the response cache, with an ETag such that
+    clients can make conditional requests using 'If-None-Match'.
+
+    :param key:
+        The normalised cache key for the request.
+    :param create:
+        Function to create the JSON-serialisable response data on a cache miss.
+    """
+    body, etag = response_cache.get(key, create)
+    logger.debug("Response cache stats: %s", response_cache.stats())
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Clients may store responses, but must revalidate them.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
 # ------------------------------------------------------------------------------
 # Webpage serving
 # ------------------------------------------------------------------------------
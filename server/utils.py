@@ -5,17 +5,130 @@ Server utils.
 
 """
 
-__all__ = ("is_highscore_new_best", "multiple_contexts")
+__all__ = (
+    "ResponseCache",
+    "is_highscore_new_best",
+    "multiple_contexts",
+    "record_new_highscore",
+    "response_cache",
+)
 
 import contextlib
-from typing import Optional
+import hashlib
+import json
+import threading
+import time as tm
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 
 from minegauler.shared import highscores as hs
 
 
+class ResponseCache:
+    """
+    In-process cache of JSON response bodies, with an ETag for each.
+
+    Entries expire after a TTL, and all entries are invalidated when the
+    underlying data changes, see invalidate().
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024):
+        """
+        :param ttl:
+            The time in seconds after which an entry expires.
+        :param max_entries:
+            The maximum number of entries, the oldest being evicted first.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # Map of key to (body, etag, expiry time).
+        self._entries: Dict[Hashable, Tuple[bytes, str, float]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, create: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Get a cached response body, creating it on a miss.
+
+        :param key:
+            The cache key, which should be normalised such that equivalent
+            requests have equal keys.
+        :param create:
+            Function to create the JSON-serialisable response data.
+        :return:
+            The JSON response body and its ETag.
+        """
+        now = tm.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self.hits += 1
+                return entry[:2]
+            self.misses += 1
+            generation = self._generation
+
+        body = json.dumps(create()).encode()
+        etag = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            # Don't store data read before an invalidation.
+            if generation == self._generation:
+                self._entries.pop(key, None)
+                if len(self._entries) >= self._max_entries:
+                    self._evict(now)
+                self._entries[key] = (body, etag, now + self._ttl)
+        return body, etag
+
+    def invalidate(self) -> None:
+        """Invalidate all entries."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _evict(self, now: float) -> None:
+        """Evict expired entries, or the oldest if none have expired."""
+        expired = [k for k, e in self._entries.items() if e[2] <= now]
+        for key in expired:
+            del self._entries[key]
+        if not expired:
+            del self._entries[next(iter(self._entries))]
+
+
+# Cache of responses for GET requests reading the remote DB, invalidated when
+#  a highscore is inserted, see record_new_highscore().
+response_cache = ResponseCache()
+
+# The server is the only writer to the remote DB, so it can cache each player's
+#  best highscores, see record_new_highscore().
+_personal_best_cache = hs.PersonalBestCache()
+
+
 def is_highscore_new_best(h: hs.HighscoreStruct) -> Optional[str]:
-    all_highscores = hs.get_highscores(hs.HighscoresDatabases.REMOTE, settings=h)
-    return hs.is_highscore_new_best(h, all_highscores)
+    best = _personal_best_cache.get(
+        h, h.name, lambda: hs.RemoteHighscoresDB().get_personal_best(h, h.name)
+    )
+    return hs.compare_with_personal_best(h, best)
+
+
+def record_new_highscore(h: hs.HighscoreStruct) -> None:
+    """
+    Record a highscore that has been inserted into the remote DB, updating
+    caches.
+
+    :param h:
+        The highscore that was inserted.
+    """
+    _personal_best_cache.update(h)
+    response_cache.invalidate()
 
 
 # TODO: Move to super-shared location.
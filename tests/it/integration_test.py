@@ -61,6 +61,7 @@ class TestMain:
     @classmethod
     def teardown_class(cls):
         """Undo class setup."""
+        cls.ctrlr.shutdown()
 
     def test_setup(self):
         """Test the setup is sane."""
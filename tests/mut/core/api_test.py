@@ -0,0 +1,93 @@
+# October 2026, Lewis Gaul
+
+"""
+Test the api module.
+
+"""
+
+from unittest import mock
+
+import pytest
+
+from minegauler.core.api import AbstractListener, CellUpdates, _Notifier
+from minegauler.core.board import Board
+from minegauler.shared.types import CellContents
+
+
+class TestCellUpdates:
+    """Test the CellUpdates class."""
+
+    def test_mapping(self):
+        """Test the mapping interface and underlying arrays."""
+        updates = CellUpdates(Board(3, 2))
+        assert not updates
+        updates[(2, 1)] = CellContents.Num(3)
+        updates[(0, 0)] = CellContents.Flag(1)
+        updates[(2, 1)] = CellContents.Num(2)
+        assert len(updates) == 2
+        assert list(updates.indices) == [5, 0]
+        assert list(updates.codes) == [
+            CellContents.Num(2).code,
+            CellContents.Flag(1).code,
+        ]
+        assert list(updates) == [(2, 1), (0, 0)]
+        assert updates[(0, 0)] is CellContents.Flag(1)
+        assert (0, 0) in updates
+        assert (1, 1) not in updates
+        assert (3, 0) not in updates
+        assert updates == {(2, 1): CellContents.Num(2), (0, 0): CellContents.Flag(1)}
+        with pytest.raises(KeyError):
+            updates[(1, 1)]
+        with pytest.raises(KeyError):
+            updates[(3, 0)]
+        with pytest.raises(KeyError):
+            updates[(0, -1)]
+        assert (0, 2) not in updates
+
+    def test_copy(self):
+        """Test copies are unaffected by reuse of the original."""
+        updates = CellUpdates(Board(3, 2))
+        updates[(1, 1)] = CellContents.Num(1)
+        copied = updates.copy()
+        updates.clear()
+        updates[(0, 0)] = CellContents.Flag(1)
+        assert copied == {(1, 1): CellContents.Num(1)}
+        assert (0, 0) not in copied
+
+    def test_clear(self):
+        """Test clearing the updates for reuse."""
+        updates = CellUpdates(Board(3, 2))
+        updates[(1, 1)] = CellContents.Num(1)
+        updates.clear()
+        assert updates == {}
+        assert (1, 1) not in updates
+        updates[(0, 1)] = CellContents.Unclicked
+        assert dict(updates.items()) == {(0, 1): CellContents.Unclicked}
+
+
+class TestNotifier:
+    """Test the _Notifier class."""
+
+    def test_update_cells(self):
+        """Test compact updates are only passed to listeners accepting them."""
+        listener = mock.Mock(spec=AbstractListener)
+        compact_listener = mock.Mock(spec=AbstractListener)
+        compact_listener.compact_cell_updates = True
+        notif = _Notifier([listener, compact_listener])
+        updates = CellUpdates(Board(3, 2))
+        updates[(1, 0)] = CellContents.Num(1)
+
+        notif.update_cells(updates)
+        listener.update_cells.assert_called_once_with({(1, 0): CellContents.Num(1)})
+        assert type(listener.update_cells.call_args[0][0]) is dict
+        compact_listener.update_cells.assert_called_once_with(updates)
+        assert compact_listener.update_cells.call_args[0][0] is updates
+
+    def test_listener_error(self):
+        """Test errors raised by listeners are passed back to them."""
+        listener = mock.Mock(spec=AbstractListener)
+        exc = Exception("Error")
+        listener.update_cells.side_effect = exc
+        notif = _Notifier([listener])
+        notif.update_cells({(0, 0): CellContents.Num(0)})
+        listener.handle_exception.assert_called_once_with("update_cells", exc)
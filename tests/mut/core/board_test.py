@@ -7,6 +7,7 @@ Test the board module.
 
 import json
 from typing import List
+from unittest import mock
 
 import pytest
 
@@ -196,6 +197,83 @@ class TestMinefield:
         with pytest.raises(ValueError):
             Minefield(self.x, self.y, mines=mine_coords, per_cell=1)
 
+    @pytest.mark.parametrize(
+        "x_size, y_size, mines, per_cell",
+        [(8, 8, 10, 1), (30, 16, 99, 1), (16, 16, 60, 3), (5, 4, 0, 1)],
+    )
+    def test_bulk_build(self, x_size, y_size, mines, per_cell):
+        """Check the bulk build gives the same results as the regular build."""
+        for _ in range(5):
+            mf = Minefield(x_size, y_size, mines=mines, per_cell=per_cell)
+            ref_mf = Minefield(
+                x_size, y_size, mines=mf.mine_coords, per_cell=per_cell, bulk=False
+            )
+            assert mf.completed_board == ref_mf.completed_board
+            assert sorted(mf.openings) == sorted(ref_mf.openings)
+            assert mf.bbbv == ref_mf.bbbv
+
+    def test_copy(self):
+        """Check copies of a minefield don't share mutable state."""
+        mf = Minefield(self.x, self.y, mines=self.mines, per_cell=self.per_cell)
+        mf_copy = mf.copy()
+        assert isinstance(mf_copy, Minefield)
+        assert mf_copy == mf
+        assert mf_copy.mine_coords == mf.mine_coords
+        assert mf_copy.completed_board == mf.completed_board
+        assert mf_copy.openings == mf.openings
+        assert mf_copy.opening_index == mf.opening_index
+        assert mf_copy.bbbv == mf.bbbv
+
+        mf_copy[(0, 0)] += 1
+        mf_copy.mine_coords.append((0, 0))
+        mf_copy.completed_board[(0, 0)] = CellContents.Flag(1)
+        mf_copy.opening_index[0] = 0
+        if mf_copy.openings:
+            mf_copy.openings[0].append((0, 0))
+        ref_mf = Minefield(self.x, self.y, mines=mf.mine_coords, per_cell=self.per_cell)
+        assert mf == ref_mf
+        assert mf.mine_coords == ref_mf.mine_coords
+        assert mf.completed_board == ref_mf.completed_board
+        assert mf.openings == ref_mf.openings
+        assert mf.opening_index == ref_mf.opening_index
+
+    def test_generate_many(self):
+        """Check generating a stream of minefields."""
+        mfs = Minefield.generate_many(
+            3, self.x, self.y, self.mines, self.per_cell, seed=1
+        )
+        assert not isinstance(mfs, list)
+        mfs = list(mfs)
+        assert len(mfs) == 3
+        for mf in mfs:
+            self.check_mf_created(mf)
+            assert mf.nr_mines == self.mines
+
+        # Reproducible for a given seed, without touching global random state.
+        with mock.patch("random.shuffle") as mock_shuffle, mock.patch(
+            "random.sample"
+        ) as mock_sample:
+            again = list(
+                Minefield.generate_many(
+                    3, self.x, self.y, self.mines, self.per_cell, seed=1
+                )
+            )
+        mock_shuffle.assert_not_called()
+        mock_sample.assert_not_called()
+        assert [mf.mine_coords for mf in again] == [mf.mine_coords for mf in mfs]
+
+        # Safe coords and endless streams.
+        safe_coords = [(0, 0), (0, 1), (1, 0), (1, 1)]
+        stream = Minefield.generate_many(
+            None, self.x, self.y, 7, safe_coords=safe_coords, seed=2
+        )
+        for _, mf in zip(range(20), stream):
+            assert not set(mf.mine_coords) & set(safe_coords)
+
+        # Errors are raised eagerly.
+        with pytest.raises(ValueError):
+            Minefield.generate_many(1, self.x, self.y, self.x * self.y)
+
     def test_stringify(self):
         """Get coverage of stringify methods."""
         mf = Minefield(self.x, self.y, mines=self.mines, per_cell=self.per_cell)
@@ -230,6 +308,12 @@ class TestMinefield:
                 if mf[c] == CellContents.Num(0)
             ]
         )
+        # Check the opening index is consistent with the openings.
+        for c in mf.all_coords:
+            if mf.completed_board[c] is CellContents.Num(0):
+                assert c in mf.get_opening(c)
+            else:
+                assert mf.get_opening(c) is None
         for c in mf.all_coords:
             if c in mf.mine_coords:
                 assert mf[c] > 0
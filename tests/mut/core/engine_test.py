@@ -7,14 +7,24 @@ The game and board modules are treated as trusted.
 
 """
 
+import json
 import logging
+import random
+import time
 from unittest import mock
 
 import pytest
 
 from minegauler.core import api
 from minegauler.core.board import Board, Minefield
-from minegauler.core.engine import BaseController, _CreateController, _GameController
+from minegauler.core.engine import (
+    BaseController,
+    LatencyHistogram,
+    LatencyStats,
+    _CreateController,
+    _GameController,
+    _MinefieldPool,
+)
 from minegauler.core.game import Game
 from minegauler.shared.types import CellContents, Difficulty, GameState, UIMode
 from minegauler.shared.utils import GameOptsStruct, Grid
@@ -62,6 +72,17 @@ class TestGameController:
         assert ctrlr._game.mf is None
         assert ctrlr._game.board == Board(self.opts.x_size, self.opts.y_size)
 
+    @mock.patch("minegauler.core.noguess.start_worker_pool")
+    def test_create_no_guess(self, mock_start_pool):
+        """Test no-guess generation workers are started with the game."""
+        _GameController(self.opts, notif=mock.Mock())
+        mock_start_pool.assert_not_called()
+        opts = self.opts.copy()
+        opts.no_guess = True
+        ctrlr = _GameController(opts, notif=mock.Mock())
+        mock_start_pool.assert_called_once_with()
+        assert ctrlr._game.no_guess
+
     def test_getters(self):
         """Test the getter methods."""
         ctrlr = self.create_controller()
@@ -715,6 +736,29 @@ class TestGameController:
         assert ctrlr._opts.first_success is False
         assert ctrlr._game.first_success is False
 
+    @mock.patch("minegauler.core.noguess.start_worker_pool")
+    def test_set_no_guess(self, mock_start_pool):
+        """Test the method to set the 'no guess' option."""
+        ctrlr = self.create_controller()
+        assert ctrlr.get_game_info().no_guess is False
+
+        # Normal toggle.
+        ctrlr.set_no_guess(True)
+        assert ctrlr._opts.no_guess is True
+        assert ctrlr._game.no_guess is True
+        assert ctrlr.get_game_info().no_guess is True
+        mock_start_pool.assert_called_once_with()
+
+        # During game.
+        ctrlr.select_cell((0, 0))
+        ctrlr.set_no_guess(False)
+        assert ctrlr._opts.no_guess is False
+        assert ctrlr._game.no_guess is True
+
+        # New games pick up the change.
+        ctrlr.new_game()
+        assert ctrlr._game.no_guess is False
+
     def test_set_per_cell(self):
         """Test the method to set the 'per cell' option."""
         opts = self.opts.copy()
@@ -992,6 +1036,15 @@ class TestCreateController:
         ctrlr.set_first_success(True)
         assert ctrlr.get_game_info().first_success is True
 
+    def test_set_no_guess(self):
+        """Test the method to set the 'no guess' option."""
+        ctrlr = self.create_controller()
+        assert ctrlr.get_game_info().no_guess is False
+
+        ctrlr.set_no_guess(True)
+        assert ctrlr._opts.no_guess is True
+        assert ctrlr.get_game_info().no_guess is True
+
         # No op.
         ctrlr.set_first_success(True)
         assert ctrlr.get_game_info().first_success is True
@@ -1057,6 +1110,113 @@ class TestCreateController:
         return _CreateController(opts, notif=mock.Mock())
 
 
+class TestMinefieldPool:
+    """Test the pool of pregenerated minefields."""
+
+    @pytest.fixture
+    def make_pool(self):
+        pools = []
+
+        def make(**kwargs) -> _MinefieldPool:
+            pool = _MinefieldPool(**kwargs)
+            pools.append(pool)
+            return pool
+
+        yield make
+        for pool in pools:
+            pool.stop()
+
+    @staticmethod
+    def wait_for_pool(pool: _MinefieldPool, count: int) -> None:
+        deadline = time.time() + 10
+        while len(pool._minefields) < count:
+            assert time.time() < deadline, "Timed out waiting for the pool to fill"
+            time.sleep(0.01)
+
+    def test_take(self, make_pool):
+        """Test taking minefields from the pool."""
+        pool = make_pool(size=3)
+        assert pool.take(8, 8, 10, 1, []) is None
+        pool.prepare(8, 8, 10, 1)
+        self.wait_for_pool(pool, 3)
+
+        # Settings must match.
+        assert pool.take(8, 8, 11, 1, []) is None
+        mf = pool.take(8, 8, 10, 1, [])
+        assert (mf.x_size, mf.y_size, mf.nr_mines, mf.per_cell) == (8, 8, 10, 1)
+        self.wait_for_pool(pool, 3)
+
+        # Only minefields compatible with the safe coords are given.
+        mine_coord = pool._minefields[0].mine_coords[0]
+        mf = pool.take(8, 8, 10, 1, [mine_coord])
+        assert mf is None or not mf.cell_contains_mine(mine_coord)
+
+        # Changing settings discards the pregenerated minefields.
+        pool.prepare(4, 4, 3, 2)
+        self.wait_for_pool(pool, 3)
+        assert pool.take(8, 8, 10, 1, []) is None
+        assert pool.take(4, 4, 3, 2, []).per_cell == 2
+
+    def test_refill_dense(self, make_pool):
+        """Test the pool keeps refilling when most minefields don't fit."""
+        pool = make_pool(size=3)
+        pool._rng = random.Random(0)
+        board_values = Difficulty.EXPERT.get_board_values()
+        safe_coords = Board(*board_values[:2]).get_nbrs((15, 8), include_origin=True)
+        pool.prepare(*board_values, 1)
+        taken = 0
+        for _ in range(30):
+            self.wait_for_pool(pool, 3)
+            before = list(pool._minefields)
+            mf = pool.take(*board_values, 1, safe_coords)
+            if mf is not None:
+                assert not any(mf.cell_contains_mine(c) for c in safe_coords)
+                taken += 1
+                checked = before[: before.index(mf) + 1]
+            else:
+                checked = before
+            # Minefields that were checked are never kept.
+            assert not {id(m) for m in checked} & {id(m) for m in pool._minefields}
+        assert taken >= 5
+
+    def test_stop(self, make_pool):
+        """Test stopping the background thread."""
+        pool = make_pool(size=2)
+        pool.stop()
+        pool.prepare(8, 8, 10, 1)
+        self.wait_for_pool(pool, 2)
+        thread = pool._thread
+        pool.stop()
+        assert not thread.is_alive()
+        assert pool.take(8, 8, 10, 1, []) is None
+
+        # Restarted by preparing again.
+        pool.prepare(8, 8, 10, 1)
+        self.wait_for_pool(pool, 2)
+
+    def test_game_controller(self, make_pool):
+        """Test the game controller uses the pool."""
+        pool = make_pool(size=1)
+        ctrlr = _GameController(GameOptsStruct(), notif=mock.Mock(), mf_pool=pool)
+        self.wait_for_pool(pool, 1)
+        pooled_mf = pool._minefields[0]
+        safe_coord = next(c for c in pooled_mf.all_coords if pooled_mf[c] == 0)
+        with mock.patch.object(pool, "take", return_value=pooled_mf) as mock_take:
+            ctrlr.new_game()
+            ctrlr.select_cell(safe_coord)
+        mock_take.assert_called_once_with(
+            8, 8, 10, 1, ctrlr._game.board.get_nbrs(safe_coord, include_origin=True)
+        )
+        assert ctrlr._game.mf is pooled_mf
+
+        # Falls back to generating a minefield.
+        with mock.patch.object(pool, "take", return_value=None):
+            ctrlr.new_game()
+            ctrlr.select_cell((0, 0))
+        assert ctrlr._game.mf is not None
+        assert ctrlr._game.mf.get_opening((0, 0))
+
+
 class TestBaseController:
     """
     Test the base controller class.
@@ -1093,6 +1253,12 @@ class TestBaseController:
         assert ctrlr._opts is not self.opts
         assert ctrlr._mode is UIMode.GAME
         assert ctrlr._active_ctrlr is game_ctrlr
+        ctrlr.shutdown()
+
+        # Without pregenerating minefields.
+        ctrlr = BaseController(self.opts, pregenerate_minefields=False)
+        assert ctrlr._mf_pool is None
+        ctrlr.shutdown()
 
     def test_delegated(self, game_ctrlr):
         """Test methods/properties that are delegated to the active ctrlr."""
@@ -1132,6 +1298,10 @@ class TestBaseController:
         game_ctrlr.set_first_success.assert_called_once_with(True)
         game_ctrlr.reset_mock()
 
+        ctrlr.set_no_guess(True)
+        game_ctrlr.set_no_guess.assert_called_once_with(True)
+        game_ctrlr.reset_mock()
+
         ctrlr.set_per_cell(2)
         game_ctrlr.set_per_cell.assert_called_once_with(2)
         game_ctrlr.reset_mock()
@@ -1182,3 +1352,70 @@ class TestBaseController:
         assert ctrlr._active_ctrlr is game_ctrlr
         game_ctrlr.load_minefield.assert_called_once_with("file")
         game_ctrlr.reset_mock()
+
+
+class TestLatencyStats:
+    """Test recording latency stats of controller actions."""
+
+    def test_histogram(self):
+        """Test the latency histogram."""
+        hist = LatencyHistogram()
+        assert hist.percentile(50) == 0
+        for latency in [5e-6, 15e-6, 15e-6, 1e-3, 100]:
+            hist.add(latency)
+        assert hist.count == 5
+        assert hist.max == 100
+        assert hist.mean == pytest.approx((5e-6 + 30e-6 + 1e-3 + 100) / 5)
+        assert hist.percentile(20) == 10e-6
+        assert hist.percentile(60) == 20e-6
+        assert hist.percentile(80) == 1.28e-3
+        assert hist.percentile(100) == 100
+        assert sum(hist.to_dict()["counts"]) == 5
+
+    def test_controller(self, tmpdir):
+        """Test recording stats on the base controller."""
+        ctrlr = BaseController(GameOptsStruct(x_size=4, y_size=5, mines=3))
+        listener = mock.Mock()
+        ctrlr.register_listener(listener)
+        assert ctrlr.get_latency_stats() is None
+        with pytest.raises(RuntimeError):
+            ctrlr.dump_latency_stats(tmpdir / "stats.json")
+        ctrlr.select_cell((0, 0))
+
+        ctrlr.enable_latency_stats()
+        ctrlr.new_game()
+        ctrlr.select_cell((0, 0))
+        ctrlr.flag_cell((0, 0))
+        ctrlr.restart_game()
+        stats = ctrlr.get_latency_stats()
+        for action in ["new_game", "select_cell", "flag_cell", "restart_game"]:
+            for part in LatencyStats.parts:
+                hist = stats.get("4x5/3", action, part)
+                assert hist.count == 1
+                assert sum(hist.counts) == 1
+                assert 0 <= hist.mean <= hist.max
+                assert (
+                    0
+                    <= hist.percentile(50)
+                    <= hist.percentile(90)
+                    <= hist.percentile(99)
+                    <= hist.max
+                )
+        assert stats.get("4x5/3", "chord_on_cell", "logic").count == 0
+
+        ctrlr.dump_latency_stats(tmpdir / "stats.json")
+        with open(tmpdir / "stats.json") as f:
+            data = json.load(f)
+        assert data["4x5/3"]["select_cell"]["dispatch"]["count"] == 1
+
+        # Recorded stats are kept but not added to while disabled.
+        ctrlr.enable_latency_stats(False)
+        ctrlr.new_game()
+        assert ctrlr.get_latency_stats() is stats
+        assert stats.get("4x5/3", "new_game", "logic").count == 1
+        ctrlr.enable_latency_stats()
+        ctrlr.new_game()
+        assert ctrlr.get_latency_stats() is stats
+        assert stats.get("4x5/3", "new_game", "logic").count == 2
+        ctrlr.shutdown()
+
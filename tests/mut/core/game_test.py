@@ -7,6 +7,7 @@ Test the game module.
 
 import logging
 import math
+import random
 import time
 from unittest import mock
 
@@ -186,6 +187,78 @@ class TestGame:
         assert game.get_rem_3bv() == 0
         assert game.get_prop_complete() == 1
 
+    @mock.patch.object(Game, "debug_checks", True)
+    @pytest.mark.parametrize("per_cell", [1, 2])
+    def test_rem_3bv_tracking(self, per_cell):
+        """Test the tracked remaining 3bv matches a full calculation."""
+        rng = random.Random(0)
+        for mf in Minefield.generate_many(
+            20, 10, 8, 15, per_cell=per_cell, seed=per_cell
+        ):
+            game = Game(minefield=mf, lives=3)
+            coords = list(mf.all_coords)
+            while not game.state.finished():
+                coord = rng.choice(coords)
+                action = rng.random()
+                if action < 0.15:
+                    game.set_cell_flags(coord, 1 if mf[coord] == 0 else 0)
+                elif action < 0.3:
+                    game.chord_on_cell(coord)
+                else:
+                    game.select_cell(coord)
+                if game.state is GameState.ACTIVE:
+                    assert game.get_rem_3bv() == game._calc_rem_3bv()
+
+    def test_reveal_opening(self):
+        """Test revealing an opening directly matches propagating it."""
+        for mf in Minefield.generate_many(10, 16, 16, 30, seed=0):
+            coord = next(c for c in mf.all_coords if mf.get_opening(c))
+            game = Game(minefield=mf)
+            game.select_cell(mf.get_opening(coord)[-1])  # Maybe an edge cell
+            game.select_cell(coord)
+            ref_game = Game(minefield=mf)
+            ref_game.select_cell(mf.get_opening(coord)[-1])
+            ref_game._reveal_blocked_opening(coord)
+            assert game.board == ref_game.board
+
+    def test_compact_updates(self):
+        """Test compact cell updates match the dictionary format."""
+        rng = random.Random(0)
+        for mf in Minefield.generate_many(5, 10, 8, 15, seed=0):
+            game = Game(minefield=mf, lives=3)
+            compact_game = Game(minefield=mf, lives=3, compact_updates=True)
+            coords = list(mf.all_coords)
+            while not game.state.finished():
+                coord = rng.choice(coords)
+                action = rng.random()
+                if action < 0.15:
+                    exp = game.set_cell_flags(coord, 1)
+                    updates = compact_game.set_cell_flags(coord, 1)
+                elif action < 0.3:
+                    exp = game.chord_on_cell(coord)
+                    updates = compact_game.chord_on_cell(coord)
+                else:
+                    exp = game.select_cell(coord)
+                    updates = compact_game.select_cell(coord)
+                assert list((updates or {}).items()) == list((exp or {}).items())
+            assert compact_game.board == game.board
+
+    @mock.patch.object(Game, "debug_checks", True)
+    def test_win_detection(self):
+        """Test the game is won exactly when the last safe cell is revealed."""
+        for mf in Minefield.generate_many(10, 8, 8, 10, seed=0):
+            game = Game(minefield=mf)
+            safe_coords = [c for c in mf.all_coords if mf[c] == 0]
+            game.set_cell_flags(safe_coords[-1], 1)
+            for c in safe_coords:
+                game.select_cell(c)
+            assert game.state is GameState.ACTIVE
+            assert game._rem_safe_cells == 1
+            game.set_cell_flags(safe_coords[-1], 0)
+            game.select_cell(safe_coords[-1])
+            assert game.state is GameState.WON
+            assert game.board == mf.completed_board
+
     def test_empty_minefield(self):
         """Test game methods with an empty minefield."""
         game = Game(
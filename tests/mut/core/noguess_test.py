@@ -0,0 +1,76 @@
+# October 2026, Lewis Gaul
+
+"""
+Test the noguess module.
+
+The game, board and solver modules are treated as trusted.
+
+"""
+
+from unittest import mock
+
+import pytest
+
+from minegauler.core.board import Minefield
+from minegauler.core.game import Game
+from minegauler.core.noguess import generate_no_guess_minefield, is_no_guess
+from minegauler.shared.types import GameState
+
+
+def test_is_no_guess():
+    """Test checking whether minefields can be solved without guessing."""
+    mf = Minefield.from_2d_array(
+        [
+            # fmt: off
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 1],
+            # fmt: on
+        ]
+    )
+    assert is_no_guess(mf, (0, 0))
+    # A 50/50 in the middle.
+    mf = Minefield.from_2d_array(
+        [
+            # fmt: off
+            [0, 0, 0, 0],
+            [0, 0, 1, 0],
+            # fmt: on
+        ]
+    )
+    assert not is_no_guess(mf, (0, 0))
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_generate(processes):
+    """Test generating a no-guess minefield, in process and in a pool."""
+    mf = generate_no_guess_minefield(
+        10, 10, 20, start=(5, 5), timeout=30, processes=processes, seed=0
+    )
+    assert mf.nr_mines == 20
+    assert not mf.cell_contains_mine((5, 5))
+    assert is_no_guess(mf, (5, 5))
+
+
+def test_generate_timeout():
+    """Test None is returned when no minefield is found in time."""
+    with mock.patch("minegauler.core.noguess.is_no_guess", return_value=False):
+        mf = generate_no_guess_minefield(
+            8, 8, 10, start=(0, 0), timeout=0.1, processes=0
+        )
+    assert mf is None
+
+
+def test_game_no_guess():
+    """Test a no-guess game, falling back to a safe start when none is found."""
+    game = Game(x_size=8, y_size=8, mines=10, no_guess=True)
+    game.select_cell((3, 3))
+    assert game.state is not GameState.LOST
+    assert is_no_guess(game.mf, (3, 3))
+
+    game = Game(x_size=8, y_size=8, mines=10, no_guess=True)
+    with mock.patch(
+        "minegauler.core.noguess.generate_no_guess_minefield", return_value=None
+    ):
+        game.select_cell((3, 3))
+    assert game.mf.get_opening((3, 3))
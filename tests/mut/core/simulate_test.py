@@ -0,0 +1,100 @@
+# October 2026, Lewis Gaul
+
+"""
+Test the simulate module.
+
+The game and board modules are treated as trusted.
+
+"""
+
+import logging
+import random
+
+from minegauler.core.game import Game
+from minegauler.core.simulate import Action, Simulator
+from minegauler.shared.types import CellContents, GameState
+
+
+class TestSimulator:
+    """Test the Simulator class."""
+
+    def test_apply(self):
+        """Test applying batches of actions across games."""
+        sim = Simulator(3, 8, 8, 10, seed=0)
+        assert sim.stats.games_started == 3
+
+        results = sim.apply([(i, Action.SELECT, (0, 0)) for i in range(3)])
+        assert len(results) == 3
+        for i, updates in enumerate(results):
+            game = sim.games[i]
+            assert game.state.started()
+            assert len(updates) > 0
+            for idx, code in zip(updates[::2], updates[1::2]):
+                assert game.board[game.board.coord_of(idx)].code == code
+            assert sim.get_cells(i) is game.board.cells
+
+        # Flag and unflag an unclicked cell.
+        coord = next(
+            c
+            for c in sim.games[0].board.all_coords
+            if sim.games[0].board[c] is CellContents.Unclicked
+        )
+        (updates,) = sim.apply([(0, Action.FLAG, coord)])
+        assert list(updates) == [
+            sim.games[0].board.index_of(coord),
+            CellContents.Flag(1).code,
+        ]
+        (updates,) = sim.apply([(0, Action.FLAG, coord)])
+        assert len(updates) == 0  # max per cell
+        sim.apply([(0, Action.UNFLAG, coord)])
+        assert sim.games[0].board[coord] is CellContents.Unclicked
+
+        # Ignored actions give no updates.
+        (updates,) = sim.apply([(1, Action.SELECT, (0, 0))])
+        assert len(updates) == 0
+        assert sim.stats.actions == 7
+
+    def test_play_to_completion(self):
+        """Test playing games to completion, counting the results."""
+        rng = random.Random(0)
+        sim = Simulator(5, 6, 6, 8, seed=1)
+        while not all(s.finished() for s in sim.get_states()):
+            sim.apply(
+                [
+                    (i, Action.SELECT, (rng.randrange(6), rng.randrange(6)))
+                    for i, g in enumerate(sim.games)
+                    if not g.state.finished()
+                ]
+            )
+        assert sim.stats.games_finished == 5
+        assert sim.stats.games_won == sim.get_states().count(GameState.WON)
+        assert sim.stats.games_per_second > 0
+
+        sim.new_game(0)
+        assert sim.games[0].state is GameState.READY
+        assert sim.stats.games_started == 6
+
+    def test_reproducible(self):
+        """Test the minefields are reproducible for a given seed."""
+        mine_coords = []
+        for _ in range(2):
+            sim = Simulator(4, 8, 8, 10, seed=3)
+            sim.apply([(i, Action.SELECT, (3, 3)) for i in range(4)])
+            mine_coords.append([g.mf.mine_coords for g in sim.games])
+        assert mine_coords[0] == mine_coords[1]
+
+    def test_quiet(self, caplog):
+        """Test only the simulated games' logging is suppressed."""
+        caplog.set_level(logging.DEBUG)
+        sim = Simulator(1, 2, 1, 1, first_success=True, seed=0)
+        game = Game(x_size=2, y_size=1, mines=1, first_success=True)
+        sim.apply([(0, Action.SELECT, (0, 0))])
+        assert sim.games[0].state is GameState.WON
+        assert not caplog.records
+        game.select_cell((0, 0))
+        assert "Game won" in caplog.messages
+
+        sim = Simulator(1, 2, 1, 1, first_success=True, seed=0, quiet=False)
+        caplog.clear()
+        sim.apply([(0, Action.SELECT, (0, 0))])
+        assert "Game won" in caplog.messages
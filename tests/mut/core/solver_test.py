@@ -0,0 +1,127 @@
+# October 2026, Lewis Gaul
+
+"""
+Test the solver module.
+
+The game and board modules are treated as trusted.
+
+"""
+
+import itertools
+import random
+
+import pytest
+from pytest import approx
+
+from minegauler.core.board import Board, Minefield
+from minegauler.core.game import Game
+from minegauler.core.solver import InconsistentBoardError, Solver
+from minegauler.shared.types import CellContents
+
+
+def _brute_force_probs(board: Board, mines: int, per_cell: int):
+    """Calculate mine probabilities by enumerating all arrangements."""
+    num_code = CellContents.Num(0).code
+    slots = [
+        i for i, c in enumerate(board.cells) if c < num_code for _ in range(per_cell)
+    ]
+    total = 0
+    mine_weights = [0] * len(board.cells)
+    for combo in itertools.combinations(range(len(slots)), mines):
+        counts = [0] * len(board.cells)
+        for s in combo:
+            counts[slots[s]] += 1
+        if all(
+            sum(counts[j] for j in board.nbr_indices[i]) == c - num_code
+            for i, c in enumerate(board.cells)
+            if c >= num_code
+        ):
+            total += 1
+            for i, n in enumerate(counts):
+                if n:
+                    mine_weights[i] += 1
+    return [w / total for w in mine_weights]
+
+
+class TestSolver:
+    """Test the Solver class."""
+
+    def test_one_two_one(self):
+        """Test the classic 1-2-1 pattern."""
+        board = Board.from_2d_array(
+            [
+                # fmt: off
+                ["#", "#", "#"],
+                [ 1,   2,   1 ],
+                [ 0,   0,   0 ],
+                # fmt: on
+            ]
+        )
+        result = Solver(board, mines=2).solve()
+        assert result.safe == [(1, 0)]
+        assert result.mines == [(0, 0), (2, 0)]
+        assert result.probs[(1, 0)] == 0
+        assert result.probs[(0, 1)] == 0
+
+    def test_global_mine_count(self):
+        """Test the total number of mines is accounted for."""
+        board = Board.from_2d_array(
+            [
+                # fmt: off
+                ["#", "#", "#", "#"],
+                [ 1,   1,  "#", "#"],
+                # fmt: on
+            ]
+        )
+        # A single mine must be in the top left pair.
+        result = Solver(board, mines=1).solve()
+        assert sorted(result.safe) == [(2, 0), (2, 1), (3, 0), (3, 1)]
+        assert result.probs[(0, 0)] == approx(0.5)
+        # With more mines, the rest of the board shares them.
+        result = Solver(board, mines=2).solve()
+        assert sorted(result.safe) == [(2, 0), (2, 1)]
+        assert result.probs[(3, 1)] == approx(0.5)
+        result = Solver(board, mines=3).solve()
+        assert sorted(result.mines) == [(3, 0), (3, 1)]
+
+    @pytest.mark.parametrize("per_cell", [1, 2])
+    def test_matches_brute_force(self, per_cell):
+        """Test probabilities against enumerating all arrangements."""
+        rng = random.Random(per_cell)
+        for mf in Minefield.generate_many(15, 4, 4, 4, per_cell, seed=per_cell):
+            game = Game(minefield=mf, lives=100)
+            safe_coords = [c for c in mf.all_coords if mf[c] == 0]
+            for c in rng.sample(safe_coords, rng.randint(1, len(safe_coords) - 1)):
+                game.select_cell(c)
+            result = Solver(game.board, mf.nr_mines, per_cell).solve()
+            exp_probs = _brute_force_probs(game.board, mf.nr_mines, per_cell)
+            assert list(result.probs.cells) == approx(exp_probs)
+            for c in result.safe:
+                assert mf[c] == 0
+            for c in result.mines:
+                assert mf[c] > 0
+
+    def test_incremental(self):
+        """Test updating the solver gives the same result as solving afresh."""
+        for mf in Minefield.generate_many(5, 16, 16, 40, seed=0):
+            game = Game(minefield=mf)
+            solver = Solver(game.board, mf.nr_mines)
+            updates = game.select_cell(next(c for c in mf.all_coords if mf[c] == 0))
+            while not game.state.finished():
+                result = solver.update(updates)
+                fresh_result = Solver(game.board, mf.nr_mines).solve()
+                assert result == fresh_result
+                if not result.safe:
+                    break
+                updates = dict()
+                for c in result.safe:
+                    updates.update(game.select_cell(c) or {})
+
+    def test_inconsistent(self):
+        """Test an error is raised for an inconsistent board."""
+        board = Board.from_2d_array([["#", 2, 0]])
+        with pytest.raises(InconsistentBoardError):
+            Solver(board, mines=1).solve()
+        board = Board.from_2d_array([["#", 1, "#"]])
+        with pytest.raises(InconsistentBoardError):
+            Solver(board, mines=0).solve()
@@ -149,6 +149,16 @@ class TestMinegaulerGUI:
             shared.highscores.insert_highscore.assert_called_once_with(exp_highscore)
             mock_open.assert_called_once_with(mock.ANY, "3bv/s")
         save_hs_mock.stop()
+        self._reset_gui_mocks(gui)
+        shared.highscores.insert_highscore.reset_mock()
+
+        # No highscore is stored for no-guess games.
+        gui._ctrlr.get_game_info.return_value.no_guess = True
+        with mock.patch.object(gui, "open_highscores_window") as mock_open:
+            gui.update_game_state(GameState.WON)
+            gui._panel_widget.timer.set_time.assert_called_once_with(100)
+            shared.highscores.insert_highscore.assert_not_called()
+            mock_open.assert_not_called()
 
         # update_mines_remaining()
         gui.update_mines_remaining(56)
@@ -13,9 +13,10 @@ from PyQt5.QtCore import QEvent, QPoint, Qt
 from PyQt5.QtGui import QMouseEvent
 from pytestqt.qtbot import QtBot
 
-from minegauler.core import api
+from minegauler.core import Board, api
 from minegauler.frontend import state
 from minegauler.frontend.minefield import _RAISED_CELL, _SUNKEN_CELL, MinefieldWidget
+from minegauler.shared.types import CellContents
 
 from . import utils
 
@@ -187,6 +188,17 @@ class TestMinefieldWidget:
         click(pos=QPoint(mf_widget.width() - 1, 16))
         self.assert_cell_sank((self.state.x_size - 1, 1))
 
+    def test_update_cells_compact(self, mf_widget: MinefieldWidget):
+        """Test compact cell updates are copied to be stored."""
+        updates = api.CellUpdates(Board(self.state.x_size, self.state.y_size))
+        updates[(1, 2)] = CellContents.Num(3)
+        mf_widget.update_cells(updates)
+        mf_widget._set_cell_image.assert_called_with((1, 2), CellContents.Num(3))
+        updates.clear()
+        updates[(0, 0)] = CellContents.Flag(1)
+        ((_, stored),) = mf_widget.get_mouse_events()
+        assert stored == {(1, 2): CellContents.Num(3)}
+
     # --------------------------------------------------------------------------
     # Helper functions
     # --------------------------------------------------------------------------
@@ -0,0 +1,165 @@
+# October 2026, Lewis Gaul
+
+"""
+Tests for the database connection pool module.
+
+"""
+
+import sqlite3
+import threading
+import time as tm
+from unittest import mock
+
+import pytest
+
+from minegauler.shared.db_pool import ConnectionPool, PoolTimeoutError
+
+
+class _LostConnection(Exception):
+    pass
+
+
+@pytest.fixture
+def connect(tmp_path):
+    """Function to create SQLite connections to a temporary DB."""
+    path = tmp_path / "pool.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.close()
+    return mock.Mock(
+        side_effect=lambda: sqlite3.connect(str(path), check_same_thread=False)
+    )
+
+
+def _sqlite_check(conn: sqlite3.Connection) -> bool:
+    conn.execute("SELECT 1")
+    return True
+
+
+def test_reuse(connect):
+    """Test connections are reused, and shared by nested checkouts."""
+    pool = ConnectionPool(connect, max_size=2)
+    with pool.connection() as conn1:
+        assert pool.current_connection() is conn1
+        with pool.connection() as conn2:
+            assert conn2 is conn1
+        conn1.execute("INSERT INTO t VALUES (1)")
+        conn1.commit()
+    with pytest.raises(RuntimeError):
+        pool.current_connection()
+    with pool.connection() as conn3:
+        assert conn3 is conn1
+        assert conn3.execute("SELECT x FROM t").fetchall() == [(1,)]
+    assert connect.call_count == 1
+
+    metrics = pool.metrics()
+    assert metrics.size == 1
+    assert metrics.idle == 1
+    assert metrics.in_use == 0
+    assert metrics.checkouts == 2
+    assert metrics.created == 1
+
+
+def test_concurrent(connect):
+    """Test the pool is bounded under concurrent checkouts."""
+    pool = ConnectionPool(connect, max_size=3)
+    max_in_use = 0
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        nonlocal max_in_use
+        try:
+            for _ in range(20):
+                with pool.connection() as conn:
+                    with lock:
+                        max_in_use = max(max_in_use, pool.metrics().in_use)
+                    conn.execute("SELECT COUNT(*) FROM t").fetchall()
+                    tm.sleep(0.001)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert max_in_use <= 3
+    metrics = pool.metrics()
+    assert metrics.size <= 3
+    assert metrics.created <= 3
+    assert metrics.checkouts == 8 * 20
+    assert metrics.waits > 0
+
+
+def test_timeout(connect):
+    """Test timing out waiting for a connection."""
+    pool = ConnectionPool(connect, max_size=1, timeout=0.01)
+    checked_out = threading.Event()
+    done = threading.Event()
+
+    def hold():
+        with pool.connection():
+            checked_out.set()
+            done.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    checked_out.wait()
+    try:
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+    finally:
+        done.set()
+        thread.join()
+    with pool.connection():
+        pass
+
+
+def test_health_check(connect):
+    """Test idle connections failing a health check are replaced."""
+    pool = ConnectionPool(connect, check=_sqlite_check, check_after=0)
+    with pool.connection() as conn1:
+        pass
+    with pool.connection() as conn2:
+        assert conn2 is conn1
+    conn1.close()
+    with pool.connection() as conn3:
+        assert conn3 is not conn1
+        conn3.execute("SELECT 1")
+    metrics = pool.metrics()
+    assert metrics.failed_checks == 1
+    assert metrics.discarded == 1
+    assert metrics.size == 1
+
+
+def test_discard_on_disconnect(connect):
+    """Test connections are discarded on disconnection errors."""
+    pool = ConnectionPool(connect, discard_on=(_LostConnection,))
+    with pytest.raises(ValueError):
+        with pool.connection() as conn1:
+            raise ValueError
+    with pytest.raises(_LostConnection):
+        with pool.connection() as conn2:
+            assert conn2 is conn1
+            raise _LostConnection
+    with pool.connection() as conn3:
+        assert conn3 is not conn1
+    assert pool.metrics().discarded == 1
+    assert connect.call_count == 2
+
+
+def test_connect_error(connect):
+    """Test a failure to connect doesn't use up a slot in the pool."""
+    connect.side_effect = [sqlite3.OperationalError, connect.side_effect()]
+    pool = ConnectionPool(connect, max_size=1, timeout=0.01)
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection():
+            pass
+    assert pool.metrics().size == 0
+    with pool.connection():
+        pass
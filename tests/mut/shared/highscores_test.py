@@ -6,17 +6,31 @@ Tests for the highscores module.
 """
 
 import pathlib
+import sqlite3
 import tempfile
+import threading
 from unittest import mock
 
+import attr
+import mysql.connector
 import pytest
 
 from minegauler.shared.highscores import (
     HighscoresDatabases,
     HighscoreSettingsStruct,
     HighscoreStruct,
+    AbstractHighscoresDB,
+    DBConnectionError,
     LocalHighscoresDB,
+    PersonalBestCache,
+    PlayerStats,
+    RemoteHighscoresDB,
+    filter_and_sort,
+    get_best_times,
     get_highscores,
+    get_ranked_highscores,
+    is_highscore_new_best,
+    query_highscores,
 )
 from minegauler.shared.types import Difficulty
 
@@ -42,7 +56,7 @@ class TestLocalHighscoreDatabase:
         """Test creating a new highscores DB."""
         db = LocalHighscoresDB(tmp_local_db_path)
         assert db._path == tmp_local_db_path
-        assert db.get_db_version() == 0
+        assert db.get_db_version() == 2
         tables = list(
             db.execute(
                 "SELECT name FROM sqlite_master "
@@ -50,6 +64,54 @@ class TestLocalHighscoreDatabase:
             )
         )
         assert list(tables) == [("highscores",)]
+        assert db.extract_single_elem(db.execute("PRAGMA journal_mode")) == "wal"
+
+    def test_migrate_db(self, tmp_local_db_path):
+        """Test migrating a version 0 DB, which has no indexes."""
+        conn = sqlite3.connect(str(tmp_local_db_path))
+        conn.execute(LocalHighscoresDB._CREATE_TABLE_SQL)
+        # Duplicate highscores are removed.
+        for _ in range(2):
+            conn.execute(
+                "INSERT INTO highscores (difficulty, per_cell, drag_select, name, "
+                "timestamp, elapsed, bbbv, bbbvps, flagging) "
+                "VALUES ('B', 1, 0, 'NAME1', 1234, 3.0, 5, 1.56, 0.0)"
+            )
+        conn.commit()
+        conn.close()
+
+        db = LocalHighscoresDB(tmp_local_db_path)
+        assert db.get_db_version() == 2
+        assert db.count_highscores() == 1
+        indexes = {
+            r[0]
+            for r in db.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        assert indexes >= {
+            "settings_elapsed_idx",
+            "settings_bbbvps_idx",
+            "name_elapsed_idx",
+            "highscore_key_idx",
+        }
+
+        # The indexes are used for filtered queries.
+        def query_plan(**kwargs) -> str:
+            cmd, params = db._get_select_highscores_sql(fmt="?", **kwargs)
+            return str(list(db.execute("EXPLAIN QUERY PLAN " + cmd, params)))
+
+        assert "settings_elapsed_idx" in query_plan(
+            difficulty=Difficulty.BEGINNER, per_cell=1, drag_select=False
+        )
+        assert "name_elapsed_idx" in query_plan(name="name1")
+
+    def test_injection(self, tmp_local_db_path):
+        """Test filter values are passed as query parameters."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        db.insert_highscore(
+            HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 5, 1.56, 0.0)
+        )
+        assert db.get_highscores(name="x' OR '1'='1") == []
+        assert db.count_highscores() == 1
 
     def test_insert_count_get(self, tmp_local_db_path):
         """Test inserting, counting and getting highscores."""
@@ -67,15 +129,15 @@ class TestLocalHighscoreDatabase:
         assert db.get_highscores() == highscores
 
         # Multiple highscores
-        for hs in [
+        multiple = [
             HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 5, 1.56, 0.0),
             HighscoreStruct("B", 1, False, "NAME2", 1234, 3.11, 5, 1.56, 0.0),
             HighscoreStruct("B", 1, True, "NAME1", 1234, 3.22, 5, 1.56, 0.0),
             HighscoreStruct("B", 2, False, "NAME1", 1234, 3.33, 5, 1.56, 0.0),
             HighscoreStruct("I", 1, False, "NAME1", 1234, 3.44, 5, 1.56, 0.0),
-        ]:
-            db.insert_highscore(hs)
-            highscores.append(hs)
+        ]
+        db.insert_highscores(multiple)
+        highscores.extend(multiple)
         highscores.sort(key=lambda h: h.elapsed)
         assert db.count_highscores() == len(highscores)
         assert db.get_highscores() == highscores
@@ -106,6 +168,229 @@ class TestLocalHighscoreDatabase:
         # Case insensitive name match.
         assert db.get_highscores(name="SIWel g") == [my_hs]
 
+    @pytest.mark.parametrize("sort_key", ["time", "3bv/s"])
+    @pytest.mark.parametrize("name", [None, "name1"])
+    @pytest.mark.parametrize("flagging", [None, "F", "NF"])
+    def test_get_ranked(self, tmp_local_db_path, sort_key, name, flagging):
+        """Test ranking in SQL matches ranking in Python."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        for i, (name_, elapsed, bbbv, flag) in enumerate(
+            [
+                ("NAME1", 3.00, 5, 0.0),
+                ("name1", 2.50, 3, 0.5),
+                ("NAME2", 3.10, 8, 0.0),
+                ("NAME2", 3.10, 7, 0.2),
+                ("NAME3", 4.00, 9, 0.1),
+                ("NAME3", 5.00, 12, 0.0),
+            ]
+        ):
+            db.insert_highscore(
+                HighscoreStruct(
+                    "B", 1, False, name_, 1234 + i, elapsed, bbbv, bbbv / elapsed, flag
+                )
+            )
+        # Another settings group, which should be excluded.
+        db.insert_highscore(
+            HighscoreStruct("B", 2, False, "NAME1", 1234, 1.00, 5, 5.00, 0.0)
+        )
+        kwargs = dict(
+            difficulty=Difficulty.BEGINNER,
+            per_cell=1,
+            drag_select=False,
+            sort_key=sort_key,
+            name=name,
+            flagging=flagging,
+        )
+
+        ranked = db.get_ranked_highscores(**kwargs)
+        assert ranked
+        assert ranked == AbstractHighscoresDB.get_ranked_highscores(db, **kwargs)
+        if name is None:
+            assert len({h.name.lower() for h in ranked}) == len(ranked)
+
+        # Paging through the ranked highscores.
+        for limit, offset in [(1, 0), (2, 1), (None, 2), (5, 10)]:
+            end = offset + limit if limit is not None else None
+            page = db.get_ranked_highscores(**kwargs, limit=limit, offset=offset)
+            assert page == ranked[offset:end]
+            assert page == AbstractHighscoresDB.get_ranked_highscores(
+                db, **kwargs, limit=limit, offset=offset
+            )
+
+    def test_get_ranked_invalid(self, tmp_local_db_path):
+        """Test errors for invalid ranking arguments."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        with pytest.raises(ValueError):
+            db.get_ranked_highscores(sort_key="foo")
+        with pytest.raises(ValueError):
+            db.get_ranked_highscores(flagging="foo")
+        with pytest.raises(ValueError):
+            db.get_ranked_highscores(limit=-1)
+        with pytest.raises(ValueError):
+            AbstractHighscoresDB.get_ranked_highscores(db, offset=-1)
+
+    @pytest.mark.parametrize(
+        "fields, order_by, limit, offset",
+        [
+            (None, None, None, 0),
+            (["name", "elapsed"], ["-bbbvps"], 2, 0),
+            (["difficulty", "drag_select"], ["name", "-timestamp"], None, 2),
+            (["elapsed"], ["elapsed"], 1, 3),
+            (None, ["per_cell", "elapsed"], 10, 5),
+        ],
+    )
+    def test_query(self, tmp_local_db_path, fields, order_by, limit, offset):
+        """Test pagination and projection in SQL matches that in Python."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        for i, (name, cell, elapsed, bbbv) in enumerate(
+            [
+                ("NAME1", 1, 3.00, 5),
+                ("name1", 2, 2.50, 3),
+                ("NAME2", 1, 3.10, 8),
+                ("NAME2", 1, 3.20, 7),
+                ("NAME3", 2, 4.00, 9),
+                ("NAME3", 1, 5.00, 12),
+            ]
+        ):
+            db.insert_highscore(
+                HighscoreStruct(
+                    "B", cell, False, name, 1234 + i, elapsed, bbbv, bbbv / elapsed, 0
+                )
+            )
+        kwargs = dict(fields=fields, order_by=order_by, limit=limit, offset=offset)
+
+        result = db.query_highscores(**kwargs)
+        assert result == AbstractHighscoresDB.query_highscores(db, **kwargs)
+        assert len(result) == len(db.get_highscores()[offset:][:limit])
+        for row in result:
+            assert list(row) == (fields or list(row))
+            if "difficulty" in row:
+                assert row["difficulty"] == "B"
+            if "drag_select" in row:
+                assert row["drag_select"] is False
+
+    def test_query_pages_stable(self, tmp_local_db_path):
+        """Test pages don't overlap when highscores have equal sort values."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        for i in range(7):
+            db.insert_highscore(
+                HighscoreStruct("B", 1, False, f"NAME{i % 3}", 1240 - i, 3.0, 5, 1, 0)
+            )
+        pages = [
+            db.query_highscores(fields=["name", "timestamp"], limit=2, offset=i)
+            for i in range(0, 8, 2)
+        ]
+        rows = [row for page in pages for row in page]
+        assert len({(r["name"], r["timestamp"]) for r in rows}) == 7
+        assert [r["timestamp"] for r in rows] == sorted(r["timestamp"] for r in rows)
+        assert pages[1] == AbstractHighscoresDB.query_highscores(
+            db, fields=["name", "timestamp"], limit=2, offset=2
+        )
+
+    def test_query_invalid(self, tmp_local_db_path):
+        """Test errors for invalid query arguments."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        with pytest.raises(ValueError):
+            db.query_highscores(fields=["elapsed", "foo"])
+        with pytest.raises(ValueError):
+            db.query_highscores(order_by=["-elapsed; DROP TABLE highscores"])
+        with pytest.raises(ValueError):
+            db.query_highscores(order_by=["--elapsed"])
+        with pytest.raises(ValueError):
+            db.query_highscores(limit=-1)
+        with pytest.raises(ValueError):
+            db.query_highscores(offset=-1)
+
+    def test_has_highscore(self, tmp_local_db_path):
+        """Test checking whether a highscore is already stored."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        h = HighscoreStruct("B", 1, False, "NAME1", 1234, 3.0, 5, 1.67, 0)
+        assert not db.has_highscore(h)
+        db.insert_highscore(h)
+        assert db.has_highscore(h)
+        assert AbstractHighscoresDB.has_highscore(db, h)
+        assert not db.has_highscore(attr.evolve(h, timestamp=1235))
+        assert not db.has_highscore(attr.evolve(h, drag_select=True))
+        assert not AbstractHighscoresDB.has_highscore(db, attr.evolve(h, name="NAME2"))
+
+    def test_aggregates(self, tmp_local_db_path):
+        """Test aggregating player times and stats in SQL matches Python."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        for i, (diff, cell, drag, name, elapsed) in enumerate(
+            [
+                ("B", 1, False, "NAME1", 3.0),
+                ("B", 1, False, "name1", 2.5),
+                ("I", 1, False, "NAME1", 20.0),
+                ("E", 1, False, "NAME1", 80.0),
+                ("E", 2, True, "NAME1", 70.0),
+                ("B", 1, False, "NAME2", 4.0),
+                ("B", 2, False, "NAME2", 3.5),
+                ("M", 1, False, "NAME3", 200.0),
+            ]
+        ):
+            db.insert_highscore(
+                HighscoreStruct(diff, cell, drag, name, 1234 + i, elapsed, 5, 1, 0)
+            )
+
+        best_times = db.get_best_times(difficulty=Difficulty.BEGINNER, per_cell=1)
+        assert best_times == {"name1": 2.5, "name2": 4.0}
+        assert best_times == AbstractHighscoresDB.get_best_times(
+            db, difficulty=Difficulty.BEGINNER, per_cell=1
+        )
+        assert db.get_best_times(names=["Name2", "foo"]) == {"name2": 3.5}
+        assert db.get_best_times(names=[]) == {}
+
+        combined = db.get_combined_times()
+        assert combined == {"name1": 92.5, "name2": 2003.5}
+        assert combined == AbstractHighscoresDB.get_combined_times(db)
+        kwargs = dict(per_cell=1, drag_select=False, names=["NAME1", "name3"])
+        assert db.get_combined_times(**kwargs) == {"name1": 102.5}
+        assert db.get_combined_times(**kwargs) == (
+            AbstractHighscoresDB.get_combined_times(db, **kwargs)
+        )
+
+        names = ["NAME1", "name2", "name3", "name4"]
+        stats = db.get_player_stats(names)
+        assert stats == {
+            "name1": PlayerStats("name1", 92.5, 4, 1238),
+            "name2": PlayerStats("name2", 2003.5, 2, 1240),
+            "name3": PlayerStats("name3", 3000, 1, 1241),
+        }
+        assert stats == AbstractHighscoresDB.get_player_stats(db, names)
+        assert db.get_player_stats([]) == {}
+
+    def test_personal_best(self, tmp_local_db_path):
+        """Test getting a player's cached best time and 3bv/s."""
+        db = LocalHighscoresDB(tmp_local_db_path)
+        settings = HighscoreSettingsStruct.get_default()
+        assert db.get_personal_best(settings, "NAME1") is None
+
+        db.insert_highscore(
+            HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 5, 1.67, 0.0)
+        )
+        assert db.get_personal_best(settings, "name1") == (3.00, 1.67)
+        db.insert_highscore(
+            HighscoreStruct("B", 1, False, "name1", 1234, 4.00, 8, 2.00, 0.0)
+        )
+        db.insert_highscore(
+            HighscoreStruct("B", 2, False, "NAME1", 1234, 1.00, 5, 5.00, 0.0)
+        )
+        # Cached across instances, updated on insert.
+        db = LocalHighscoresDB(tmp_local_db_path)
+        with mock.patch.object(db, "execute") as mock_execute:
+            assert db.get_personal_best(settings, "NAME1") == (3.00, 2.00)
+        mock_execute.assert_not_called()
+        assert db.get_personal_best(settings, "NAME2") is None
+
+        # Cache is cleared when highscores are merged in.
+        merge_db = LocalHighscoresDB(tmp_local_db_path.parent / "merge-best.db")
+        merge_db.insert_highscore(
+            HighscoreStruct("B", 1, False, "NAME1", 1234, 2.00, 5, 2.50, 0.0)
+        )
+        db.merge_highscores(merge_db.path)
+        assert db.get_personal_best(settings, "NAME1") == (2.00, 2.50)
+        merge_db.path.unlink()
+
     def test_merge_db(self, tmpdir):
         """Test merging DBs together."""
         # Setup
@@ -150,6 +435,42 @@ class TestLocalHighscoreDatabase:
         assert merge_db.count_highscores() == len(merge_highscores)
         assert merge_db.get_highscores() == merge_highscores
 
+    def test_merge_db_chunked(self, tmpdir):
+        """Test merging DBs in chunks, reporting progress."""
+        base_db = LocalHighscoresDB(tmpdir / "merge-chunked-base.db")
+        merge_db = LocalHighscoresDB(tmpdir / "merge-chunked-from.db")
+        highscores = [
+            HighscoreStruct("B", 1, False, "NAME1", 1234 + i, 3.00, 5, 1.56, 0.0)
+            for i in range(10)
+        ]
+        for hs in highscores[:3]:
+            base_db.insert_highscore(hs)
+        for hs in highscores:
+            merge_db.insert_highscore(hs)
+
+        # The merge is atomic, nothing is added if it fails part way through.
+        with pytest.raises(RuntimeError):
+            base_db.merge_highscores(
+                merge_db.path,
+                chunk_size=4,
+                progress=mock.Mock(side_effect=[None, RuntimeError]),
+            )
+        assert base_db.count_highscores() == 3
+
+        progress = mock.Mock()
+        added = base_db.merge_highscores(merge_db.path, chunk_size=4, progress=progress)
+        assert added == 7
+        assert progress.call_args_list == [
+            mock.call(4, 10),
+            mock.call(8, 10),
+            mock.call(10, 10),
+        ]
+        assert base_db.get_highscores() == highscores
+
+        # Merging again adds nothing.
+        assert base_db.merge_highscores(merge_db.path) == 0
+        assert base_db.count_highscores() == len(highscores)
+
     def test_merge_db_into_itself_error(self, tmp_local_db_path):
         """Test error is raised when trying to merge DB into itself."""
         db = LocalHighscoresDB(tmp_local_db_path)
@@ -157,6 +478,57 @@ class TestLocalHighscoreDatabase:
             db.merge_highscores(db.path)
 
 
+class TestRemoteHighscoresDatabase:
+    """Tests for the remote highscores database, with the connection mocked."""
+
+    @pytest.fixture(autouse=True)
+    def mock_connect(self):
+        with mock.patch.object(RemoteHighscoresDB, "_pool", None), mock.patch(
+            "mysql.connector.connect"
+        ) as mock_connect:
+            mock_connect.return_value.get_server_version.return_value = (8, 0, 0)
+            yield mock_connect
+
+    def test_pooled_connection(self, mock_connect):
+        """Test connections are pooled and reused."""
+        db = RemoteHighscoresDB()
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.__next__ = mock.Mock(return_value=(3,))
+        assert db.count_highscores() == 3
+        assert RemoteHighscoresDB().count_highscores() == 3
+        mock_connect.assert_called_once()
+        mock_connect.return_value.cursor.assert_called_with(buffered=True)
+        metrics = RemoteHighscoresDB.get_pool_metrics()
+        assert metrics.checkouts == 2
+        assert metrics.idle == 1
+        with pytest.raises(RuntimeError):
+            db.conn
+
+    def test_reconnect(self, mock_connect):
+        """Test reconnecting if the connection is lost."""
+        conn1, conn2 = mock.MagicMock(), mock.MagicMock()
+        mock_connect.side_effect = [conn1, conn2, mock.MagicMock()]
+        conn1.cursor.return_value.execute.side_effect = (
+            mysql.connector.errors.OperationalError("MySQL server has gone away")
+        )
+        conn2.cursor.return_value.__next__.return_value = (3,)
+        db = RemoteHighscoresDB()
+        assert db.count_highscores() == 3
+        conn1.close.assert_called_once()
+        assert mock_connect.call_count == 2
+
+        # Commands that commit are not retried.
+        conn2.cursor.return_value.execute.side_effect = (
+            mysql.connector.errors.InterfaceError("Lost connection")
+        )
+        with pytest.raises(DBConnectionError):
+            db.insert_highscore(
+                HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 5, 1.56, 0.0)
+            )
+        assert mock_connect.call_count == 2
+        assert RemoteHighscoresDB.get_pool_metrics().discarded == 2
+
+
 class TestModuleAPIs:
     """
     Tests for the public module APIs.
@@ -198,3 +570,171 @@ class TestModuleAPIs:
             drag_select=False,
             name="BAR",
         )
+
+    @mock.patch.object(HighscoresDatabases, "get_db_instance")
+    def test_get_ranked_highscores(self, mock_get_db):
+        """Test getting ranked highscores."""
+        mock_get_ranked = mock_get_db.return_value.get_ranked_highscores
+        mock_get_ranked.return_value = "DUMMY_RESULT"
+
+        result = get_ranked_highscores(
+            settings=HighscoreSettingsStruct.get_default(),
+            sort_key="3bv/s",
+            flagging="NF",
+        )
+        assert result == "DUMMY_RESULT"
+        mock_get_ranked.assert_called_once_with(
+            difficulty=Difficulty.BEGINNER,
+            per_cell=1,
+            drag_select=False,
+            sort_key="3bv/s",
+            name=None,
+            flagging="NF",
+            limit=None,
+            offset=0,
+        )
+
+    @mock.patch.object(HighscoresDatabases, "get_db_instance")
+    def test_query_highscores(self, mock_get_db):
+        """Test querying a page of highscores."""
+        mock_query = mock_get_db.return_value.query_highscores
+        mock_query.return_value = "DUMMY_RESULT"
+
+        result = query_highscores(
+            HighscoresDatabases.REMOTE,
+            settings=HighscoreSettingsStruct.get_default(),
+            fields=["name", "elapsed"],
+            order_by=["-bbbvps"],
+            limit=10,
+        )
+        assert result == "DUMMY_RESULT"
+        mock_query.assert_called_once_with(
+            difficulty=Difficulty.BEGINNER,
+            per_cell=1,
+            drag_select=False,
+            name=None,
+            fields=["name", "elapsed"],
+            order_by=["-bbbvps"],
+            limit=10,
+            offset=0,
+        )
+
+    @mock.patch.object(HighscoresDatabases, "get_db_instance")
+    def test_get_best_times(self, mock_get_db):
+        """Test getting each player's best time."""
+        mock_get_best = mock_get_db.return_value.get_best_times
+        mock_get_best.return_value = "DUMMY_RESULT"
+
+        result = get_best_times(
+            settings=HighscoreSettingsStruct.get_default(),
+            drag_select=True,
+            names=["FOO"],
+        )
+        assert result == "DUMMY_RESULT"
+        mock_get_best.assert_called_once_with(
+            difficulty=Difficulty.BEGINNER,
+            per_cell=1,
+            drag_select=False,
+            names=["FOO"],
+        )
+
+
+def test_filter_and_sort():
+    """Test filtering and sorting highscores in Python."""
+    highscores = [
+        HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 5, 1.67, 0.0),
+        HighscoreStruct("B", 1, False, "name1", 1234, 2.50, 3, 1.20, 0.5),
+        HighscoreStruct("B", 1, False, "NAME2", 1234, 4.00, 9, 2.25, 0.0),
+    ]
+    assert filter_and_sort(highscores) == highscores[1:]
+    assert filter_and_sort(highscores, "3bv/s") == [highscores[2], highscores[0]]
+    assert filter_and_sort(highscores, "time", {"name": "Name1"}) == [
+        highscores[1],
+        highscores[0],
+    ]
+    assert filter_and_sort(highscores, "time", {"flagging": "NF"}) == [
+        highscores[0],
+        highscores[2],
+    ]
+
+
+class TestNewBest:
+    """Tests for checking for new personal bests."""
+
+    def test_is_highscore_new_best(self):
+        """Test checking against a list of highscores."""
+        highscores = [
+            HighscoreStruct("B", 1, False, "NAME1", 1234, 3.00, 6, 2.00, 0.0),
+            HighscoreStruct("B", 1, False, "NAME2", 1234, 1.00, 5, 5.00, 0.0),
+        ]
+        new_hs = HighscoreStruct("B", 1, False, "name1", 1234, 2.00, 3, 1.50, 0.0)
+        assert is_highscore_new_best(new_hs, highscores) == "time"
+        new_hs = HighscoreStruct("B", 1, False, "name1", 1234, 4.00, 10, 2.50, 0.0)
+        assert is_highscore_new_best(new_hs, highscores) == "3bv/s"
+        assert is_highscore_new_best(new_hs, highscores + [new_hs]) == "3bv/s"
+        new_hs = HighscoreStruct("B", 1, False, "name1", 1234, 4.00, 4, 1.00, 0.0)
+        assert is_highscore_new_best(new_hs, highscores) is None
+        new_hs = HighscoreStruct("B", 1, False, "NAME3", 1234, 9.00, 4, 0.44, 0.0)
+        assert is_highscore_new_best(new_hs, highscores) == "time"
+
+    @mock.patch.object(LocalHighscoresDB, "__init__", return_value=None)
+    @mock.patch.object(LocalHighscoresDB, "get_personal_best")
+    def test_is_highscore_new_best_cached(self, mock_get_best, mock_init):
+        """Test checking against the local DB's personal best."""
+        mock_get_best.return_value = (3.00, 2.00)
+        new_hs = HighscoreStruct("B", 1, False, "NAME1", 1234, 4.00, 10, 2.50, 0.0)
+        assert is_highscore_new_best(new_hs) == "3bv/s"
+        mock_get_best.assert_called_once_with(new_hs, "NAME1")
+
+    def test_personal_best_cache(self):
+        """Test the personal best cache."""
+        cache = PersonalBestCache()
+        settings = HighscoreSettingsStruct.get_default()
+        fetch = mock.Mock(return_value=None)
+        assert cache.get(settings, "NAME", fetch) is None
+        assert cache.get(settings, "name", fetch) is None
+        fetch.assert_called_once_with()
+
+        cache.update(HighscoreStruct("B", 1, False, "Name", 1234, 3.00, 6, 2.00, 0.0))
+        cache.update(HighscoreStruct("B", 1, False, "NAME", 1234, 2.00, 3, 1.50, 0.0))
+        cache.update(HighscoreStruct("I", 1, False, "NAME", 1234, 1.00, 9, 9.00, 0.0))
+        assert cache.get(settings, "NAME", fetch) == (2.00, 2.00)
+        fetch.assert_called_once_with()
+
+        cache.clear()
+        assert cache.get(settings, "NAME", fetch) is None
+        assert fetch.call_count == 2
+
+    def test_personal_best_cache_concurrent(self):
+        """Test fetches don't block lookups for other keys, and are shared."""
+        cache = PersonalBestCache()
+        settings = HighscoreSettingsStruct.get_default()
+        fetching = threading.Event()
+        release = threading.Event()
+        results = []
+        fetches = []
+
+        def slow_fetch():
+            fetches.append(None)
+            fetching.set()
+            release.wait(5)
+            return (3.0, 2.0)
+
+        def get_slow():
+            results.append(cache.get(settings, "SLOW", slow_fetch))
+
+        threads = [threading.Thread(target=get_slow) for _ in range(3)]
+        threads[0].start()
+        assert fetching.wait(5)
+        for t in threads[1:]:
+            t.start()
+        # Another player's lookup isn't blocked by the fetch in progress.
+        assert cache.get(settings, "OTHER", lambda: None) is None
+        # An insert during the fetch is included in the cached result.
+        cache.update(HighscoreStruct("B", 1, False, "slow", 1234, 2.5, 3, 1.2, 0))
+        release.set()
+        for t in threads:
+            t.join(5)
+        assert results == [(2.5, 2.0)] * 3
+        assert cache.get(settings, "slow", slow_fetch) == (2.5, 2.0)
+        assert len(fetches) == 1
@@ -0,0 +1,47 @@
+# October 2026, Lewis Gaul
+
+"""
+Test the logs module.
+
+"""
+
+import logging
+
+from minegauler.shared import logs
+
+
+def test_trace_logger():
+    """Test the trace channel is gated by a single switch."""
+    trace_logger = logs.get_trace_logger("minegauler.core.game")
+    assert trace_logger.name == "minegauler.trace.core.game"
+    assert not trace_logger.isEnabledFor(logging.DEBUG)
+    assert trace_logger.isEnabledFor(logging.INFO)
+    logs.set_trace_enabled(True)
+    try:
+        assert trace_logger.isEnabledFor(logging.DEBUG)
+    finally:
+        logs.set_trace_enabled(False)
+    assert not trace_logger.isEnabledFor(logging.DEBUG)
+
+
+def test_configure_logging(tmpdir):
+    """Test logging to file via a background queue handler."""
+    root = logging.getLogger()
+    orig_handlers, orig_level = root.handlers, root.level
+    root.handlers = []
+    try:
+        listener = logs.configure_logging(tmpdir / "test.log", level=logging.INFO)
+        assert listener is not None
+        logging.getLogger("minegauler.test").info("Info message")
+        logging.getLogger("minegauler.test").debug("Debug message")
+        logs.get_trace_logger("minegauler.test").debug("Trace message")
+        logs.stop_background_logging()
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers, root.level = orig_handlers, orig_level
+    with open(tmpdir / "test.log") as f:
+        content = f.read()
+    assert "Info message" in content
+    assert "Debug message" not in content
+    assert "Trace message" not in content
@@ -0,0 +1,182 @@
+# October 2026, Lewis Gaul
+
+"""
+Tests for the post queue module.
+
+"""
+
+import http.server
+import json
+import threading
+from typing import List
+
+import pytest
+
+from minegauler.shared.post_queue import PostQueue
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    server: "_StubServer"
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        with self.server.lock:
+            items = payload if self.path == "/batch" else [payload]
+            if self.server.fail_statuses:
+                status = self.server.fail_statuses.pop(0)
+            elif self.path == "/batch" and not self.server.batch_supported:
+                status = 404
+            elif any(p in self.server.invalid for p in items):
+                status = 400
+            else:
+                status = 200
+                self.server.requests.append((self.path, payload))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.fail_statuses: List[int] = []
+        self.batch_supported = True
+        self.invalid: List = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def received(self) -> List:
+        """All payloads received, in order."""
+        ret = []
+        for path, payload in self.requests:
+            ret.extend(payload if path == "/batch" else [payload])
+        return ret
+
+
+@pytest.fixture
+def stub_server() -> _StubServer:
+    server = _StubServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs=dict(poll_interval=0.05), daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_queue(tmp_path, stub_server):
+    queues = []
+
+    def make(**kwargs) -> PostQueue:
+        kwargs.setdefault("batch_url", stub_server.url + "/batch")
+        kwargs.setdefault("min_backoff", 0.01)
+        q = PostQueue(
+            tmp_path / "queue.db", stub_server.url + "/single", timeout=2, **kwargs
+        )
+        queues.append(q)
+        return q
+
+    yield make
+    for q in queues:
+        q.stop()
+
+
+def test_burst(make_queue, stub_server):
+    """Test a burst of payloads is sent in batches by a single worker."""
+    def get_workers():
+        return {t for t in threading.enumerate() if t.name == "PostQueueWorker"}
+
+    workers_before = get_workers()
+    q = make_queue(max_batch=50)
+    q.start()
+    payloads = [{"i": i} for i in range(200)]
+    for p in payloads:
+        q.put(p)
+    assert len(get_workers() - workers_before) == 1
+    assert q.wait_until_empty(5)
+    assert len(q) == 0
+    assert stub_server.received == payloads
+    assert len(stub_server.requests) < len(payloads)
+    assert all(len(p) <= 50 for path, p in stub_server.requests if path == "/batch")
+
+
+def test_persistence(make_queue, stub_server):
+    """Test queued payloads survive until sent by a new queue instance."""
+    q = make_queue()
+    q.put({"i": 0})
+    q.put({"i": 1})
+    assert len(q) == 2
+    assert stub_server.requests == []
+
+    q = make_queue()
+    assert len(q) == 2
+    q.start()
+    assert q.wait_until_empty(5)
+    assert stub_server.received == [{"i": 0}, {"i": 1}]
+
+
+def test_retry(make_queue, stub_server):
+    """Test sending is retried after server errors."""
+    stub_server.fail_statuses = [503, 500]
+    q = make_queue()
+    q.put({"i": 0})
+    q.start()
+    assert q.wait_until_empty(5)
+    assert stub_server.received == [{"i": 0}]
+
+
+def test_batch_unsupported(make_queue, stub_server):
+    """Test falling back to posting singly if batching isn't supported."""
+    stub_server.batch_supported = False
+    q = make_queue()
+    for i in range(3):
+        q.put({"i": i})
+    q.start()
+    assert q.wait_until_empty(5)
+    assert stub_server.requests == [("/single", {"i": i}) for i in range(3)]
+
+
+def test_client_error_dropped(make_queue, stub_server):
+    """Test payloads rejected with a client error are not retried."""
+    stub_server.fail_statuses = [400]
+    q = make_queue()
+    q.put({"i": 0})
+    q.start()
+    assert q.wait_until_empty(5)
+    q.put({"i": 1})
+    assert q.wait_until_empty(5)
+    assert stub_server.received == [{"i": 1}]
+
+
+def test_client_error_batch_posted_singly(make_queue, stub_server):
+    """Test only the payloads in a rejected batch rejected singly are dropped."""
+    stub_server.invalid = [{"i": 1}, {"i": 3}]
+    q = make_queue()
+    for i in range(5):
+        q.put({"i": i})
+    q.start()
+    assert q.wait_until_empty(5)
+    assert len(q) == 0
+    assert stub_server.requests == [
+        ("/single", {"i": 0}),
+        ("/single", {"i": 2}),
+        ("/single", {"i": 4}),
+    ]
+
+    # Batching is still used for later batches.
+    q.put({"i": 5})
+    q.put({"i": 6})
+    q.start()
+    assert q.wait_until_empty(5)
+    assert stub_server.requests[-1] == ("/batch", [{"i": 5}, {"i": 6}])
@@ -0,0 +1,65 @@
+# October 2026, Lewis Gaul
+
+"""
+Tests for the shared types module.
+
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from minegauler.core.board import Board
+from minegauler.shared.types import CellContents
+
+
+class TestCellContents:
+    """Test the CellContents types."""
+
+    def test_interned(self):
+        """Test instances are interned, including across copies and pickling."""
+        assert CellContents.Num(3) is CellContents.Num(3)
+        assert CellContents.Num(2) + 1 is CellContents.Num(3)
+        assert CellContents.Flag() is CellContents.Flag(1)
+        assert CellContents.Unclicked is type(CellContents.Unclicked)()
+        for item in [CellContents.UnclickedSunken, CellContents.WrongFlag(2)]:
+            assert copy.copy(item) is item
+            assert pickle.loads(pickle.dumps(item)) is item
+
+    def test_invalid(self):
+        """Test invalid creation."""
+        with pytest.raises(TypeError):
+            CellContents()
+        with pytest.raises(ValueError):
+            CellContents.Num(-1)
+        with pytest.raises(ValueError):
+            CellContents.Mine(0)
+        with pytest.raises(TypeError):
+            CellContents.Num("1")
+
+    def test_codes(self):
+        """Test the compact encoding of cell contents."""
+        items = [c for c in CellContents.by_code if c is not None]
+        assert len({c.code for c in items}) == len(items)
+        for item in items:
+            assert 0 <= item.code <= 255
+            assert CellContents.from_code(item.code) is item
+            assert (type(item) is CellContents.Num) == (
+                item.code >= CellContents.Num(0).code
+            )
+        with pytest.raises(ValueError):
+            CellContents.from_code(126)
+        with pytest.raises(ValueError):
+            CellContents.from_code(256)
+
+    def test_board_storage(self):
+        """Test a board stores the cell contents encoded."""
+        board = Board(3, 2)
+        board[(1, 1)] = CellContents.HitMine(2)
+        assert board.cells[4] == CellContents.HitMine(2).code
+        assert board[(1, 1)] is CellContents.HitMine(2)
+        assert board.rows()[0] == [CellContents.Unclicked] * 3
+        assert board.copy() == board
+        with pytest.raises(TypeError):
+            board[(0, 0)] = 1
@@ -0,0 +1,97 @@
+# October 2026, Lewis Gaul
+
+"""
+Tests for the shared utils module.
+
+"""
+
+import array
+
+import pytest
+
+from minegauler.shared import utils
+from minegauler.shared.utils import FlatGrid, Grid
+
+
+class TestFlatGrid:
+    """Test the FlatGrid class."""
+
+    def test_create(self):
+        """Test basic creation and coordinate access."""
+        grid = FlatGrid(4, 3, fill=1)
+        assert (grid.x_size, grid.y_size) == (4, 3)
+        assert grid.all_coords == Grid(4, 3).all_coords
+        assert list(grid.cells) == [1] * 12
+        assert grid[(3, 2)] == 1
+
+        grid[(3, 1)] = 5
+        assert grid.cells[grid.index_of((3, 1))] == 5
+        assert grid.coord_of(7) == (3, 1)
+        for coord in [(4, 0), (-1, 0), (0, 3), (0, -1), (3, 3)]:
+            with pytest.raises(IndexError):
+                grid[coord]
+            with pytest.raises(IndexError):
+                grid[coord] = 1
+
+        # Array storage.
+        grid = FlatGrid(4, 3, typecode="H")
+        assert isinstance(grid.cells, array.array)
+        grid[(0, 2)] += 2
+        assert grid[(0, 2)] == 2
+
+    def test_from_2d_array(self):
+        """Test creating from a 2D array, matching the list-based grid."""
+        array_ = [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+        grid = FlatGrid.from_2d_array(array_)
+        list_grid = Grid.from_2d_array(array_)
+        for c in grid.all_coords:
+            assert grid[c] == list_grid[c]
+        assert grid.rows() == array_
+        assert str(grid) == str(list_grid)
+        assert grid == grid.copy()
+        assert grid != FlatGrid(4, 3)
+
+        # Copies don't share mutable state.
+        grid_copy = grid.copy()
+        grid_copy[(0, 0)] = 12
+        assert grid[(0, 0)] == 0
+        assert grid_copy.all_coords == grid.all_coords
+        assert grid_copy.all_coords is not grid.all_coords
+
+    def test_get_nbrs(self):
+        """Test getting neighbours matches the list-based grid."""
+        grid = FlatGrid(5, 4)
+        list_grid = Grid(5, 4)
+        for c in grid.all_coords:
+            assert set(grid.get_nbrs(c)) == set(list_grid.get_nbrs(c))
+            assert set(grid.get_nbrs(c, include_origin=True)) == set(
+                list_grid.get_nbrs(c, include_origin=True)
+            )
+        # Neighbour tables are shared between grids of the same size.
+        assert grid.nbr_indices is FlatGrid(5, 4).nbr_indices
+        assert grid.get_nbrs((2, 2)) is list_grid.get_nbrs((2, 2))
+
+
+class TestGrid:
+    """Test the Grid class."""
+
+    def test_get_nbrs(self):
+        """Test getting neighbours, which are cached per grid size."""
+        grid = Grid(4, 3)
+        assert set(grid.get_nbrs((0, 0))) == {(0, 1), (1, 0), (1, 1)}
+        assert set(grid.get_nbrs((1, 1), include_origin=True)) == {
+            (x, y) for x in range(3) for y in range(3)
+        }
+        assert isinstance(grid.get_nbrs((3, 2)), tuple)
+        assert grid.get_nbrs((3, 2)) is Grid(4, 3).get_nbrs((3, 2))
+        assert list(grid.iter_nbrs((3, 2))) == list(grid.get_nbrs((3, 2)))
+        with pytest.raises(KeyError):
+            grid.get_nbrs((4, 0))
+
+        # Tables for the least recently used sizes are evicted.
+        for x in range(2, 2 + utils._GRID_CACHE_SIZE):
+            Grid(x, 1).get_nbrs((0, 0))
+        assert utils._get_nbr_coord_table.cache_info().currsize <= (
+            utils._GRID_CACHE_SIZE
+        )
+        assert grid.get_nbrs((3, 2)) == Grid(4, 3).get_nbrs((3, 2))